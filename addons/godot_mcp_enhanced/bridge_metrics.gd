@@ -0,0 +1,218 @@
+@tool
+extends RefCounted
+## Request timing and size statistics for the HTTP bridge.
+##
+## http_server.gd times every request in phases (receive, parse, auth,
+## json_parse, handler, stringify, compress, write) and records it here per
+## route: a latency histogram, per-phase totals and maxima, payload sizes and
+## error counts. The last RECENT_SIZE requests are kept individually, with the
+## trace id the client sent, so a slow traced call can be found here.
+## Read through the get_bridge_metrics tool, the bottom panel, and custom
+## monitors in Godot's own profiler (Debugger > Monitors > MCP Bridge).
+
+## Upper bounds of the latency histogram buckets, in milliseconds. The last
+## bucket catches everything slower.
+const BUCKETS_MS := [1.0, 2.0, 5.0, 10.0, 25.0, 50.0, 100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0, 10000.0]
+const PHASES := ["receive", "parse", "auth", "json_parse", "handler", "stringify", "compress", "write"]
+const RECENT_SIZE := 32
+## Requests for unregistered paths share one entry so random paths cannot
+## grow the table.
+const UNKNOWN_ROUTE := "(unknown)"
+const MONITOR_PREFIX := "MCP Bridge/"
+
+var routes: Dictionary = {}
+var total_requests: int = 0
+var total_errors: int = 0
+var in_flight: int = 0
+var last_request_msec: float = 0.0
+var started_msec: int = Time.get_ticks_msec()
+# Ring buffer of the latest requests; _recent_next is the slot to write next
+var _recent: Array = []
+var _recent_next: int = 0
+
+
+## timings: phase name -> usec. An error is any non-200 status or a handler
+## result with success == false.
+func record(route: String, status_code: int, success: bool, timings: Dictionary, bytes_in: int, bytes_out: int, trace_id: String = "") -> void:
+	var entry = routes.get(route)
+	if entry == null:
+		entry = _new_entry()
+		routes[route] = entry
+
+	var total_usec := 0
+	for phase in timings:
+		var usec: int = timings[phase]
+		total_usec += usec
+		entry.phase_usec[phase] = entry.phase_usec.get(phase, 0) + usec
+		entry.phase_max_usec[phase] = maxi(entry.phase_max_usec.get(phase, 0), usec)
+	var total_ms := total_usec / 1000.0
+
+	entry.count += 1
+	entry.total_usec += total_usec
+	entry.max_ms = maxf(entry.max_ms, total_ms)
+	entry.histogram[_bucket(total_ms)] += 1
+	entry.bytes_in += bytes_in
+	entry.bytes_out += bytes_out
+	entry.max_bytes_out = maxi(entry.max_bytes_out, bytes_out)
+	var is_error = status_code != 200 or not success
+	if is_error:
+		entry.errors += 1
+		entry.status_codes[status_code] = entry.status_codes.get(status_code, 0) + 1
+
+	total_requests += 1
+	if is_error:
+		total_errors += 1
+	last_request_msec = total_ms
+
+	var phases_ms = {}
+	for phase in timings:
+		phases_ms[phase] = timings[phase] / 1000.0
+	var recent = {"route": route, "status": status_code, "ms": total_ms, "phases": phases_ms, "trace_id": trace_id}
+	if _recent.size() < RECENT_SIZE:
+		_recent.append(recent)
+	else:
+		_recent[_recent_next] = recent
+	_recent_next = (_recent_next + 1) % RECENT_SIZE
+
+
+func reset() -> void:
+	routes.clear()
+	total_requests = 0
+	total_errors = 0
+	last_request_msec = 0.0
+	started_msec = Time.get_ticks_msec()
+	_recent.clear()
+	_recent_next = 0
+
+
+## JSON-safe view of everything recorded, busiest routes first.
+func snapshot() -> Dictionary:
+	var route_names = routes.keys()
+	route_names.sort_custom(func(a, b): return routes[a].count > routes[b].count)
+	var route_data = {}
+	for route in route_names:
+		var entry = routes[route]
+		var phases = {}
+		for phase in entry.phase_usec:
+			phases[phase] = {
+				"mean_ms": entry.phase_usec[phase] / 1000.0 / entry.count,
+				"max_ms": entry.phase_max_usec[phase] / 1000.0
+			}
+		var status_codes = {}
+		for code in entry.status_codes:
+			status_codes[str(code)] = entry.status_codes[code]
+		route_data[route] = {
+			"count": entry.count,
+			"errors": entry.errors,
+			"status_codes": status_codes,
+			"mean_ms": entry.total_usec / 1000.0 / entry.count,
+			"p95_ms": _histogram_percentile(entry, 0.95),
+			"max_ms": entry.max_ms,
+			"histogram": _histogram_view(entry),
+			"phases": phases,
+			"bytes_in": entry.bytes_in,
+			"bytes_out": entry.bytes_out,
+			"max_bytes_out": entry.max_bytes_out
+		}
+	return {
+		"total_requests": total_requests,
+		"total_errors": total_errors,
+		"in_flight": in_flight,
+		"since_msec": Time.get_ticks_msec() - started_msec,
+		"bucket_bounds_ms": BUCKETS_MS,
+		"routes": route_data,
+		"recent": _recent_in_order()
+	}
+
+
+## Mean total time across all routes, for the panel and monitors.
+func mean_ms() -> float:
+	var usec := 0
+	for entry in routes.values():
+		usec += entry.total_usec
+	return usec / 1000.0 / total_requests if total_requests > 0 else 0.0
+
+
+## The route with the highest mean time, or "".
+func slowest_route() -> String:
+	var slowest := ""
+	var slowest_mean := -1.0
+	for route in routes:
+		var entry = routes[route]
+		var mean = float(entry.total_usec) / entry.count
+		if mean > slowest_mean:
+			slowest_mean = mean
+			slowest = route
+	return slowest
+
+
+func register_monitors() -> void:
+	_add_monitor("requests", func(): return total_requests)
+	_add_monitor("errors", func(): return total_errors)
+	_add_monitor("in_flight", func(): return in_flight)
+	_add_monitor("last_request_ms", func(): return last_request_msec)
+	_add_monitor("mean_request_ms", mean_ms)
+
+
+func unregister_monitors() -> void:
+	for name in ["requests", "errors", "in_flight", "last_request_ms", "mean_request_ms"]:
+		if Performance.has_custom_monitor(MONITOR_PREFIX + name):
+			Performance.remove_custom_monitor(MONITOR_PREFIX + name)
+
+
+func _add_monitor(name: String, callable: Callable) -> void:
+	if not Performance.has_custom_monitor(MONITOR_PREFIX + name):
+		Performance.add_custom_monitor(MONITOR_PREFIX + name, callable)
+
+
+## Recorded requests, newest first.
+func _recent_in_order() -> Array:
+	var ordered = []
+	for i in _recent.size():
+		ordered.append(_recent[(_recent_next - 1 - i + _recent.size()) % _recent.size()])
+	return ordered
+
+
+func _new_entry() -> Dictionary:
+	var histogram = []
+	histogram.resize(BUCKETS_MS.size() + 1)
+	histogram.fill(0)
+	return {
+		"count": 0,
+		"errors": 0,
+		"status_codes": {},
+		"total_usec": 0,
+		"max_ms": 0.0,
+		"histogram": histogram,
+		"phase_usec": {},
+		"phase_max_usec": {},
+		"bytes_in": 0,
+		"bytes_out": 0,
+		"max_bytes_out": 0
+	}
+
+
+func _bucket(ms: float) -> int:
+	for i in BUCKETS_MS.size():
+		if ms <= BUCKETS_MS[i]:
+			return i
+	return BUCKETS_MS.size()
+
+
+func _histogram_view(entry: Dictionary) -> Dictionary:
+	var view = {}
+	for i in entry.histogram.size():
+		if entry.histogram[i] > 0:
+			view["le_%s" % (str(BUCKETS_MS[i]) if i < BUCKETS_MS.size() else "inf")] = entry.histogram[i]
+	return view
+
+
+func _histogram_percentile(entry: Dictionary, fraction: float) -> float:
+	"""Upper bound of the bucket holding the percentile (max_ms for the last)"""
+	var target = ceil(fraction * entry.count)
+	var seen = 0
+	for i in entry.histogram.size():
+		seen += entry.histogram[i]
+		if seen >= target:
+			return BUCKETS_MS[i] if i < BUCKETS_MS.size() else entry.max_ms
+	return entry.max_ms
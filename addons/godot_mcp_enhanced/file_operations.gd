@@ -1,6 +1,9 @@
 @tool
 extends Node
 
+const JobManager = preload("res://addons/godot_mcp_enhanced/job_manager.gd")
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+
 signal file_system_changed()
 
 
@@ -34,25 +37,103 @@ func _remove_sidecars(file_path: String) -> Array:
 	return removed
 
 
-## Ask the editor to reimport specific assets. Wraps
-## EditorFileSystem.reimport_files, which is how the 4.x import
-## pipeline refreshes textures, audio, and models after external edits.
-func reimport_assets(paths: Array) -> Dictionary:
+## Reimport batches are capped by total source size so one call into
+## EditorFileSystem.reimport_files never blocks the editor for long; the
+## editor gets a frame between batches. A single file larger than the cap
+## still goes through, alone in its batch.
+const REIMPORT_BATCH_BYTES := 32 * 1024 * 1024
+const REIMPORT_BATCH_MAX_FILES := 16
+
+
+## Validates reimport paths. Returns {"paths": PackedStringArray} or
+## {"error": String}.
+func _validate_reimport_paths(paths: Array) -> Dictionary:
 	var safe_paths := PackedStringArray()
 	for p in paths:
 		var safe := _safe_project_path(str(p))
 		if safe.is_empty():
-			return {"success": false, "error": "Unsafe or invalid path: " + str(p)}
+			return {"error": "Unsafe or invalid path: " + str(p)}
 		if not FileAccess.file_exists(safe):
-			return {"success": false, "error": "File not found: " + safe}
+			return {"error": "File not found: " + safe}
 		safe_paths.append(safe)
 	
 	if safe_paths.is_empty():
-		return {"success": false, "error": "No paths given"}
-	
+		return {"error": "No paths given"}
+	return {"paths": safe_paths}
+
+
+## Ask the editor to reimport specific assets. Wraps
+## EditorFileSystem.reimport_files, which is how the 4.x import
+## pipeline refreshes textures, audio, and models after external edits.
+##
+## Without a job this is one synchronous call. Under a job the paths are
+## split into size-capped batches, one per frame, and job.partial holds one
+## entry per file: {path, status, batch, msec}.
+func reimport_assets(paths: Array, job: JobManager.Job = null, batch_bytes: int = 0) -> Dictionary:
+	var checked := _validate_reimport_paths(paths)
+	if checked.has("error"):
+		return {"success": false, "error": checked.error}
+	
+	var safe_paths: PackedStringArray = checked.paths
 	var fs := EditorInterface.get_resource_filesystem()
-	fs.reimport_files(safe_paths)
-	return {"success": true, "data": {"reimported": safe_paths}}
+	if job == null:
+		fs.reimport_files(safe_paths)
+		return {"success": true, "data": {"reimported": safe_paths}}
+	
+	var batches := _plan_reimport_batches(safe_paths, batch_bytes if batch_bytes > 0 else REIMPORT_BATCH_BYTES)
+	var entries := {}
+	for i in batches.size():
+		for path in batches[i]:
+			var entry := {"path": path, "status": "pending", "batch": i, "msec": 0}
+			entries[path] = entry
+			job.partial.append(entry)
+	job.total = job.partial.size()
+	
+	var reimported := PackedStringArray()
+	for batch in batches:
+		if job.cancel_requested:
+			break
+		# Let a scan the editor started on its own finish first; importing
+		# into the middle of it makes both slower.
+		while fs.is_scanning():
+			await get_tree().process_frame
+		var started := Time.get_ticks_msec()
+		fs.reimport_files(batch)
+		var msec := Time.get_ticks_msec() - started
+		for path in batch:
+			entries[path].status = "done"
+			entries[path].msec = msec
+		reimported.append_array(batch)
+		job.progress += batch.size()
+		# A batch is a whole time slice on its own; always yield after one.
+		await get_tree().process_frame
+	
+	for entry in job.partial:
+		if entry.status == "pending":
+			entry.status = "cancelled"
+	return {"success": true, "data": {"reimported": reimported}}
+
+
+func _plan_reimport_batches(paths: PackedStringArray, budget: int) -> Array:
+	var batches := []
+	var current := PackedStringArray()
+	var current_bytes := 0
+	for path in paths:
+		var size := 0
+		var f := FileAccess.open(path, FileAccess.READ)
+		if f:
+			size = f.get_length()
+			f.close()
+		var full := current.size() >= REIMPORT_BATCH_MAX_FILES or current_bytes + size > budget
+		if not current.is_empty() and full:
+			batches.append(current)
+			current = PackedStringArray()
+			current_bytes = 0
+		current.append(path)
+		current_bytes += size
+	if not current.is_empty():
+		batches.append(current)
+	return batches
 
 
 ## Reads the .import sidecar of an asset so a client can inspect importer
@@ -83,21 +164,53 @@ func get_import_info(asset_path: String) -> Dictionary:
 	return {"success": true, "data": info}
 
 
-func get_filesystem_tree(path: String = "res://", filters: Array = []) -> Dictionary:
+## Depth-first walk without recursion, visiting entries in the same order
+## a recursive walk would. visit(dir_path, item_name, is_dir) returns
+## false to stop the walk; directories are always descended into. Hidden
+## entries (.godot, .git, ...) are skipped. With a budget the walk yields to
+## the editor whenever the frame's slice is spent, so always await it.
+func _walk_files(root: String, visit: Callable, budget: FrameBudget = null) -> void:
+	var root_dir := DirAccess.open(root)
+	if not root_dir:
+		return
+	root_dir.list_dir_begin()
+	var stack := [[root, root_dir]]
+	
+	while not stack.is_empty():
+		if budget and not await budget.tick():
+			break
+		var top: Array = stack.back()
+		var dir: DirAccess = top[1]
+		var item_name := dir.get_next()
+		if item_name == "":
+			dir.list_dir_end()
+			stack.pop_back()
+			continue
+		if item_name.begins_with("."):
+			continue
+		
+		var is_dir := dir.current_is_dir()
+		if not visit.call(top[0], item_name, is_dir):
+			break
+		if is_dir:
+			var child_path: String = (top[0] as String).path_join(item_name)
+			var child := DirAccess.open(child_path)
+			if child:
+				child.list_dir_begin()
+				stack.append([child_path, child])
+	
+	for entry in stack:
+		entry[1].list_dir_end()
+
+
+func get_filesystem_tree(path: String = "res://", filters: Array = [], budget: FrameBudget = null) -> Dictionary:
 	"""Get recursive tree view of project filesystem"""
-	var tree = _build_directory_tree(path, filters)
+	var tree = await _build_directory_tree(path, filters, budget)
 	return tree
 
 
-func _build_directory_tree(path: String, filters: Array, depth: int = 0, max_depth: int = 10) -> Dictionary:
-	"""Recursively build directory tree"""
-	if depth > max_depth:
-		return {"name": "...", "type": "truncated"}
-	
-	var dir = DirAccess.open(path)
-	if not dir:
-		return {"error": "Cannot open directory: " + path}
-	
+func _build_directory_tree(path: String, filters: Array, budget: FrameBudget = null, max_depth: int = 10) -> Dictionary:
+	"""Build the directory tree with an explicit stack instead of recursion"""
 	var tree = {
 		"name": path.get_file() if path != "res://" else "Project Root",
 		"path": path,
@@ -105,79 +218,102 @@ func _build_directory_tree(path: String, filters: Array, depth: int = 0, max_dep
 		"children": []
 	}
 	
-	# List files and directories
-	var items = []
-	dir.list_dir_begin()
-	var item_name = dir.get_next()
-	
-	while item_name != "":
-		# Skip hidden files and .godot directory
-		if not item_name.begins_with("."):
-			var item_path = path.path_join(item_name)
-			var is_dir = dir.current_is_dir()
-			
-			# Apply filters
-			if filters.size() > 0 and not is_dir:
-				var passes_filter = false
+	# Each entry: [directory node to fill in, its depth]
+	var pending := [[tree, 0]]
+	while not pending.is_empty():
+		var current: Array = pending.pop_back()
+		var node: Dictionary = current[0]
+		var depth: int = current[1]
+		
+		var dir_path: String = node.path
+		var dir = DirAccess.open(dir_path)
+		if not dir:
+			node.clear()
+			node["error"] = "Cannot open directory: " + dir_path
+			continue
+		
+		# List files and directories
+		var items = []
+		dir.list_dir_begin()
+		var item_name = dir.get_next()
+		
+		while item_name != "":
+			if budget and not await budget.tick():
+				break
+			# Skip hidden files and .godot directory
+			if not item_name.begins_with("."):
+				var item_path = dir_path.path_join(item_name)
+				var is_dir = dir.current_is_dir()
+				
+				# Apply filters
+				var passes_filter = is_dir or filters.is_empty()
 				for filter in filters:
-					if item_name.ends_with(filter):
-						passes_filter = true
+					if passes_filter:
 						break
-				if not passes_filter:
-					item_name = dir.get_next()
-					continue
+					passes_filter = item_name.ends_with(filter)
+				
+				if passes_filter and is_dir:
+					items.append({
+						"name": item_name,
+						"path": item_path,
+						"type": "directory",
+						"is_dir": true
+					})
+				elif passes_filter:
+					var file_size = 0
+					var f = FileAccess.open(item_path, FileAccess.READ)
+					if f:
+						file_size = f.get_length()
+						f.close()
+					items.append({
+						"name": item_name,
+						"path": item_path,
+						"type": _get_file_type(item_name),
+						"size": file_size,
+						"is_dir": false
+					})
 			
-			if is_dir:
-				items.append({
-					"name": item_name,
-					"path": item_path,
-					"type": "directory",
-					"is_dir": true
-				})
+			item_name = dir.get_next()
+		
+		dir.list_dir_end()
+		if budget and budget.cancel_requested:
+			break
+		
+		# Sort: directories first, then files
+		items.sort_custom(func(a, b): 
+			if a.is_dir and not b.is_dir:
+				return true
+			elif not a.is_dir and b.is_dir:
+				return false
 			else:
-				var file_size = 0
-				var f = FileAccess.open(item_path, FileAccess.READ)
-				if f:
-					file_size = f.get_length()
-					f.close()
-				items.append({
-					"name": item_name,
-					"path": item_path,
-					"type": _get_file_type(item_name),
-					"size": file_size,
-					"is_dir": false
-				})
+				return a.name < b.name
+		)
 		
-		item_name = dir.get_next()
-	
-	dir.list_dir_end()
-	
-	# Sort: directories first, then files
-	items.sort_custom(func(a, b): 
-		if a.is_dir and not b.is_dir:
-			return true
-		elif not a.is_dir and b.is_dir:
-			return false
-		else:
-			return a.name < b.name
-	)
-	
-	# Build children
-	for item in items:
-		if item.is_dir:
-			tree["children"].append(_build_directory_tree(item.path, filters, depth + 1, max_depth))
-		else:
-			tree["children"].append({
-				"name": item.name,
-				"path": item.path,
-				"type": item.type,
-				"size": item.size
-			})
+		# Build children; subdirectories are filled in when popped
+		for item in items:
+			if not item.is_dir:
+				node["children"].append({
+					"name": item.name,
+					"path": item.path,
+					"type": item.type,
+					"size": item.size
+				})
+			elif depth + 1 > max_depth:
+				node["children"].append({"name": "...", "type": "truncated"})
+			else:
+				var child = {
+					"name": item.name,
+					"path": item.path,
+					"type": "directory",
+					"children": []
+				}
+				node["children"].append(child)
+				pending.append([child, depth + 1])
 	
 	return tree
 
 
-func get_quick_project_overview() -> Dictionary:
+func get_quick_project_overview(budget: FrameBudget = null) -> Dictionary:
 	"""Get quick overview of project structure (Windsurf feature)"""
 	var overview = {
 		"total_scenes": 0,
@@ -186,44 +322,30 @@ func get_quick_project_overview() -> Dictionary:
 		"directories": []
 	}
 	
-	_count_project_files("res://", overview)
+	await _count_project_files("res://", overview, budget)
 	
 	return overview
 
 
-func _count_project_files(path: String, counts: Dictionary) -> void:
-	"""Recursively count project files"""
-	var dir = DirAccess.open(path)
-	if not dir:
-		return
-	
-	dir.list_dir_begin()
-	var item_name = dir.get_next()
-	
-	while item_name != "":
-		if not item_name.begins_with("."):
-			var item_path = path.path_join(item_name)
-			
-			if dir.current_is_dir():
-				counts["directories"].append(item_name)
-				_count_project_files(item_path, counts)
-			else:
-				if item_name.ends_with(".tscn") or item_name.ends_with(".scn"):
-					counts["total_scenes"] += 1
-				elif item_name.ends_with(".gd") or item_name.ends_with(".cs"):
-					counts["total_scripts"] += 1
-				else:
-					counts["total_assets"] += 1
-		
-		item_name = dir.get_next()
-	
-	dir.list_dir_end()
+func _count_project_files(path: String, counts: Dictionary, budget: FrameBudget = null) -> void:
+	"""Count project files below path"""
+	await _walk_files(path, func(_dir_path: String, item_name: String, is_dir: bool) -> bool:
+		if is_dir:
+			counts["directories"].append(item_name)
+		elif item_name.ends_with(".tscn") or item_name.ends_with(".scn"):
+			counts["total_scenes"] += 1
+		elif item_name.ends_with(".gd") or item_name.ends_with(".cs"):
+			counts["total_scripts"] += 1
+		else:
+			counts["total_assets"] += 1
+		return true
+	, budget)
 
 
-func search_files(query: String, search_path: String = "res://") -> Array:
+func search_files(query: String, search_path: String = "res://", budget: FrameBudget = null) -> Array:
 	"""Fuzzy search for files matching query"""
 	var results = []
-	_search_files_recursive(search_path, query.to_lower(), results)
+	await _search_files_recursive(search_path, query.to_lower(), results, 50, budget)
 	
 	# Sort by relevance (exact matches first, then contains)
 	results.sort_custom(func(a, b):
@@ -253,37 +375,22 @@ func search_files(query: String, search_path: String = "res://") -> Array:
 	return results
 
 
-func _search_files_recursive(path: String, query: String, results: Array, max_results: int = 50) -> void:
-	"""Recursively search files"""
+func _search_files_recursive(path: String, query: String, results: Array, max_results: int = 50, budget: FrameBudget = null) -> void:
+	"""Search files below path, stopping at max_results"""
 	if results.size() >= max_results:
 		return
 	
-	var dir = DirAccess.open(path)
-	if not dir:
-		return
-	
-	dir.list_dir_begin()
-	var item_name = dir.get_next()
-	
-	while item_name != "" and results.size() < max_results:
-		if not item_name.begins_with("."):
-			var item_path = path.path_join(item_name)
-			
-			if dir.current_is_dir():
-				_search_files_recursive(item_path, query, results, max_results)
-			else:
-				# Fuzzy match
-				if _fuzzy_match(item_name.to_lower(), query):
-					results.append({
-						"name": item_name,
-						"path": item_path,
-						"type": _get_file_type(item_name),
-						"directory": path
-					})
-		
-		item_name = dir.get_next()
-	
-	dir.list_dir_end()
+	await _walk_files(path, func(dir_path: String, item_name: String, is_dir: bool) -> bool:
+		# Fuzzy match
+		if not is_dir and _fuzzy_match(item_name.to_lower(), query):
+			results.append({
+				"name": item_name,
+				"path": dir_path.path_join(item_name),
+				"type": _get_file_type(item_name),
+				"directory": dir_path
+			})
+		return results.size() < max_results
+	, budget)
 
 
 func _fuzzy_match(text: String, pattern: String) -> bool:
@@ -322,8 +429,12 @@ func uid_to_project_path(uid: String) -> String:
 	if not uid.begins_with("uid://"):
 		return ""
 	
-	# Use ResourceLoader to convert UID to path
-	var path = ResourceUID.get_id_path(ResourceUID.text_to_id(uid))
+	# Use ResourceLoader to convert UID to path. get_id_path() logs an error
+	# for unknown ids, so check first; bulk lookups hit that case a lot.
+	var id = ResourceUID.text_to_id(uid)
+	if id == ResourceUID.INVALID_ID or not ResourceUID.has_id(id):
+		return ""
+	var path = ResourceUID.get_id_path(id)
 	return path
 
 
@@ -343,6 +454,34 @@ func project_path_to_uid(path: String) -> String:
 	return ResourceUID.id_to_text(uid_int)
 
 
+## Bulk form of uid_to_project_path. Results are keyed by the UID as given;
+## anything that does not resolve is listed under "unresolved" instead of
+## mapping to an empty string.
+func uids_to_project_paths(uids: Array) -> Dictionary:
+	var paths := {}
+	var unresolved := []
+	for uid in uids:
+		var path := uid_to_project_path(str(uid))
+		if path.is_empty():
+			unresolved.append(str(uid))
+		else:
+			paths[str(uid)] = path
+	return {"success": true, "data": {"paths": paths, "unresolved": unresolved}}
+
+
+## Bulk form of project_path_to_uid, keyed by the path as given.
+func project_paths_to_uids(paths: Array) -> Dictionary:
+	var uids := {}
+	var unresolved := []
+	for path in paths:
+		var uid := project_path_to_uid(str(path))
+		if uid.is_empty():
+			unresolved.append(str(path))
+		else:
+			uids[str(path)] = uid
+	return {"success": true, "data": {"uids": uids, "unresolved": unresolved}}
+
+
 func get_file_content(file_path: String) -> Dictionary:
 	"""Get content of a file"""
 	file_path = _safe_project_path(file_path)
@@ -474,7 +613,7 @@ func _get_all_files(path: String, results: Array) -> void:
 	dir.list_dir_end()
 
 
-func analyze_project_dependencies() -> Dictionary:
+func analyze_project_dependencies(job: JobManager.Job = null) -> Dictionary:
 	"""Analyze project dependencies (Windsurf feature for understanding codebase)"""
 	var dependencies = {
 		"scenes": {},
@@ -484,36 +623,29 @@ func analyze_project_dependencies() -> Dictionary:
 	
 	# Scan all scene files for dependencies
 	var scenes = []
-	_find_files_by_extension("res://", ".tscn", scenes)
+	await _find_files_by_extension("res://", ".tscn", scenes, job)
+	if job:
+		job.total = scenes.size()
 	
 	for scene_path in scenes:
+		if job and not await job.tick():
+			break
 		var deps = _get_file_dependencies(scene_path)
 		dependencies["scenes"][scene_path] = deps
+		if job:
+			job.progress += 1
+			job.partial.append({"scene": scene_path, "dependencies": deps})
 	
 	return {"success": true, "data": dependencies}
 
 
-func _find_files_by_extension(path: String, extension: String, results: Array) -> void:
+func _find_files_by_extension(path: String, extension: String, results: Array, budget: FrameBudget = null) -> void:
 	"""Find all files with specific extension"""
-	var dir = DirAccess.open(path)
-	if not dir:
-		return
-	
-	dir.list_dir_begin()
-	var item_name = dir.get_next()
-	
-	while item_name != "":
-		if not item_name.begins_with("."):
-			var item_path = path.path_join(item_name)
-			
-			if dir.current_is_dir():
-				_find_files_by_extension(item_path, extension, results)
-			elif item_name.ends_with(extension):
-				results.append(item_path)
-		
-		item_name = dir.get_next()
-	
-	dir.list_dir_end()
+	await _walk_files(path, func(dir_path: String, item_name: String, is_dir: bool) -> bool:
+		if not is_dir and item_name.ends_with(extension):
+			results.append(dir_path.path_join(item_name))
+		return true
+	, budget)
 
 
 func _get_file_dependencies(file_path: String) -> Array:
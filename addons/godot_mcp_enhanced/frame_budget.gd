@@ -0,0 +1,59 @@
+@tool
+extends RefCounted
+## Per-frame time budget for long walks on the editor main thread.
+##
+## Loops call `await budget.tick()` once per unit of work. When the slice for
+## the current frame is spent, tick() waits for the next frame so the editor
+## keeps drawing while a big scan runs. With a minimum FPS set, the slice
+## shrinks whenever a frame ran longer than 1/min_fps and grows back toward
+## its configured size when there is headroom.
+
+const DEFAULT_SLICE_MSEC := 8.0
+const DEFAULT_MIN_FPS := 30.0
+const MIN_SLICE_USEC := 1000
+
+var slice_usec: int = int(DEFAULT_SLICE_MSEC * 1000.0)
+var cancel_requested: bool = false
+var frames_yielded: int = 0
+
+var _max_slice_usec: int = int(DEFAULT_SLICE_MSEC * 1000.0)
+var _frame_limit_usec: int = 0
+var _slice_start_usec: int = 0
+
+
+func _init(slice_msec: float = DEFAULT_SLICE_MSEC, min_fps: float = DEFAULT_MIN_FPS) -> void:
+	configure(slice_msec, min_fps)
+	restart()
+
+
+func configure(slice_msec: float, min_fps: float) -> void:
+	slice_usec = maxi(MIN_SLICE_USEC, int(slice_msec * 1000.0))
+	_max_slice_usec = slice_usec
+	_frame_limit_usec = int(1000000.0 / min_fps) if min_fps > 0.0 else 0
+
+
+## Starts a fresh slice, e.g. when work begins on a later frame than the
+## budget was created on.
+func restart() -> void:
+	_slice_start_usec = Time.get_ticks_usec()
+
+
+## Yields to the editor when this frame's slice is spent. Always await it.
+## Returns false once the work has been cancelled.
+func tick() -> bool:
+	if Time.get_ticks_usec() - _slice_start_usec >= slice_usec:
+		var previous_start := _slice_start_usec
+		await Engine.get_main_loop().process_frame
+		frames_yielded += 1
+		_slice_start_usec = Time.get_ticks_usec()
+		_adapt(_slice_start_usec - previous_start)
+	return not cancel_requested
+
+
+func _adapt(frame_usec: int) -> void:
+	if _frame_limit_usec <= 0:
+		return
+	if frame_usec > _frame_limit_usec:
+		slice_usec = maxi(MIN_SLICE_USEC, slice_usec - (frame_usec - _frame_limit_usec))
+	elif slice_usec < _max_slice_usec:
+		slice_usec = mini(_max_slice_usec, slice_usec + int((_frame_limit_usec - frame_usec) * 0.25))
@@ -5,27 +5,75 @@ extends Node
 ## Binds to 127.0.0.1 only. Every request must carry the auth token that the
 ## plugin generates on first run (header "X-MCP-Token" or query param "token").
 ## Host header is validated to block DNS rebinding from a browser tab.
+##
+## Given a socket path, it listens on a Unix domain socket instead (Godot 4.5+,
+## which has UDSServer; older editors fall back to TCP). The socket file is
+## readable by its owner only and a browser cannot reach it, so the Host and
+## Origin checks are skipped there. The token is still required.
+##
+## Every request is timed in phases and recorded in `metrics`. The phases go
+## back to the client in a Server-Timing header, and the trace id of a W3C
+## "traceparent" request header is echoed as X-MCP-Trace-Id, so the caller
+## can line the editor's share up with its own spans.
+##
+## Every response also carries X-MCP-Epoch, a number that changes whenever
+## the plugin calls bump_epoch() (project files or settings changed), so
+## clients can drop cached answers.
+##
+## PING_ROUTE is answered here, after the token check, without a handler and
+## without being recorded in metrics: clients poll it as a heartbeat.
+##
+## Handlers may put PackedByteArray values (PNG screenshots) under "data".
+## They go out as base64 strings in the JSON, unless the request's Accept
+## header lists FRAME_TYPE: then the body is a frame of a little-endian u32
+## length, that many bytes of JSON, and the raw blobs back to back. In the
+## JSON each blob is replaced by {"$blob": index, "offset", "length"}, the
+## offset counting from the end of the JSON.
+##
+## JSON bodies of compress_min_bytes or more are compressed with zstd or
+## gzip (PackedByteArray.compress) when the Accept-Encoding header allows.
+## Frames are not: PNG does not shrink further.
 
 signal request_received(method: String, path: String, params: Dictionary)
 signal server_started(port: int)
 signal server_stopped()
+## Emitted after every response, with its total time in the bridge.
+signal request_completed(route: String, status_code: int, msec: float)
+
+const BridgeMetrics = preload("res://addons/godot_mcp_enhanced/bridge_metrics.gd")
 
 const BIND_ADDRESS := "127.0.0.1"
 const MAX_BODY_BYTES := 8 * 1024 * 1024  # 8 MiB. Screenshots move the other way, so requests stay small.
 const CLIENT_TIMEOUT_SEC := 10.0
+const PING_ROUTE := "/api/bridge/ping"
+const JSON_TYPE := "application/json; charset=utf-8"
+const FRAME_TYPE := "application/x-mcp-frame"
+const DEFAULT_COMPRESS_MIN_BYTES := 8192
+## Content-Encoding tokens in order of preference, with their Godot mode
+const ENCODINGS := {"zstd": FileAccess.COMPRESSION_ZSTD, "gzip": FileAccess.COMPRESSION_GZIP}
 
 var port: int = 3571
 var auth_token: String = ""
 var is_running: bool = false
 
 var tcp_server: TCPServer
+# UDSServer while listening on a Unix socket. Untyped and created by name so
+# the script still parses on Godot versions without the class.
+var uds_server = null
+var socket_path: String = ""
 var poll_timer: Timer
 var request_count: int = 0
 
 var routes: Dictionary = {}
+## Smallest JSON body worth compressing; 0 turns compression off
+var compress_min_bytes: int = DEFAULT_COMPRESS_MIN_BYTES
+var metrics := BridgeMetrics.new()
+# Starts at unix ms so a restarted editor never repeats an earlier epoch
+var change_epoch: int = int(Time.get_unix_time_from_system() * 1000.0)
 
 # Each pending client accumulates bytes until the full request (headers +
-# Content-Length body) has arrived. Entries: { peer, buffer, deadline }.
+# Content-Length body) has arrived. Entries: { peer, buffer, accepted_usec,
+# deadline, unix }.
 var _pending: Array[Dictionary] = []
 
 
@@ -39,7 +87,8 @@ func _ready() -> void:
 		add_child(poll_timer)
 
 
-func start_server(server_port: int, token: String) -> bool:
+## An empty unix_socket_path means TCP on server_port.
+func start_server(server_port: int, token: String, unix_socket_path: String = "") -> bool:
 	if tcp_server == null:
 		tcp_server = TCPServer.new()
 	if poll_timer == null:
@@ -51,6 +100,17 @@ func start_server(server_port: int, token: String) -> bool:
 	port = server_port
 	auth_token = token
 
+	if not unix_socket_path.is_empty():
+		# Whatever the outcome, a socket left by an earlier editor must go, or
+		# clients would keep trying it
+		DirAccess.remove_absolute(unix_socket_path)
+		if _listen_unix(unix_socket_path):
+			is_running = true
+			poll_timer.start()
+			server_started.emit(port)
+			return true
+		push_warning("[MCP] Falling back to TCP on %s:%d" % [BIND_ADDRESS, port])
+
 	var error := tcp_server.listen(port, BIND_ADDRESS)
 	if error != OK:
 		push_error("[MCP] Could not listen on %s:%d (%s)" % [BIND_ADDRESS, port, error_string(error)])
@@ -66,6 +126,11 @@ func start_server(server_port: int, token: String) -> bool:
 func stop_server() -> void:
 	if tcp_server and tcp_server.is_listening():
 		tcp_server.stop()
+	if uds_server != null:
+		uds_server.stop()
+		uds_server = null
+		DirAccess.remove_absolute(socket_path)
+		socket_path = ""
 	if poll_timer:
 		poll_timer.stop()
 	for entry in _pending:
@@ -76,21 +141,47 @@ func stop_server() -> void:
 	print("[MCP] HTTP bridge stopped")
 
 
+func _listen_unix(path: String) -> bool:
+	if not ClassDB.class_exists("UDSServer"):
+		push_warning("[MCP] Unix sockets need Godot 4.5 or later")
+		return false
+	DirAccess.make_dir_recursive_absolute(path.get_base_dir())
+	var server = ClassDB.instantiate("UDSServer")
+	var error: Error = server.listen(path)
+	if error != OK:
+		push_warning("[MCP] Could not listen on %s (%s)" % [path, error_string(error)])
+		return false
+	FileAccess.set_unix_permissions(path, FileAccess.UNIX_READ_OWNER | FileAccess.UNIX_WRITE_OWNER)
+	uds_server = server
+	socket_path = path
+	print("[MCP] HTTP bridge listening on unix:%s" % path)
+	return true
+
+
 func register_route(route_path: String, handler: Callable) -> void:
 	routes[route_path] = handler
 
 
+## Marks cached client answers stale. The argument lets it be connected to
+## signals that pass one.
+func bump_epoch(_arg = null) -> void:
+	change_epoch += 1
+
+
 func _poll() -> void:
 	if not is_running:
 		return
 
-	while tcp_server and tcp_server.is_connection_available():
-		var peer := tcp_server.take_connection()
+	var listener = uds_server if uds_server != null else tcp_server
+	while listener and listener.is_connection_available():
+		var peer = listener.take_connection()
 		if peer:
 			_pending.append({
 				"peer": peer,
 				"buffer": PackedByteArray(),
+				"accepted_usec": Time.get_ticks_usec(),
 				"deadline": Time.get_ticks_msec() + int(CLIENT_TIMEOUT_SEC * 1000.0),
+				"unix": uds_server != null,
 			})
 
 	var finished: Array[int] = []
@@ -102,10 +193,12 @@ func _poll() -> void:
 
 
 ## Returns true when the client is done and can be dropped from the queue.
+## The peer is a StreamPeerTCP or StreamPeerUDS; they share poll() and
+## get_status() but no declared base class before Godot 4.5.
 func _pump_client(entry: Dictionary) -> bool:
-	var peer: StreamPeerTCP = entry.peer
+	var peer = entry.peer
 	peer.poll()
-	var status := peer.get_status()
+	var status: int = peer.get_status()
 
 	if status != StreamPeerTCP.STATUS_CONNECTED:
 		peer.disconnect_from_host()
@@ -115,7 +208,7 @@ func _pump_client(entry: Dictionary) -> bool:
 		_send_response(peer, 408, {"error": "Request timeout"})
 		return true
 
-	var available := peer.get_available_bytes()
+	var available: int = peer.get_available_bytes()
 	if available > 0:
 		var chunk = peer.get_data(available)
 		if chunk[0] == OK:
@@ -125,6 +218,7 @@ func _pump_client(entry: Dictionary) -> bool:
 		_send_response(peer, 413, {"error": "Request too large"})
 		return true
 
+	var parse_start := Time.get_ticks_usec()
 	var raw: String = entry.buffer.get_string_from_utf8()
 	var header_end := raw.find("\r\n\r\n")
 	var separator_len := 4
@@ -149,31 +243,40 @@ func _pump_client(entry: Dictionary) -> bool:
 		return false  # Body not complete yet.
 
 	request_count += 1
-	_dispatch(peer, parsed, body)
+	var request := {
+		"route": parsed.path if routes.has(parsed.path) else BridgeMetrics.UNKNOWN_ROUTE,
+		"timings": {"receive": parse_start - int(entry.accepted_usec), "parse": Time.get_ticks_usec() - parse_start},
+		"bytes_in": entry.buffer.size(),
+		"trace_id": _trace_id(parsed.headers.get("traceparent", "")),
+		"frame": FRAME_TYPE in parsed.headers.get("accept", ""),
+		"encoding": _pick_encoding(parsed.headers.get("accept-encoding", "")),
+		"unix": entry.unix
+	}
+	_dispatch(peer, parsed, body, request)
 	return true
 
 
-func _dispatch(peer: StreamPeerTCP, parsed: Dictionary, body: String) -> void:
-	# Host check: refuse anything that is not loopback. A malicious web page
-	# can make a browser send requests to 127.0.0.1, but DNS rebinding also
-	# lets it fake a "real" hostname. Rejecting foreign Host values kills that.
-	var host: String = parsed.headers.get("host", "")
-	if not _is_loopback_host(host):
-		_send_response(peer, 403, {"error": "Forbidden host"})
-		return
+## request: {route, timings (phase -> usec), bytes_in, trace_id, frame,
+## encoding, unix}, carried along until the response is sent and recorded.
+func _dispatch(peer: StreamPeer, parsed: Dictionary, body: String, request: Dictionary) -> void:
+	var timings: Dictionary = request.timings
+	var phase_start := Time.get_ticks_usec()
 
-	# Browsers always attach an Origin header to cross-site requests.
-	# Direct clients (the Python bridge, curl) do not. Reject anything with one.
-	if parsed.headers.has("origin"):
-		_send_response(peer, 403, {"error": "Cross-origin requests are not allowed"})
+	if not request.unix and not _check_browser_safe(peer, parsed, request):
 		return
 
 	# Token check.
 	var provided: String = parsed.headers.get("x-mcp-token", parsed.params.get("token", ""))
 	if auth_token.is_empty() or not _tokens_match(provided, auth_token):
-		_send_response(peer, 401, {"error": "Missing or invalid token. Pass it in the X-MCP-Token header."})
+		_finish(peer, 401, {"error": "Missing or invalid token. Pass it in the X-MCP-Token header."}, request)
 		return
+	timings["auth"] = Time.get_ticks_usec() - phase_start
 
+	if parsed.path == PING_ROUTE:
+		_send_response(peer, 200, {"success": true, "epoch": change_epoch}, request)
+		return
+
+	phase_start = Time.get_ticks_usec()
 	var params: Dictionary = parsed.params
 	if not body.strip_edges().is_empty():
 		var json := JSON.new()
@@ -181,22 +284,84 @@ func _dispatch(peer: StreamPeerTCP, parsed: Dictionary, body: String) -> void:
 			var body_params: Dictionary = json.get_data()
 			for key in body_params:
 				params[key] = body_params[key]
+	timings["json_parse"] = Time.get_ticks_usec() - phase_start
 
 	request_received.emit(parsed.method, parsed.path, params)
 
 	if routes.has(parsed.path):
 		var handler: Callable = routes[parsed.path]
 		if handler.is_valid():
-			_respond_async(peer, handler, params)
+			_respond_async(peer, handler, params, request)
 		else:
-			_send_response(peer, 500, {"error": "Handler is no longer valid"})
+			_finish(peer, 500, {"error": "Handler is no longer valid"}, request)
 	else:
-		_send_response(peer, 404, {"error": "Route not found", "path": parsed.path})
+		_finish(peer, 404, {"error": "Route not found", "path": parsed.path}, request)
+
+
+## Host and Origin checks for TCP clients. Answers 403 and returns false
+## when the request may come from a browser.
+func _check_browser_safe(peer: StreamPeer, parsed: Dictionary, request: Dictionary) -> bool:
+	# Host check: refuse anything that is not loopback. A malicious web page
+	# can make a browser send requests to 127.0.0.1, but DNS rebinding also
+	# lets it fake a "real" hostname. Rejecting foreign Host values kills that.
+	var host: String = parsed.headers.get("host", "")
+	if not _is_loopback_host(host):
+		_finish(peer, 403, {"error": "Forbidden host"}, request)
+		return false
+
+	# Browsers always attach an Origin header to cross-site requests.
+	# Direct clients (the Python bridge, curl) do not. Reject anything with one.
+	if parsed.headers.has("origin"):
+		_finish(peer, 403, {"error": "Cross-origin requests are not allowed"}, request)
+		return false
+	return true
 
 
-func _respond_async(peer: StreamPeerTCP, handler: Callable, params: Dictionary) -> void:
+func _respond_async(peer: StreamPeer, handler: Callable, params: Dictionary, request: Dictionary) -> void:
+	metrics.in_flight += 1
+	var handler_start := Time.get_ticks_usec()
 	var result = await handler.call(params)
-	_send_response(peer, 200, result)
+	request.timings["handler"] = Time.get_ticks_usec() - handler_start
+	metrics.in_flight -= 1
+	_finish(peer, 200, result, request)
+
+
+## Sends the response and records the request in metrics.
+func _finish(peer: StreamPeer, status_code: int, data: Variant, request: Dictionary) -> void:
+	var timings: Dictionary = request.timings
+	var bytes_out := _send_response(peer, status_code, data, request)
+	var success: bool = not (data is Dictionary and not data.get("success", true))
+	metrics.record(request.route, status_code, success, timings, request.bytes_in, bytes_out, request.trace_id)
+	var total_usec := 0
+	for usec in timings.values():
+		total_usec += usec
+	request_completed.emit(request.route, status_code, total_usec / 1000.0)
+
+
+## The trace id of a W3C traceparent header ("00-<trace id>-<span id>-<flags>"),
+## or "" when the header is missing or malformed.
+func _trace_id(traceparent: String) -> String:
+	var parts := traceparent.strip_edges().split("-")
+	if parts.size() != 4 or parts[1].length() != 32 or not parts[1].is_valid_hex_number():
+		return ""
+	return parts[1].to_lower()
+
+
+## The preferred entry of ENCODINGS that an Accept-Encoding header allows,
+## or "" for none.
+func _pick_encoding(accept_encoding: String) -> String:
+	var accepted := {}
+	for item in accept_encoding.to_lower().split(",", false):
+		var parts := item.split(";")
+		var quality := 1.0
+		for param in parts.slice(1):
+			if param.strip_edges().begins_with("q="):
+				quality = param.strip_edges().substr(2).to_float()
+		accepted[parts[0].strip_edges()] = quality > 0.0
+	for encoding in ENCODINGS:
+		if accepted.get(encoding, false):
+			return encoding
+	return ""
 
 
 func _parse_head(head: String) -> Dictionary:
@@ -260,20 +425,91 @@ func _tokens_match(a: String, b: String) -> bool:
 	return diff == 0
 
 
-func _send_response(peer: StreamPeerTCP, status_code: int, data: Variant) -> void:
-	var body_bytes := JSON.stringify(data).to_utf8_buffer()
+## Adds the stringify, compress and write phases to the request's timings,
+## lists every phase but write in a Server-Timing header, and returns the
+## bytes sent. Without a request (errors before one is parsed) the answer is
+## plain JSON.
+func _send_response(peer: StreamPeer, status_code: int, data: Variant, request: Dictionary = {}) -> int:
+	var timings: Dictionary = request.get("timings", {})
+	var trace_id: String = request.get("trace_id", "")
+	var stringify_start := Time.get_ticks_usec()
+	var encoded := _encode_body(data, request.get("frame", false))
+	var body_bytes: PackedByteArray = encoded[1]
+	timings["stringify"] = Time.get_ticks_usec() - stringify_start
+	var encoding: String = request.get("encoding", "")
+	if encoding.is_empty() or encoded[0] != JSON_TYPE or compress_min_bytes <= 0 or body_bytes.size() < compress_min_bytes:
+		encoding = ""
+	else:
+		var compress_start := Time.get_ticks_usec()
+		body_bytes = body_bytes.compress(ENCODINGS[encoding])
+		timings["compress"] = Time.get_ticks_usec() - compress_start
+	var write_start := Time.get_ticks_usec()
 	var head := "HTTP/1.1 %d %s\r\n" % [status_code, _status_text(status_code)]
-	head += "Content-Type: application/json; charset=utf-8\r\n"
+	head += "Content-Type: %s\r\n" % encoded[0]
+	if not encoding.is_empty():
+		head += "Content-Encoding: %s\r\n" % encoding
 	head += "Content-Length: %d\r\n" % body_bytes.size()
+	head += "Server-Timing: %s\r\n" % _server_timing(timings)
+	head += "X-MCP-Epoch: %d\r\n" % change_epoch
+	if not trace_id.is_empty():
+		head += "X-MCP-Trace-Id: %s\r\n" % trace_id
 	head += "Connection: close\r\n\r\n"
-	peer.put_data(head.to_utf8_buffer())
+	var head_bytes := head.to_utf8_buffer()
+	peer.put_data(head_bytes)
 	peer.put_data(body_bytes)
-	# Give the OS a beat to flush before closing.
+	timings["write"] = Time.get_ticks_usec() - write_start
+	# Give the OS a beat to flush before closing. Untyped: disconnect_from_host()
+	# is on the TCP and UDS peers, not on StreamPeer.
+	var connection = peer
 	var tree := get_tree()
 	if tree:
-		tree.create_timer(0.1).timeout.connect(func(): peer.disconnect_from_host())
+		tree.create_timer(0.1).timeout.connect(func(): connection.disconnect_from_host())
 	else:
-		peer.disconnect_from_host()
+		connection.disconnect_from_host()
+	return head_bytes.size() + body_bytes.size()
+
+
+## [content type, body]. Blobs under "data" become a frame when the client
+## accepts one and base64 strings otherwise; without blobs the data is
+## stringified as is, with no copy.
+func _encode_body(data: Variant, frame: bool) -> Array:
+	var payload = data.get("data") if data is Dictionary else null
+	if not (payload is Dictionary and payload.values().any(func(value): return value is PackedByteArray)):
+		return [JSON_TYPE, JSON.stringify(data).to_utf8_buffer()]
+
+	var blobs: Array[PackedByteArray] = []
+	var offset := 0
+	payload = payload.duplicate()
+	for key in payload:
+		var value = payload[key]
+		if not value is PackedByteArray:
+			continue
+		if frame:
+			payload[key] = {"$blob": blobs.size(), "offset": offset, "length": value.size()}
+			blobs.append(value)
+			offset += value.size()
+		else:
+			payload[key] = Marshalls.raw_to_base64(value)
+	var envelope: Dictionary = data.duplicate()
+	envelope["data"] = payload
+	var json := JSON.stringify(envelope).to_utf8_buffer()
+	if not frame:
+		return [JSON_TYPE, json]
+
+	var body := PackedByteArray()
+	body.resize(4)
+	body.encode_u32(0, json.size())
+	body.append_array(json)
+	for blob in blobs:
+		body.append_array(blob)
+	return [FRAME_TYPE, body]
+
+
+func _server_timing(timings: Dictionary) -> String:
+	var entries := PackedStringArray()
+	for phase in timings:
+		entries.append("%s;dur=%.3f" % [phase, timings[phase] / 1000.0])
+	return ", ".join(entries)
 
 
 func _status_text(code: int) -> String:
@@ -0,0 +1,244 @@
+@tool
+extends Node
+## Replays a timeline of input events with frame-accurate timing.
+##
+## A timeline is a list of events, each scheduled with "frame" (ticks after
+## playback starts) or "ms" (milliseconds after it starts):
+##   {"frame": 0, "type": "key", "keycode": "W", "pressed": true, "hold_frames": 30}
+##   {"ms": 500, "type": "action", "action": "jump"}
+##   {"frame": 40, "type": "mouse_button", "button_index": 1, "position": [200, 120]}
+##   {"frame": 41, "type": "mouse_motion", "position": [220, 120], "relative": [20, 0]}
+## Events are sent from _process or _physics_process (the "clock"), each on
+## the first tick at or after its time. hold_frames/hold_ms add the matching
+## release. Anything still held when playback is cancelled is released.
+
+signal playback_finished
+
+const JobManager = preload("res://addons/godot_mcp_enhanced/job_manager.gd")
+
+const EVENT_TYPES := ["key", "action", "mouse_button", "mouse_motion"]
+
+var _playing: bool = false
+var _job: JobManager.Job = null
+# Pending events sorted by time: [frame or usec, InputEvent, source index]
+var _by_frame: Array = []
+var _by_usec: Array = []
+var _frame_cursor: int = 0
+var _usec_cursor: int = 0
+var _frame: int = 0
+var _start_usec: int = 0
+var _sent: int = 0
+var _max_lag_usec: int = 0
+var _held: Dictionary = {}
+var _trace = null
+
+
+func _ready() -> void:
+	set_process(false)
+	set_physics_process(false)
+
+
+## Plays the timeline and returns once every event was sent (or the job was
+## cancelled). Always await it.
+func play(timeline: Array, clock: String = "process", trace: bool = false, job: JobManager.Job = null) -> Dictionary:
+	if _playing:
+		return {"success": false, "error": "Another input timeline is still playing"}
+	if clock != "process" and clock != "physics":
+		return {"success": false, "error": "clock must be \"process\" or \"physics\""}
+
+	var errors = []
+	_by_frame = []
+	_by_usec = []
+	for i in timeline.size():
+		_schedule(timeline[i], i, errors)
+	if not errors.is_empty():
+		return {"success": false, "error": "Invalid timeline; nothing was played", "errors": errors}
+	_by_frame.sort_custom(func(a, b): return a[0] < b[0] or (a[0] == b[0] and a[2] < b[2]))
+	_by_usec.sort_custom(func(a, b): return a[0] < b[0] or (a[0] == b[0] and a[2] < b[2]))
+
+	_playing = true
+	_job = job
+	_frame_cursor = 0
+	_usec_cursor = 0
+	_frame = 0
+	_sent = 0
+	_max_lag_usec = 0
+	_held.clear()
+	_trace = {"frame": [], "ms": [], "fps": [], "process_time": [], "physics_process_time": []} if trace else null
+	if job:
+		job.total = _by_frame.size() + _by_usec.size()
+	_start_usec = Time.get_ticks_usec()
+	set_process(clock == "process")
+	set_physics_process(clock == "physics")
+
+	await playback_finished
+
+	var cancelled = job != null and job.cancel_requested
+	var result = {
+		"success": true,
+		"completed": not cancelled,
+		"events_sent": _sent,
+		"events_total": _by_frame.size() + _by_usec.size(),
+		"clock": clock,
+		"frames": _frame,
+		"duration_ms": (Time.get_ticks_usec() - _start_usec) / 1000.0,
+		"max_lag_ms": _max_lag_usec / 1000.0
+	}
+	if _trace != null:
+		result["trace"] = _trace
+	_trace = null
+	_job = null
+	return result
+
+
+func _process(_delta: float) -> void:
+	_tick()
+
+
+func _physics_process(_delta: float) -> void:
+	_tick()
+
+
+func _tick() -> void:
+	var elapsed = Time.get_ticks_usec() - _start_usec
+	if _job and _job.cancel_requested:
+		_release_held()
+		_finish()
+		return
+
+	while _frame_cursor < _by_frame.size() and _by_frame[_frame_cursor][0] <= _frame:
+		_send(_by_frame[_frame_cursor][1])
+		_frame_cursor += 1
+	while _usec_cursor < _by_usec.size() and _by_usec[_usec_cursor][0] <= elapsed:
+		_max_lag_usec = maxi(_max_lag_usec, elapsed - _by_usec[_usec_cursor][0])
+		_send(_by_usec[_usec_cursor][1])
+		_usec_cursor += 1
+
+	if _trace != null:
+		_trace.frame.append(_frame)
+		_trace.ms.append(elapsed / 1000.0)
+		_trace.fps.append(Engine.get_frames_per_second())
+		_trace.process_time.append(Performance.get_monitor(Performance.TIME_PROCESS))
+		_trace.physics_process_time.append(Performance.get_monitor(Performance.TIME_PHYSICS_PROCESS))
+
+	_frame += 1
+	if _frame_cursor >= _by_frame.size() and _usec_cursor >= _by_usec.size():
+		_finish()
+
+
+func _finish() -> void:
+	set_process(false)
+	set_physics_process(false)
+	_playing = false
+	playback_finished.emit()
+
+
+func _send(event: InputEvent) -> void:
+	Input.parse_input_event(event)
+	_sent += 1
+	if _job:
+		_job.progress = _sent
+	var key = _hold_key(event)
+	if not key.is_empty():
+		if event.is_pressed():
+			_held[key] = event
+		else:
+			_held.erase(key)
+
+
+func _release_held() -> void:
+	for key in _held:
+		var release = _held[key].duplicate()
+		release.pressed = false
+		Input.parse_input_event(release)
+	_held.clear()
+
+
+func _hold_key(event: InputEvent) -> String:
+	"""Identity of a press that needs a matching release, or "" """
+	if event is InputEventKey:
+		return "key:%d" % event.keycode
+	if event is InputEventAction:
+		return "action:" + event.action
+	if event is InputEventMouseButton:
+		return "mouse:%d" % event.button_index
+	return ""
+
+
+func _schedule(spec: Variant, index: int, errors: Array) -> void:
+	"""Validate one timeline entry and queue its event (and its release)"""
+	if not spec is Dictionary:
+		errors.append({"index": index, "error": "Event must be an object"})
+		return
+	var has_frame = spec.has("frame")
+	if has_frame == spec.has("ms"):
+		errors.append({"index": index, "error": "Give exactly one of frame or ms"})
+		return
+	var event = _make_event(spec, index, errors)
+	if event == null:
+		return
+
+	if has_frame:
+		var frame = int(spec["frame"])
+		_by_frame.append([frame, event, index])
+	else:
+		var usec = int(float(spec["ms"]) * 1000.0)
+		_by_usec.append([usec, event, index])
+
+	if not event.is_pressed() or _hold_key(event).is_empty():
+		return
+	var release = event.duplicate()
+	release.pressed = false
+	if spec.has("hold_frames") and has_frame:
+		_by_frame.append([int(spec["frame"]) + int(spec["hold_frames"]), release, index])
+	elif spec.has("hold_ms") and not has_frame:
+		_by_usec.append([int((float(spec["ms"]) + float(spec["hold_ms"])) * 1000.0), release, index])
+	elif spec.has("hold_frames") or spec.has("hold_ms"):
+		errors.append({"index": index, "error": "Use hold_frames with frame and hold_ms with ms"})
+
+
+func _make_event(spec: Dictionary, index: int, errors: Array) -> InputEvent:
+	var pressed = bool(spec.get("pressed", true))
+	match str(spec.get("type", "")):
+		"key":
+			var keycode = spec.get("keycode", 0)
+			if keycode is String:
+				keycode = OS.find_keycode_from_string(keycode)
+			if int(keycode) == KEY_NONE:
+				errors.append({"index": index, "error": "Unknown keycode: %s" % spec.get("keycode")})
+				return null
+			var event = InputEventKey.new()
+			event.keycode = int(keycode)
+			event.pressed = pressed
+			return event
+		"action":
+			var action = str(spec.get("action", ""))
+			if not InputMap.has_action(action):
+				errors.append({"index": index, "error": "Action '%s' not found in InputMap" % action})
+				return null
+			var event = InputEventAction.new()
+			event.action = action
+			event.pressed = pressed
+			event.strength = float(spec.get("strength", 1.0))
+			return event
+		"mouse_button":
+			var event = InputEventMouseButton.new()
+			event.button_index = int(spec.get("button_index", MOUSE_BUTTON_LEFT))
+			event.pressed = pressed
+			event.position = _to_vector2(spec.get("position"))
+			return event
+		"mouse_motion":
+			var event = InputEventMouseMotion.new()
+			event.position = _to_vector2(spec.get("position"))
+			event.relative = _to_vector2(spec.get("relative"))
+			return event
+	errors.append({"index": index, "error": "type must be one of %s" % ", ".join(EVENT_TYPES)})
+	return null
+
+
+func _to_vector2(value: Variant) -> Vector2:
+	if value is Array and value.size() >= 2:
+		return Vector2(float(value[0]), float(value[1]))
+	if value is Dictionary:
+		return Vector2(float(value.get("x", 0.0)), float(value.get("y", 0.0)))
+	return Vector2.ZERO
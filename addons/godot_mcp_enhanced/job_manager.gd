@@ -0,0 +1,154 @@
+@tool
+extends Node
+## Runs slow bridge handlers as background jobs.
+##
+## Any registered route handler can be started as a job: the request that
+## starts it returns a job id at once, and the handler keeps running across
+## editor frames while clients poll its status and result. Handlers that find
+## a Job in their params (see job_of) cooperate: a Job is a FrameBudget, so
+## they call `await job.tick()` inside their loops to yield to the editor
+## once the job's slice for the current frame is used up, and they report
+## progress and partial results on the Job. Finished jobs are dropped after
+## JOB_TTL_SEC.
+
+signal job_finished(job_id: String, state: String)
+
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+
+const JOB_TTL_SEC := 600.0
+const CLEANUP_INTERVAL_SEC := 30.0
+## Key under which a running job hands itself to its handler.
+const JOB_PARAM := "_job"
+
+
+class Job extends "res://addons/godot_mcp_enhanced/frame_budget.gd":
+	var id: String = ""
+	var route: String = ""
+	## running, completed, failed or cancelled.
+	var state: String = "running"
+	var progress: int = 0
+	var total: int = 0
+	## Results the handler has already produced; readable while it runs.
+	var partial: Array = []
+	var result: Variant = null
+	var error: String = ""
+	var started_msec: int = 0
+	var finished_msec: int = 0
+
+
+## Per-frame slice and FPS floor for jobs that do not ask for their own.
+var default_slice_msec: float = FrameBudget.DEFAULT_SLICE_MSEC
+var min_fps: float = FrameBudget.DEFAULT_MIN_FPS
+
+var jobs: Dictionary = {}
+var _next_job_id: int = 1
+var _cleanup_timer: Timer
+
+
+func _ready() -> void:
+	_cleanup_timer = Timer.new()
+	_cleanup_timer.wait_time = CLEANUP_INTERVAL_SEC
+	_cleanup_timer.timeout.connect(_purge_expired)
+	add_child(_cleanup_timer)
+	_cleanup_timer.start()
+
+
+## The Job a handler is running under, or null for a plain request.
+static func job_of(params: Dictionary) -> Job:
+	var job = params.get(JOB_PARAM)
+	return job if job is Job else null
+
+
+func start(route: String, handler: Callable, params: Dictionary, slice_msec: float = 0.0) -> Job:
+	var job := Job.new()
+	job.id = "job-%d" % _next_job_id
+	_next_job_id += 1
+	job.route = route
+	job.started_msec = Time.get_ticks_msec()
+	job.configure(slice_msec if slice_msec > 0.0 else default_slice_msec, min_fps)
+	jobs[job.id] = job
+	_run(job, handler, params)
+	return job
+
+
+func get_job(job_id: String) -> Job:
+	return jobs.get(job_id)
+
+
+func cancel(job_id: String) -> bool:
+	var job := get_job(job_id)
+	if job == null:
+		return false
+	if job.state == "running":
+		job.cancel_requested = true
+	return true
+
+
+func cancel_all() -> void:
+	for job in jobs.values():
+		if job.state == "running":
+			job.cancel_requested = true
+
+
+## JSON-safe view of a job. The final result is included only on request,
+## since it can be large.
+func describe(job: Job, include_result: bool = false) -> Dictionary:
+	var end_msec := job.finished_msec if job.finished_msec > 0 else Time.get_ticks_msec()
+	var data := {
+		"job_id": job.id,
+		"route": job.route,
+		"state": job.state,
+		"progress": job.progress,
+		"total": job.total,
+		"elapsed_msec": end_msec - job.started_msec,
+		"partial": job.partial.duplicate(true),
+	}
+	if not job.error.is_empty():
+		data["error"] = job.error
+	if include_result and job.state != "running":
+		data["result"] = _without_blobs(job.result)
+	return data
+
+
+## Blobs (screenshot PNGs) travel raw only at the top level of a response,
+## so a job result nested inside one carries them as base64.
+func _without_blobs(result: Variant) -> Variant:
+	if not (result is Dictionary and result.get("data") is Dictionary):
+		return result
+	var payload: Dictionary = result.data.duplicate()
+	for key in payload:
+		if payload[key] is PackedByteArray:
+			payload[key] = Marshalls.raw_to_base64(payload[key])
+	var copy: Dictionary = result.duplicate()
+	copy["data"] = payload
+	return copy
+
+
+func _run(job: Job, handler: Callable, params: Dictionary) -> void:
+	var call_params := params.duplicate()
+	call_params[JOB_PARAM] = job
+	# Start on the next frame so the request that created the job gets its
+	# answer first.
+	await get_tree().process_frame
+	job.restart()
+	var result = await handler.call(call_params)
+
+	job.result = result
+	job.finished_msec = Time.get_ticks_msec()
+	if job.cancel_requested:
+		job.state = "cancelled"
+	elif result is Dictionary and not result.get("success", true):
+		job.state = "failed"
+		job.error = str(result.get("error", "Handler failed"))
+	else:
+		job.state = "completed"
+	job_finished.emit(job.id, job.state)
+
+
+func _purge_expired() -> void:
+	var now := Time.get_ticks_msec()
+	var ttl_msec := int(JOB_TTL_SEC * 1000.0)
+	for job_id in jobs.keys():
+		var job: Job = jobs[job_id]
+		if job.state != "running" and now - job.finished_msec > ttl_msec:
+			jobs.erase(job_id)
@@ -0,0 +1,211 @@
+@tool
+extends Node
+## Lookup index for the nodes of the edited scene.
+##
+## Nodes are indexed by class, group and script as they enter and leave the
+## tree, so find_nodes only looks at candidates instead of walking the whole
+## scene. Class never changes for a node; groups and scripts can change
+## without a tree signal, so those two indexes are rebuilt lazily after any
+## editor undo/redo action, or after mark_stale(). Every candidate is checked
+## against all filters, so a stale index never returns a wrong node, but it
+## can miss one: changes made outside undo/redo must call mark_stale().
+
+const DEFAULT_LIMIT := 100
+
+# Node instance id -> Node
+var _nodes: Dictionary = {}
+# class name -> {id: true}
+var _by_class: Dictionary = {}
+# group -> {id: true}
+var _by_group: Dictionary = {}
+# script resource path -> {id: true}
+var _by_script: Dictionary = {}
+# Groups and scripts may have changed since they were indexed
+var _stale: bool = true
+# class name -> whether it is the queried type or a subclass, per queried type
+var _subclass_cache: Dictionary = {}
+
+
+func _ready() -> void:
+	rebuild()
+	get_tree().node_added.connect(_on_node_added)
+	get_tree().node_removed.connect(_on_node_removed)
+	EditorInterface.get_editor_undo_redo().version_changed.connect(_on_undo_redo_version_changed)
+
+
+func _exit_tree() -> void:
+	get_tree().node_added.disconnect(_on_node_added)
+	get_tree().node_removed.disconnect(_on_node_removed)
+	EditorInterface.get_editor_undo_redo().version_changed.disconnect(_on_undo_redo_version_changed)
+
+
+## Re-indexes the edited scene from scratch. Connected to the plugin's
+## scene_changed signal.
+func rebuild(_scene_root: Node = null) -> void:
+	_nodes.clear()
+	_by_class.clear()
+	_by_group.clear()
+	_by_script.clear()
+	var root = EditorInterface.get_edited_scene_root()
+	if root:
+		var stack := [root]
+		while not stack.is_empty():
+			var node: Node = stack.pop_back()
+			_add(node)
+			stack.append_array(node.get_children())
+	_stale = false
+
+
+## Call after changing groups or scripts without an undo/redo action.
+func mark_stale() -> void:
+	_stale = true
+
+
+func find_nodes(params: Dictionary) -> Dictionary:
+	"""Find nodes of the edited scene by type, group, name glob and script"""
+	var type_name = str(params.get("type", ""))
+	var group = str(params.get("group", ""))
+	var name_glob = str(params.get("name_glob", ""))
+	var script_path = str(params.get("script", ""))
+	var limit = int(params.get("limit", DEFAULT_LIMIT))
+
+	var root = EditorInterface.get_edited_scene_root()
+	if not root:
+		return {"success": false, "error": "No scene currently open"}
+	if not type_name.is_empty() and not ClassDB.class_exists(type_name):
+		return {"success": false, "error": "Unknown class: " + type_name}
+
+	if _stale and (not group.is_empty() or not script_path.is_empty()):
+		_reindex_groups_and_scripts()
+
+	# Start from the smallest candidate set the filters allow
+	var candidates = null
+	if not group.is_empty():
+		candidates = _by_group.get(group, {})
+	if not script_path.is_empty():
+		var by_script = _by_script.get(script_path, {})
+		if candidates == null or by_script.size() < candidates.size():
+			candidates = by_script
+	if not type_name.is_empty():
+		var by_type = _ids_of_type(type_name)
+		if candidates == null or by_type.size() < candidates.size():
+			candidates = by_type
+	if candidates == null:
+		candidates = _nodes
+
+	var matches = []
+	var total = 0
+	for id in candidates:
+		var node = _nodes.get(id)
+		if not is_instance_valid(node):
+			continue
+		if not type_name.is_empty() and not node.is_class(type_name):
+			continue
+		if not group.is_empty() and not node.is_in_group(group):
+			continue
+		if not name_glob.is_empty() and not String(node.name).match(name_glob):
+			continue
+		if not script_path.is_empty() and _script_path(node) != script_path:
+			continue
+		total += 1
+		if matches.size() < limit:
+			matches.append({
+				"name": node.name,
+				"type": node.get_class(),
+				"path": str(node.get_path()),
+				"node_path": str(root.get_path_to(node))
+			})
+
+	return {"success": true, "data": {"nodes": matches, "count": total, "truncated": total > matches.size()}}
+
+
+func _ids_of_type(type_name: String) -> Dictionary:
+	"""Ids of indexed nodes whose class is type_name or inherits it"""
+	if not _subclass_cache.has(type_name):
+		_subclass_cache[type_name] = {}
+	var is_subclass: Dictionary = _subclass_cache[type_name]
+	var sets = []
+	for indexed_class in _by_class:
+		if not is_subclass.has(indexed_class):
+			is_subclass[indexed_class] = indexed_class == type_name or ClassDB.is_parent_class(indexed_class, type_name)
+		if is_subclass[indexed_class]:
+			sets.append(_by_class[indexed_class])
+	if sets.size() == 1:
+		return sets[0]
+	var ids = {}
+	for class_ids in sets:
+		ids.merge(class_ids)
+	return ids
+
+
+func _add(node: Node) -> void:
+	var id = node.get_instance_id()
+	_nodes[id] = node
+	_index(_by_class, node.get_class(), id)
+	for group in node.get_groups():
+		_index(_by_group, str(group), id)
+	var script_path = _script_path(node)
+	if not script_path.is_empty():
+		_index(_by_script, script_path, id)
+
+
+func _remove(node: Node) -> void:
+	var id = node.get_instance_id()
+	if not _nodes.erase(id):
+		return
+	_unindex(_by_class, node.get_class(), id)
+	for group in node.get_groups():
+		_unindex(_by_group, str(group), id)
+	var script_path = _script_path(node)
+	if not script_path.is_empty():
+		_unindex(_by_script, script_path, id)
+
+
+func _reindex_groups_and_scripts() -> void:
+	_by_group.clear()
+	_by_script.clear()
+	for id in _nodes.keys():
+		var node = _nodes[id]
+		if not is_instance_valid(node):
+			_nodes.erase(id)
+			continue
+		for group in node.get_groups():
+			_index(_by_group, str(group), id)
+		var script_path = _script_path(node)
+		if not script_path.is_empty():
+			_index(_by_script, script_path, id)
+	_stale = false
+
+
+func _index(index: Dictionary, key: String, id: int) -> void:
+	if not index.has(key):
+		index[key] = {}
+	index[key][id] = true
+
+
+func _unindex(index: Dictionary, key: String, id: int) -> void:
+	var ids = index.get(key)
+	if ids == null:
+		return
+	ids.erase(id)
+	if ids.is_empty():
+		index.erase(key)
+
+
+func _script_path(node: Node) -> String:
+	var script = node.get_script()
+	return script.resource_path if script else ""
+
+
+func _on_node_added(node: Node) -> void:
+	var root = EditorInterface.get_edited_scene_root()
+	if root and (node == root or root.is_ancestor_of(node)):
+		_add(node)
+
+
+func _on_node_removed(node: Node) -> void:
+	_remove(node)
+
+
+func _on_undo_redo_version_changed() -> void:
+	_stale = true
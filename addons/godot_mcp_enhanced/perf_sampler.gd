@@ -0,0 +1,187 @@
+@tool
+extends Node
+## Per-frame performance sampler.
+##
+## While running, records the chosen monitors every editor frame into
+## fixed-size ring buffers, so spikes can be examined afterwards without
+## polling over HTTP (which would itself disturb the frames being measured).
+## Monitors are named by the keys of MONITORS, "frame_ms" (the frame's delta
+## in milliseconds), or the id of a custom Performance monitor.
+
+const DEFAULT_CAPACITY := 3600
+const MAX_CAPACITY := 216000
+
+const MONITORS := {
+	"fps": Performance.TIME_FPS,
+	"process_time": Performance.TIME_PROCESS,
+	"physics_process_time": Performance.TIME_PHYSICS_PROCESS,
+	"navigation_process_time": Performance.TIME_NAVIGATION_PROCESS,
+	"memory_static": Performance.MEMORY_STATIC,
+	"memory_static_max": Performance.MEMORY_STATIC_MAX,
+	"memory_message_buffer_max": Performance.MEMORY_MESSAGE_BUFFER_MAX,
+	"objects": Performance.OBJECT_COUNT,
+	"resources": Performance.OBJECT_RESOURCE_COUNT,
+	"nodes": Performance.OBJECT_NODE_COUNT,
+	"orphan_nodes": Performance.OBJECT_ORPHAN_NODE_COUNT,
+	"objects_in_frame": Performance.RENDER_TOTAL_OBJECTS_IN_FRAME,
+	"primitives_in_frame": Performance.RENDER_TOTAL_PRIMITIVES_IN_FRAME,
+	"draw_calls": Performance.RENDER_TOTAL_DRAW_CALLS_IN_FRAME,
+	"video_mem_used": Performance.RENDER_VIDEO_MEM_USED,
+	"texture_mem_used": Performance.RENDER_TEXTURE_MEM_USED,
+	"buffer_mem_used": Performance.RENDER_BUFFER_MEM_USED,
+	"physics_2d_active_objects": Performance.PHYSICS_2D_ACTIVE_OBJECTS,
+	"physics_3d_active_objects": Performance.PHYSICS_3D_ACTIVE_OBJECTS,
+	"audio_output_latency": Performance.AUDIO_OUTPUT_LATENCY,
+}
+const DEFAULT_MONITORS := ["frame_ms", "process_time", "physics_process_time"]
+
+var _running: bool = false
+var _capacity: int = DEFAULT_CAPACITY
+var _monitors: Array = []
+# One ring buffer for all monitors, a row of _monitors.size() values per
+# frame. A single member array is written in place; packed arrays kept in a
+# Dictionary would be copied on every write.
+var _samples := PackedFloat32Array()
+var _write_index: int = 0
+var _count: int = 0
+var _started_msec: int = 0
+
+
+func _ready() -> void:
+	set_process(false)
+
+
+func start(monitors: Array = [], capacity: int = DEFAULT_CAPACITY) -> Dictionary:
+	"""Start (or restart) sampling; earlier samples are dropped"""
+	if monitors.is_empty():
+		monitors = DEFAULT_MONITORS
+	var unknown = monitors.filter(func(name): return not _is_known(str(name)))
+	if not unknown.is_empty():
+		return {"success": false, "error": "Unknown monitors: %s" % ", ".join(unknown), "known": ["frame_ms"] + MONITORS.keys()}
+
+	_capacity = clampi(capacity, 1, MAX_CAPACITY)
+	_monitors = monitors.map(func(name): return str(name))
+	_samples = PackedFloat32Array()
+	_samples.resize(_capacity * _monitors.size())
+	_write_index = 0
+	_count = 0
+	_started_msec = Time.get_ticks_msec()
+	_running = true
+	set_process(true)
+	return {"success": true, "data": status()}
+
+
+func stop() -> Dictionary:
+	"""Stop sampling; recorded samples stay readable"""
+	_running = false
+	set_process(false)
+	return {"success": true, "data": status()}
+
+
+func status() -> Dictionary:
+	return {
+		"running": _running,
+		"monitors": _monitors,
+		"samples": _count,
+		"capacity": _capacity,
+		"elapsed_msec": Time.get_ticks_msec() - _started_msec if _started_msec > 0 else 0
+	}
+
+
+func get_series(monitors: Array = [], window: int = 0, series: String = "none", points: int = 200) -> Dictionary:
+	"""Summary statistics over the last `window` samples (all when 0), with
+	the samples themselves when series is "raw", or reduced to `points`
+	buckets holding each bucket's maximum when series is "downsampled"."""
+	if _monitors.is_empty():
+		return {"success": false, "error": "Sampler has not been started"}
+	if monitors.is_empty():
+		monitors = _monitors
+	var size = _count if window <= 0 else mini(window, _count)
+
+	var results = {}
+	for name in monitors:
+		var column = _monitors.find(name)
+		if column == -1:
+			return {"success": false, "error": "Monitor is not being sampled: %s" % name}
+		var values = _window(column, size)
+		var entry = _summarize(values)
+		match series:
+			"raw":
+				entry["series"] = Array(values)
+			"downsampled":
+				entry["series"] = _downsample(values, maxi(1, points))
+		results[name] = entry
+
+	var data = status()
+	data["window"] = size
+	data["series"] = results
+	return {"success": true, "data": data}
+
+
+func _process(delta: float) -> void:
+	var row = _write_index * _monitors.size()
+	for column in _monitors.size():
+		_samples[row + column] = _read(_monitors[column], delta)
+	_write_index = (_write_index + 1) % _capacity
+	_count = mini(_count + 1, _capacity)
+
+
+func _read(name: String, delta: float) -> float:
+	if name == "frame_ms":
+		return delta * 1000.0
+	if MONITORS.has(name):
+		return Performance.get_monitor(MONITORS[name])
+	return float(Performance.get_custom_monitor(name))
+
+
+func _is_known(name: String) -> bool:
+	return name == "frame_ms" or MONITORS.has(name) or Performance.has_custom_monitor(name)
+
+
+func _window(column: int, size: int) -> PackedFloat32Array:
+	"""The newest `size` samples of one monitor, oldest first"""
+	var stride = _monitors.size()
+	var values = PackedFloat32Array()
+	values.resize(size)
+	var frame = (_write_index - size + _capacity) % _capacity
+	for i in size:
+		values[i] = _samples[frame * stride + column]
+		frame = (frame + 1) % _capacity
+	return values
+
+
+func _summarize(values: PackedFloat32Array) -> Dictionary:
+	if values.is_empty():
+		return {"min": null, "max": null, "mean": null, "p95": null, "p99": null}
+	var sorted = values.duplicate()
+	sorted.sort()
+	var total = 0.0
+	for value in values:
+		total += value
+	return {
+		"min": sorted[0],
+		"max": sorted[sorted.size() - 1],
+		"mean": total / values.size(),
+		"p95": _percentile(sorted, 0.95),
+		"p99": _percentile(sorted, 0.99)
+	}
+
+
+func _percentile(sorted: PackedFloat32Array, fraction: float) -> float:
+	"""Nearest-rank percentile of an ascending array"""
+	var rank = int(ceil(fraction * sorted.size())) - 1
+	return sorted[clampi(rank, 0, sorted.size() - 1)]
+
+
+func _downsample(values: PackedFloat32Array, points: int) -> Array:
+	if values.size() <= points:
+		return Array(values)
+	var result = []
+	for bucket in points:
+		var from = bucket * values.size() / points
+		var to = (bucket + 1) * values.size() / points
+		var peak = values[from]
+		for i in range(from + 1, to):
+			peak = maxf(peak, values[i])
+		result.append(peak)
+	return result
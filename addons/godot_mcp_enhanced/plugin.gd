@@ -8,6 +8,15 @@ const ScriptOperations = preload("res://addons/godot_mcp_enhanced/script_operati
 const DebuggerIntegration = preload("res://addons/godot_mcp_enhanced/debugger_integration.gd")
 const FileOperations = preload("res://addons/godot_mcp_enhanced/file_operations.gd")
 const RuntimeOperations = preload("res://addons/godot_mcp_enhanced/runtime_operations.gd")
+const JobManager = preload("res://addons/godot_mcp_enhanced/job_manager.gd")
+const SceneJournal = preload("res://addons/godot_mcp_enhanced/scene_journal.gd")
+const NodeIndex = preload("res://addons/godot_mcp_enhanced/node_index.gd")
+const InputPlayer = preload("res://addons/godot_mcp_enhanced/input_player.gd")
+const PerfSampler = preload("res://addons/godot_mcp_enhanced/perf_sampler.gd")
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+
+## Relative to the project root. .godot/ is already ignored by version control.
+const DEFAULT_SOCKET_PATH := ".godot/mcp_bridge.sock"
 
 var http_server: Node
 var screenshot_manager: Node
@@ -16,6 +25,11 @@ var script_operations: Node
 var debugger_integration: Node
 var file_operations: Node
 var runtime_operations: Node
+var job_manager: Node
+var scene_journal: Node
+var node_index: Node
+var input_player: Node
+var perf_sampler: Node
 
 var bottom_panel: Control
 var config: Dictionary = {}
@@ -31,7 +45,13 @@ func _enter_tree() -> void:
 	# Initialize core systems
 	http_server = HTTPServer.new()
 	http_server.name = "MCPHTTPServer"
+	http_server.compress_min_bytes = int(config.get("COMPRESS_MIN_BYTES", HTTPServer.DEFAULT_COMPRESS_MIN_BYTES))
 	add_child(http_server)
+	http_server.metrics.register_monitors()
+	# Answers the MCP server may cache depend on project files and settings
+	EditorInterface.get_resource_filesystem().filesystem_changed.connect(http_server.bump_epoch)
+	EditorInterface.get_resource_filesystem().resources_reimported.connect(http_server.bump_epoch)
+	ProjectSettings.settings_changed.connect(http_server.bump_epoch)
 	
 	screenshot_manager = ScreenshotManager.new()
 	screenshot_manager.name = "MCPScreenshotManager"
@@ -61,6 +81,31 @@ func _enter_tree() -> void:
 	runtime_operations.editor_interface = EditorInterface
 	add_child(runtime_operations)
 	
+	job_manager = JobManager.new()
+	job_manager.name = "MCPJobManager"
+	job_manager.default_slice_msec = float(config.get("SCAN_FRAME_BUDGET_MSEC", FrameBudget.DEFAULT_SLICE_MSEC))
+	job_manager.min_fps = float(config.get("SCAN_MIN_FPS", FrameBudget.DEFAULT_MIN_FPS))
+	add_child(job_manager)
+	
+	scene_journal = SceneJournal.new()
+	scene_journal.name = "MCPSceneJournal"
+	scene_journal.scene_operations = scene_operations
+	add_child(scene_journal)
+	scene_changed.connect(scene_journal.reset)
+	
+	node_index = NodeIndex.new()
+	node_index.name = "MCPNodeIndex"
+	add_child(node_index)
+	scene_changed.connect(node_index.rebuild)
+	
+	input_player = InputPlayer.new()
+	input_player.name = "MCPInputPlayer"
+	add_child(input_player)
+	
+	perf_sampler = PerfSampler.new()
+	perf_sampler.name = "MCPPerfSampler"
+	add_child(perf_sampler)
+	
 	# Connect HTTP server to operation handlers
 	_setup_http_routes()
 	
@@ -71,7 +116,7 @@ func _enter_tree() -> void:
 	var port = int(config.get("GDAI_MCP_SERVER_PORT", 3571))
 	print("[Godot MCP Enhanced] Attempting to start HTTP server on port %d..." % port)
 	
-	var success = http_server.start_server(port, str(config.get("GDAI_MCP_TOKEN", "")))
+	var success = http_server.start_server(port, str(config.get("GDAI_MCP_TOKEN", "")), _socket_path())
 	
 	if success:
 		print("[Godot MCP Enhanced] ✓ HTTP Server started successfully on port %d" % port)
@@ -95,6 +140,14 @@ func _exit_tree() -> void:
 	# Stop HTTP server
 	if http_server:
 		http_server.stop_server()
+		http_server.metrics.unregister_monitors()
+		EditorInterface.get_resource_filesystem().filesystem_changed.disconnect(http_server.bump_epoch)
+		EditorInterface.get_resource_filesystem().resources_reimported.disconnect(http_server.bump_epoch)
+		ProjectSettings.settings_changed.disconnect(http_server.bump_epoch)
+	
+	# Running jobs stop at their next yield point
+	if job_manager:
+		job_manager.cancel_all()
 	
 	# Remove bottom panel
 	if bottom_panel:
@@ -103,7 +156,8 @@ func _exit_tree() -> void:
 	
 	# Clean up nodes
 	for child in [http_server, screenshot_manager, scene_operations, 
-				  script_operations, debugger_integration, file_operations, runtime_operations]:
+				  script_operations, debugger_integration, file_operations, runtime_operations,
+				  job_manager, scene_journal, node_index, input_player, perf_sampler]:
 		if child:
 			child.queue_free()
 	
@@ -142,6 +196,30 @@ func _load_config() -> void:
 		print("[Godot MCP Enhanced] Generated new auth token in ", config_path)
 
 
+## Where to listen when GDAI_MCP_TRANSPORT is "unix": GDAI_MCP_SOCKET_PATH,
+## relative to the project root unless absolute, or "" for TCP.
+func _socket_path() -> String:
+	if str(config.get("GDAI_MCP_TRANSPORT", "tcp")).to_lower() != "unix":
+		return ""
+	var path = str(config.get("GDAI_MCP_SOCKET_PATH", DEFAULT_SOCKET_PATH))
+	if path.is_absolute_path():
+		return path
+	return ProjectSettings.globalize_path("res://").path_join(path)
+
+
+## Frame budget for handlers that walk the project or the scene tree. A job
+## is its own budget; plain requests get one from the SCAN_FRAME_BUDGET_MSEC
+## and SCAN_MIN_FPS config keys, so a big scan still leaves the editor
+## drawing frames while the HTTP response waits.
+func _scan_budget(params: Dictionary) -> FrameBudget:
+	var job = JobManager.job_of(params)
+	if job:
+		return job
+	return FrameBudget.new(
+		float(config.get("SCAN_FRAME_BUDGET_MSEC", FrameBudget.DEFAULT_SLICE_MSEC)),
+		float(config.get("SCAN_MIN_FPS", FrameBudget.DEFAULT_MIN_FPS)))
+
+
 func _generate_token() -> String:
 	var crypto := Crypto.new()
 	return crypto.generate_random_bytes(32).hex_encode()
@@ -162,11 +240,15 @@ func _setup_http_routes() -> void:
 	http_server.register_route("/api/project/search_files", _handle_search_files)
 	http_server.register_route("/api/project/uid_to_path", _handle_uid_to_project_path)
 	http_server.register_route("/api/project/path_to_uid", _handle_project_path_to_uid)
+	http_server.register_route("/api/project/uids_to_paths", _handle_uids_to_project_paths)
+	http_server.register_route("/api/project/paths_to_uids", _handle_project_paths_to_uids)
 	http_server.register_route("/api/project/quick_overview", _handle_quick_project_overview)
 	http_server.register_route("/api/project/analyze_dependencies", _handle_analyze_project_dependencies)
 	
 	# Scene tools
 	http_server.register_route("/api/scene/tree", _handle_get_scene_tree)
+	http_server.register_route("/api/scene/tree_delta", _handle_get_scene_tree_delta)
+	http_server.register_route("/api/scene/find_nodes", _handle_find_nodes)
 	http_server.register_route("/api/scene/file_content", _handle_get_scene_file_content)
 	http_server.register_route("/api/scene/create", _handle_create_scene)
 	http_server.register_route("/api/scene/open", _handle_open_scene)
@@ -181,6 +263,9 @@ func _setup_http_routes() -> void:
 	http_server.register_route("/api/node/duplicate", _handle_duplicate_node)
 	http_server.register_route("/api/node/move", _handle_move_node)
 	http_server.register_route("/api/node/update_property", _handle_update_property)
+	http_server.register_route("/api/node/get_properties", _handle_get_properties)
+	http_server.register_route("/api/node/set_properties", _handle_set_properties)
+	http_server.register_route("/api/scene/apply_patch", _handle_apply_scene_patch)
 	http_server.register_route("/api/node/add_resource", _handle_add_resource)
 	http_server.register_route("/api/node/set_anchor_preset", _handle_set_anchor_preset)
 	http_server.register_route("/api/node/set_anchor_values", _handle_set_anchor_values)
@@ -202,7 +287,13 @@ func _setup_http_routes() -> void:
 	# Runtime operations
 	http_server.register_route("/api/runtime/simulate_key", _handle_simulate_key_press)
 	http_server.register_route("/api/runtime/simulate_action", _handle_simulate_action)
+	http_server.register_route("/api/runtime/simulate_mouse_button", _handle_simulate_mouse_button)
+	http_server.register_route("/api/runtime/simulate_mouse_motion", _handle_simulate_mouse_motion)
+	http_server.register_route("/api/runtime/play_input_timeline", _handle_play_input_timeline)
 	http_server.register_route("/api/runtime/get_runtime_stats", _handle_get_runtime_stats)
+	http_server.register_route("/api/runtime/perf/start", _handle_start_perf_sampler)
+	http_server.register_route("/api/runtime/perf/stop", _handle_stop_perf_sampler)
+	http_server.register_route("/api/runtime/perf/series", _handle_get_perf_series)
 	http_server.register_route("/api/runtime/get_node_properties", _handle_get_node_properties)
 	http_server.register_route("/api/runtime/call_node_method", _handle_call_node_method)
 	http_server.register_route("/api/runtime/get_installed_plugins", _handle_get_installed_plugins)
@@ -216,6 +307,15 @@ func _setup_http_routes() -> void:
 	http_server.register_route("/api/asset/reimport", _handle_reimport_assets)
 	http_server.register_route("/api/asset/import_info", _handle_get_import_info)
 	
+	# Background jobs: any route above can run as a job
+	http_server.register_route("/api/jobs/start", _handle_start_job)
+	http_server.register_route("/api/jobs/status", _handle_job_status)
+	http_server.register_route("/api/jobs/result", _handle_job_result)
+	http_server.register_route("/api/jobs/cancel", _handle_cancel_job)
+	
+	# Bridge instrumentation
+	http_server.register_route("/api/bridge/metrics", _handle_get_bridge_metrics)
+	
 	# Editor context tools (kept under the old /api/windsurf/* paths too, so
 	# existing clients keep working)
 	http_server.register_route("/api/context/summary", _handle_get_editor_context)
@@ -234,6 +334,8 @@ func _create_bottom_panel() -> void:
 	
 	# Update UI with current config
 	bottom_panel.update_config_display(config)
+	bottom_panel.bridge_metrics = http_server.metrics
+	http_server.request_completed.connect(bottom_panel.on_request_completed)
 
 
 # HTTP Route Handlers - Project Tools
@@ -252,13 +354,13 @@ func _handle_get_project_info(params: Dictionary) -> Dictionary:
 
 func _handle_get_filesystem_tree(params: Dictionary) -> Dictionary:
 	var filters = params.get("filters", [])
-	var tree = file_operations.get_filesystem_tree("res://", filters)
+	var tree = await file_operations.get_filesystem_tree("res://", filters, _scan_budget(params))
 	return {"success": true, "data": tree}
 
 
 func _handle_search_files(params: Dictionary) -> Dictionary:
 	var query = params.get("query", "")
-	var results = file_operations.search_files(query)
+	var results = await file_operations.search_files(query, "res://", _scan_budget(params))
 	return {"success": true, "data": results}
 
 
@@ -274,18 +376,41 @@ func _handle_project_path_to_uid(params: Dictionary) -> Dictionary:
 	return {"success": true, "data": {"uid": uid}}
 
 
+func _handle_uids_to_project_paths(params: Dictionary) -> Dictionary:
+	var uids = params.get("uids", [])
+	return file_operations.uids_to_project_paths(uids)
+
+
+func _handle_project_paths_to_uids(params: Dictionary) -> Dictionary:
+	var paths = params.get("paths", [])
+	return file_operations.project_paths_to_uids(paths)
+
+
 func _handle_quick_project_overview(params: Dictionary) -> Dictionary:
-	return file_operations.get_quick_project_overview()
+	return await file_operations.get_quick_project_overview(_scan_budget(params))
 
 
 func _handle_analyze_project_dependencies(params: Dictionary) -> Dictionary:
-	return file_operations.analyze_project_dependencies()
+	return await file_operations.analyze_project_dependencies(JobManager.job_of(params))
 
 
 # HTTP Route Handlers - Scene Tools
 func _handle_get_scene_tree(params: Dictionary) -> Dictionary:
-	var tree = scene_operations.get_scene_tree()
-	return {"success": true, "data": tree}
+	var properties = params.get("properties")
+	if properties != null and not properties is Array:
+		return {"success": false, "error": "properties must be an array of property names"}
+	var version = scene_journal.version
+	var tree = await scene_operations.get_scene_tree(_scan_budget(params), properties, str(params.get("format", "tree")))
+	return {"success": true, "data": tree, "version": version}
+
+
+func _handle_get_scene_tree_delta(params: Dictionary) -> Dictionary:
+	var since_version = int(params.get("since_version", 0))
+	return await scene_journal.get_delta(since_version, _scan_budget(params))
+
+
+func _handle_find_nodes(params: Dictionary) -> Dictionary:
+	return node_index.find_nodes(params)
 
 
 func _handle_get_scene_file_content(params: Dictionary) -> Dictionary:
@@ -351,6 +476,18 @@ func _handle_update_property(params: Dictionary) -> Dictionary:
 	return scene_operations.update_property(params)
 
 
+func _handle_get_properties(params: Dictionary) -> Dictionary:
+	return scene_operations.get_properties(params)
+
+
+func _handle_set_properties(params: Dictionary) -> Dictionary:
+	return scene_operations.set_properties(params)
+
+
+func _handle_apply_scene_patch(params: Dictionary) -> Dictionary:
+	return scene_operations.apply_scene_patch(params)
+
+
 func _handle_add_resource(params: Dictionary) -> Dictionary:
 	return scene_operations.add_resource(params)
 
@@ -377,6 +514,8 @@ func _handle_create_script(params: Dictionary) -> Dictionary:
 
 
 func _handle_attach_script(params: Dictionary) -> Dictionary:
+	# set_script() is not an undo action, so the index would not notice
+	node_index.mark_stale()
 	return script_operations.attach_script(params)
 
 
@@ -390,18 +529,22 @@ func _handle_get_godot_errors(params: Dictionary) -> Dictionary:
 
 
 func _handle_get_editor_screenshot(params: Dictionary) -> Dictionary:
-	var screenshot_data = screenshot_manager.capture_editor_screenshot()
+	var screenshot_data = screenshot_manager.capture_editor_png()
 	return {"success": true, "data": {"screenshot": screenshot_data}}
 
 
 func _handle_get_running_scene_screenshot(params: Dictionary) -> Dictionary:
-	var screenshot_data = screenshot_manager.capture_running_scene_screenshot()
+	var screenshot_data = screenshot_manager.capture_running_scene_png()
 	return {"success": true, "data": {"screenshot": screenshot_data}}
 
 
 func _handle_execute_editor_script(params: Dictionary) -> Dictionary:
 	var code = params.get("code", "")
-	return script_operations.execute_editor_script(code)
+	# User code can change groups, scripts and properties without an undo action
+	node_index.mark_stale()
+	var result = script_operations.execute_editor_script(code)
+	scene_journal.record_change()
+	return result
 
 
 func _handle_clear_output_logs(params: Dictionary) -> Dictionary:
@@ -422,10 +565,57 @@ func _handle_simulate_action(params: Dictionary) -> Dictionary:
 	return runtime_operations.simulate_action(action_name, pressed, strength)
 
 
+func _handle_simulate_mouse_button(params: Dictionary) -> Dictionary:
+	var button_index = int(params.get("button_index", MOUSE_BUTTON_LEFT))
+	var pressed = params.get("pressed", true)
+	var position = Vector2(float(params.get("x", 0.0)), float(params.get("y", 0.0)))
+	return runtime_operations.simulate_mouse_button(button_index, pressed, position)
+
+
+func _handle_simulate_mouse_motion(params: Dictionary) -> Dictionary:
+	var position = Vector2(float(params.get("x", 0.0)), float(params.get("y", 0.0)))
+	var relative = Vector2(float(params.get("relative_x", 0.0)), float(params.get("relative_y", 0.0)))
+	return runtime_operations.simulate_mouse_motion(position, relative)
+
+
+func _handle_play_input_timeline(params: Dictionary) -> Dictionary:
+	var events = params.get("events", [])
+	if not events is Array:
+		return {"success": false, "error": "events must be an array"}
+	var clock = str(params.get("clock", "process"))
+	var trace = bool(params.get("trace", false))
+	return await input_player.play(events, clock, trace, JobManager.job_of(params))
+
+
 func _handle_get_runtime_stats(params: Dictionary) -> Dictionary:
 	return runtime_operations.get_runtime_stats()
 
 
+func _handle_start_perf_sampler(params: Dictionary) -> Dictionary:
+	var monitors = params.get("monitors", [])
+	var capacity = int(params.get("capacity", PerfSampler.DEFAULT_CAPACITY))
+	return perf_sampler.start(monitors, capacity)
+
+
+func _handle_stop_perf_sampler(params: Dictionary) -> Dictionary:
+	return perf_sampler.stop()
+
+
+func _handle_get_perf_series(params: Dictionary) -> Dictionary:
+	var monitors = params.get("monitors", [])
+	var window = int(params.get("window", 0))
+	var series = str(params.get("series", "none"))
+	var points = int(params.get("points", 200))
+	return perf_sampler.get_series(monitors, window, series, points)
+
+
+func _handle_get_bridge_metrics(params: Dictionary) -> Dictionary:
+	var data = http_server.metrics.snapshot()
+	if params.get("reset", false):
+		http_server.metrics.reset()
+	return {"success": true, "data": data}
+
+
 func _handle_get_node_properties(params: Dictionary) -> Dictionary:
 	var node_path = params.get("node_path", "")
 	return runtime_operations.get_node_properties(node_path)
@@ -435,7 +625,14 @@ func _handle_call_node_method(params: Dictionary) -> Dictionary:
 	var node_path = params.get("node_path", "")
 	var method_name = params.get("method_name", "")
 	var args = params.get("args", [])
-	return runtime_operations.call_node_method(node_path, method_name, args)
+	# A method can change groups and scripts without an undo action
+	node_index.mark_stale()
+	var result = runtime_operations.call_node_method(node_path, method_name, args)
+	if result.get("success", false):
+		# The method may reach beyond its own node, so the scene is flagged too
+		scene_journal.record_change(node_path)
+		scene_journal.record_change()
+	return result
 
 
 func _handle_get_installed_plugins(params: Dictionary) -> Dictionary:
@@ -449,7 +646,7 @@ func _handle_get_plugin_info(params: Dictionary) -> Dictionary:
 
 func _handle_get_assets_by_type(params: Dictionary) -> Dictionary:
 	var asset_type = params.get("asset_type", "")
-	return runtime_operations.get_assets_by_type(asset_type)
+	return await runtime_operations.get_assets_by_type(asset_type, _scan_budget(params))
 
 
 func _handle_get_asset_info(params: Dictionary) -> Dictionary:
@@ -459,7 +656,10 @@ func _handle_get_asset_info(params: Dictionary) -> Dictionary:
 
 func _handle_run_test_script(params: Dictionary) -> Dictionary:
 	var script_path = params.get("script_path", "")
-	return runtime_operations.run_test_script(script_path)
+	var result = await runtime_operations.run_test_script(script_path, JobManager.job_of(params))
+	# Tests run in the editor and may change groups and scripts
+	node_index.mark_stale()
+	return result
 
 
 func _handle_get_input_actions(params: Dictionary) -> Dictionary:
@@ -473,7 +673,7 @@ func _handle_get_editor_context(params: Dictionary) -> Dictionary:
 		"current_scene": scene_root.get_name() if scene_root else null,
 		"open_scripts": script_operations.get_open_script_names(),
 		"recent_errors": debugger_integration.get_recent_errors(5),
-		"project_structure": file_operations.get_quick_project_overview(),
+		"project_structure": await file_operations.get_quick_project_overview(_scan_budget(params)),
 		"editor_state": {
 			"playing": EditorInterface.is_playing_scene(),
 			"distraction_free": EditorInterface.is_distraction_free_mode_enabled()
@@ -484,8 +684,13 @@ func _handle_get_editor_context(params: Dictionary) -> Dictionary:
 
 # Asset handlers
 func _handle_reimport_assets(params: Dictionary) -> Dictionary:
+	if params.get("async", false) and JobManager.job_of(params) == null:
+		var job_params = params.duplicate()
+		job_params.erase("async")
+		return _handle_start_job({"route": "/api/asset/reimport", "params": job_params})
 	var paths = params.get("paths", [])
-	return file_operations.reimport_assets(paths)
+	var batch_bytes = int(params.get("batch_bytes", 0))
+	return await file_operations.reimport_assets(paths, JobManager.job_of(params), batch_bytes)
 
 
 func _handle_get_import_info(params: Dictionary) -> Dictionary:
@@ -495,13 +700,49 @@ func _handle_get_import_info(params: Dictionary) -> Dictionary:
 
 func _handle_get_live_preview(params: Dictionary) -> Dictionary:
 	var preview_data = {
-		"screenshot": screenshot_manager.capture_editor_screenshot(),
+		"screenshot": screenshot_manager.capture_editor_png(),
 		"scene_tree": scene_operations.get_compact_scene_tree(),
 		"current_script": script_operations.get_current_script_content()
 	}
 	return {"success": true, "data": preview_data}
 
 
+# Job handlers
+func _handle_start_job(params: Dictionary) -> Dictionary:
+	var route = str(params.get("route", ""))
+	if route.begins_with("/api/jobs/") or not http_server.routes.has(route):
+		return {"success": false, "error": "Route cannot run as a job: " + route}
+	var job_params = params.get("params", {})
+	if not job_params is Dictionary:
+		return {"success": false, "error": "params must be an object"}
+	var slice_msec = float(params.get("slice_msec", 0.0))
+	var job = job_manager.start(route, http_server.routes[route], job_params, slice_msec)
+	return {"success": true, "data": job_manager.describe(job)}
+
+
+func _handle_job_status(params: Dictionary) -> Dictionary:
+	var job_id = str(params.get("job_id", ""))
+	var job = job_manager.get_job(job_id)
+	if job == null:
+		return {"success": false, "error": "Unknown or expired job: " + job_id}
+	return {"success": true, "data": job_manager.describe(job)}
+
+
+func _handle_job_result(params: Dictionary) -> Dictionary:
+	var job_id = str(params.get("job_id", ""))
+	var job = job_manager.get_job(job_id)
+	if job == null:
+		return {"success": false, "error": "Unknown or expired job: " + job_id}
+	return {"success": true, "data": job_manager.describe(job, true)}
+
+
+func _handle_cancel_job(params: Dictionary) -> Dictionary:
+	var job_id = str(params.get("job_id", ""))
+	if not job_manager.cancel(job_id):
+		return {"success": false, "error": "Unknown or expired job: " + job_id}
+	return {"success": true, "data": job_manager.describe(job_manager.get_job(job_id))}
+
+
 # Signal handlers
 func _on_config_changed(new_config: Dictionary) -> void:
 	config = new_config
@@ -524,7 +765,7 @@ func _on_server_restart_requested() -> void:
 	var port = int(config.get("GDAI_MCP_SERVER_PORT", 3571))
 	print("[Godot MCP Enhanced] Starting server on port %d..." % port)
 	
-	var success = http_server.start_server(port, str(config.get("GDAI_MCP_TOKEN", "")))
+	var success = http_server.start_server(port, str(config.get("GDAI_MCP_TOKEN", "")), _socket_path())
 	
 	if success:
 		print("[Godot MCP Enhanced] ✓ Server restarted successfully on port %d" % port)
@@ -1,6 +1,9 @@
 @tool
 extends Node
 
+const JobManager = preload("res://addons/godot_mcp_enhanced/job_manager.gd")
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+
 var editor_interface: EditorInterface
 
 
@@ -307,7 +310,7 @@ func _scan_directory_recursive(path: String, files: Array) -> void:
 
 # ===== AUTOMATED TESTING =====
 
-func run_test_script(script_path: String) -> Dictionary:
+func run_test_script(script_path: String, job: JobManager.Job = null) -> Dictionary:
 	"""Execute a test script and return results"""
 	if not FileAccess.file_exists(script_path):
 		return {
@@ -338,28 +341,42 @@ func run_test_script(script_path: String) -> Dictionary:
 		"results": []
 	}
 	
-	# Run all methods starting with "test_"
+	var test_methods = []
 	for method in test_instance.get_method_list():
 		if method.name.begins_with("test_"):
-			results.tests_run += 1
-			
-			var test_result = {
-				"name": method.name,
-				"passed": false,
-				"error": null
-			}
-			
-			# Try to run the test
-			var result = test_instance.call(method.name)
-			if result == true or result == null:
-				test_result.passed = true
-				results.tests_passed += 1
-			else:
-				test_result.passed = false
-				test_result.error = str(result)
-				results.tests_failed += 1
-			
-			results.results.append(test_result)
+			test_methods.append(method)
+	if job:
+		job.total = test_methods.size()
+	
+	# Run all methods starting with "test_"
+	for method in test_methods:
+		if job and not await job.tick():
+			break
+		results.tests_run += 1
+		
+		var test_result = {
+			"name": method.name,
+			"passed": false,
+			"error": null,
+			"msec": 0.0
+		}
+		
+		# Try to run the test
+		var started = Time.get_ticks_usec()
+		var result = test_instance.call(method.name)
+		test_result.msec = (Time.get_ticks_usec() - started) / 1000.0
+		if result == true or result == null:
+			test_result.passed = true
+			results.tests_passed += 1
+		else:
+			test_result.passed = false
+			test_result.error = str(result)
+			results.tests_failed += 1
+		
+		results.results.append(test_result)
+		if job:
+			job.progress += 1
+			job.partial.append(test_result)
 	
 	test_instance.free()
 	
@@ -368,10 +385,10 @@ func run_test_script(script_path: String) -> Dictionary:
 
 # ===== ASSET MANAGEMENT =====
 
-func get_assets_by_type(asset_type: String) -> Dictionary:
+func get_assets_by_type(asset_type: String, budget: FrameBudget = null) -> Dictionary:
 	"""Get all assets of a specific type (texture, mesh, audio, etc.)"""
 	var assets = []
-	_scan_assets_recursive("res://", asset_type, assets)
+	await _scan_assets_recursive("res://", asset_type, assets, budget)
 	
 	return {
 		"success": true,
@@ -381,46 +398,52 @@ func get_assets_by_type(asset_type: String) -> Dictionary:
 	}
 
 
-func _scan_assets_recursive(path: String, asset_type: String, assets: Array) -> void:
-	"""Helper to scan for specific asset types"""
-	var dir = DirAccess.open(path)
-	if dir:
+func _scan_assets_recursive(path: String, asset_type: String, assets: Array, budget: FrameBudget = null) -> void:
+	"""Helper to scan for specific asset types, one directory at a time"""
+	var extensions: Array = []
+	match asset_type.to_lower():
+		"texture", "image":
+			extensions = ["png", "jpg", "jpeg", "svg", "webp", "bmp"]
+		"mesh", "model", "3d":
+			extensions = ["obj", "fbx", "gltf", "glb", "dae"]
+		"audio", "sound":
+			extensions = ["wav", "ogg", "mp3"]
+		"script":
+			extensions = ["gd", "cs"]
+		"scene":
+			extensions = ["tscn", "scn"]
+		"material":
+			extensions = ["tres", "res", "material"]
+		"shader":
+			extensions = ["gdshader", "shader"]
+	
+	var pending := [path]
+	while not pending.is_empty():
+		var dir_path: String = pending.pop_back()
+		var dir = DirAccess.open(dir_path)
+		if not dir:
+			continue
+		
+		var subdirs := []
 		dir.list_dir_begin()
 		var file_name = dir.get_next()
 		
 		while file_name != "":
+			if budget and not await budget.tick():
+				break
 			if file_name != "." and file_name != "..":
-				var full_path = path + file_name
+				var full_path = dir_path + file_name
 				
 				if dir.current_is_dir():
-					_scan_assets_recursive(full_path + "/", asset_type, assets)
+					subdirs.append(full_path + "/")
 				else:
 					var extension = file_name.get_extension().to_lower()
-					var matches = false
-					
-					match asset_type.to_lower():
-						"texture", "image":
-							matches = extension in ["png", "jpg", "jpeg", "svg", "webp", "bmp"]
-						"mesh", "model", "3d":
-							matches = extension in ["obj", "fbx", "gltf", "glb", "dae"]
-						"audio", "sound":
-							matches = extension in ["wav", "ogg", "mp3"]
-						"script":
-							matches = extension in ["gd", "cs"]
-						"scene":
-							matches = extension in ["tscn", "scn"]
-						"material":
-							matches = extension in ["tres", "res", "material"]
-						"shader":
-							matches = extension in ["gdshader", "shader"]
-					
-					if matches:
+					if extension in extensions:
 						var file_size = 0
-						if FileAccess.file_exists(full_path):
-							var f = FileAccess.open(full_path, FileAccess.READ)
-							if f:
-								file_size = f.get_length()
-								f.close()
+						var f = FileAccess.open(full_path, FileAccess.READ)
+						if f:
+							file_size = f.get_length()
+							f.close()
 						assets.append({
 							"path": full_path,
 							"name": file_name,
@@ -431,6 +454,11 @@ func _scan_assets_recursive(path: String, asset_type: String, assets: Array) ->
 			file_name = dir.get_next()
 		
 		dir.list_dir_end()
+		if budget and budget.cancel_requested:
+			return
+		# Reversed so directories are still visited in listing order
+		subdirs.reverse()
+		pending.append_array(subdirs)
 
 
 func get_asset_info(asset_path: String) -> Dictionary:
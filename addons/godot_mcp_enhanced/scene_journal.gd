@@ -0,0 +1,230 @@
+@tool
+extends Node
+## Versioned change journal for the edited scene.
+##
+## Records node additions, removals and renames from the SceneTree signals,
+## and property changes from the inspector and from scene_operations, so
+## clients can ask for what changed since a version instead of re-reading the
+## whole tree. Undo and redo, and changes made by user code (see
+## record_change()), can touch any node without saying which, so they are
+## journaled as scene_modified: the delta then tells the client to re-read. The journal holds MAX_ENTRIES entries; a client whose version
+## is older than the oldest entry, or from before the edited scene was
+## switched, gets a full snapshot instead of a delta.
+
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+
+const MAX_ENTRIES := 4096
+
+var scene_operations: Node
+
+## Versions start at the wall clock in msec so a version handed out by an
+## earlier editor session is never mistaken for one from this session.
+var version: int = 0
+## Deltas can be computed for any since_version >= base_version.
+var base_version: int = 0
+
+# Each entry: {"version", "op": added|removed|renamed|changed|scene_modified, "id", "path", "from"?}
+var _entries: Array = []
+# Node instance id -> last known path, for nodes of the edited scene
+var _paths: Dictionary = {}
+# Whether a node-level entry was recorded since the last scene_modified
+var _attributed: bool = false
+
+
+func _ready() -> void:
+	version = int(Time.get_unix_time_from_system() * 1000.0)
+	reset()
+	get_tree().node_added.connect(_on_node_added)
+	get_tree().node_removed.connect(_on_node_removed)
+	get_tree().node_renamed.connect(_on_node_renamed)
+	EditorInterface.get_inspector().property_edited.connect(_on_property_edited)
+	EditorInterface.get_editor_undo_redo().version_changed.connect(_on_undo_redo_version_changed)
+	if scene_operations:
+		scene_operations.scene_modified.connect(_on_scene_modified)
+		scene_operations.node_changed.connect(_on_node_changed)
+
+
+func _exit_tree() -> void:
+	get_tree().node_added.disconnect(_on_node_added)
+	get_tree().node_removed.disconnect(_on_node_removed)
+	get_tree().node_renamed.disconnect(_on_node_renamed)
+	EditorInterface.get_inspector().property_edited.disconnect(_on_property_edited)
+	EditorInterface.get_editor_undo_redo().version_changed.disconnect(_on_undo_redo_version_changed)
+
+
+## Journals a change made outside the signals above: to the node at
+## node_path (relative to the edited scene root) when given and found,
+## otherwise as an unattributed scene_modified.
+func record_change(node_path: String = "") -> void:
+	var root = EditorInterface.get_edited_scene_root()
+	var node = root.get_node_or_null(node_path) if root and not node_path.is_empty() else null
+	if node:
+		_record("changed", node, str(node.get_path()))
+	else:
+		_record("scene_modified", null, "")
+
+
+## Starts over for the currently edited scene. Connected to the plugin's
+## scene_changed signal; every older version then needs a full snapshot.
+func reset(_scene_root: Node = null) -> void:
+	version += 1
+	base_version = version
+	_entries.clear()
+	_paths.clear()
+	var root = EditorInterface.get_edited_scene_root()
+	if not root:
+		return
+	var stack := [root]
+	while not stack.is_empty():
+		var node: Node = stack.pop_back()
+		_paths[node.get_instance_id()] = str(node.get_path())
+		stack.append_array(node.get_children())
+
+
+## Changes since since_version as {"version", "full": false, "added",
+## "removed", "renamed", "changed", "scene_modified"}, or a full snapshot
+## {"version", "full": true, "tree"} when no delta is possible.
+func get_delta(since_version: int, budget: FrameBudget = null) -> Dictionary:
+	if since_version < base_version or since_version > version:
+		var at_version = version
+		var tree = await scene_operations.get_scene_tree(budget)
+		if not tree.success:
+			return tree
+		return {"success": true, "data": {"version": at_version, "full": true, "tree": tree.data}}
+
+	# Fold the entries into one state per node
+	var states := {}
+	var order := []
+	var scene_modified := false
+	for entry in _entries:
+		if entry.version <= since_version:
+			continue
+		if entry.op == "scene_modified":
+			scene_modified = true
+			continue
+		if not states.has(entry.id):
+			# A node whose first entry is not "added" was in the scene at since_version
+			states[entry.id] = {"existed": entry.op != "added", "removed": false, "moved": false, "changed": false, "from": ""}
+			order.append(entry.id)
+		var state = states[entry.id]
+		match entry.op:
+			"added":
+				state.removed = false
+				state.moved = state.existed
+			"removed":
+				state.removed = true
+				if state.from.is_empty():
+					state.from = entry.path
+			"renamed":
+				if state.from.is_empty():
+					state.from = entry.from
+			"changed":
+				state.changed = true
+	
+	var delta := {
+		"version": version,
+		"full": false,
+		"added": [],
+		"removed": [],
+		"renamed": [],
+		"changed": [],
+		"scene_modified": scene_modified
+	}
+	for id in order:
+		var state = states[id]
+		var node = instance_from_id(id)
+		if state.removed or not is_instance_valid(node):
+			if state.existed:
+				delta.removed.append(state.from if not state.from.is_empty() else _paths.get(id, ""))
+		elif not state.existed:
+			delta.added.append(_describe(node))
+		else:
+			var path = str(node.get_path())
+			if not state.from.is_empty() and state.from != path:
+				delta.renamed.append({"from": state.from, "to": path})
+			if state.changed or state.moved:
+				delta.changed.append(_describe(node))
+	return {"success": true, "data": delta}
+
+
+func _describe(node: Node) -> Dictionary:
+	var data = scene_operations.describe_node(node)
+	data.erase("children")
+	data["parent"] = str(node.get_parent().get_path()) if node.get_parent() else ""
+	return data
+
+
+func _record(op: String, node: Node, path: String, from: String = "") -> void:
+	version += 1
+	var entry := {"version": version, "op": op, "id": node.get_instance_id() if node else 0, "path": path}
+	if not from.is_empty():
+		entry["from"] = from
+	_entries.append(entry)
+	_attributed = node != null
+	if _entries.size() > MAX_ENTRIES:
+		base_version = _entries.pop_front().version
+
+
+func _in_edited_scene(node: Node) -> bool:
+	var root = EditorInterface.get_edited_scene_root()
+	return root != null and (node == root or root.is_ancestor_of(node))
+
+
+func _on_node_added(node: Node) -> void:
+	if not _in_edited_scene(node):
+		return
+	var path = str(node.get_path())
+	_paths[node.get_instance_id()] = path
+	_record("added", node, path)
+
+
+func _on_node_removed(node: Node) -> void:
+	var id = node.get_instance_id()
+	if not _paths.has(id):
+		return
+	_record("removed", node, _paths[id])
+	_paths.erase(id)
+
+
+func _on_node_renamed(node: Node) -> void:
+	var id = node.get_instance_id()
+	if not _paths.has(id):
+		return
+	var from: String = _paths[id]
+	# Descendant paths change with the rename; they are not journaled
+	# separately, a client sees them through the renamed ancestor.
+	var stack := [node]
+	while not stack.is_empty():
+		var current: Node = stack.pop_back()
+		if _paths.has(current.get_instance_id()):
+			_paths[current.get_instance_id()] = str(current.get_path())
+		stack.append_array(current.get_children())
+	_record("renamed", node, _paths[id], from)
+
+
+func _on_node_changed(node_path: String) -> void:
+	var root = EditorInterface.get_edited_scene_root()
+	var node = root.get_node_or_null(node_path) if root else null
+	if node and _in_edited_scene(node):
+		_record("changed", node, str(node.get_path()))
+
+
+func _on_property_edited(_property: String) -> void:
+	var edited = EditorInterface.get_inspector().get_edited_object()
+	if edited is Node and _in_edited_scene(edited):
+		_record("changed", edited, str(edited.get_path()))
+
+
+func _on_undo_redo_version_changed() -> void:
+	# Also fires for actions already journaled node by node; one extra
+	# scene_modified then costs a client a re-read, never a missed change.
+	_record("scene_modified", null, "")
+
+
+func _on_scene_modified(_scene_path: String) -> void:
+	# scene_operations reports the nodes it touched just before this signal;
+	# only journal changes that were not attributed to a node.
+	if _attributed:
+		_attributed = false
+		return
+	_record("scene_modified", null, "")
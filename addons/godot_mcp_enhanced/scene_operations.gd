@@ -1,41 +1,177 @@
 @tool
 extends Node
 
+const FrameBudget = preload("res://addons/godot_mcp_enhanced/frame_budget.gd")
+const ValueCodec = preload("res://addons/godot_mcp_enhanced/value_codec.gd")
+
 var editor_interface: EditorInterface
+# Anchor values each layout preset produces, filled on first use
+var _preset_anchors := {}
+# Per-class tables for tree serialization, filled on first use
+var _serializers := {}
+var _node_kinds := {}
 
 signal scene_modified(scene_path: String)
 signal node_added(node_path: String)
 signal node_deleted(node_path: String)
+## A property of an existing node was changed through this bridge
+signal node_changed(node_path: String)
 
 
-func get_scene_tree() -> Dictionary:
-	"""Get recursive tree view of all nodes in current scene"""
+func get_scene_tree(budget: FrameBudget = null, properties = null, format: String = "tree") -> Dictionary:
+	"""Get recursive tree view of all nodes in current scene.
+	
+	With properties, each node reports exactly those properties (the ones its
+	class has) under "properties", typed via ValueCodec; without, the fixed
+	default set. The "columnar" format returns parallel arrays instead of
+	nested dictionaries, which is far smaller for large trees."""
 	var root = editor_interface.get_edited_scene_root()
 	
 	if not root:
 		return {"success": false, "error": "No scene currently open"}
+	if format != "tree" and format != "columnar":
+		return {"success": false, "error": "Unknown format: " + format}
 	
-	var tree_data = _build_node_tree(root)
+	var tree_data
+	if format == "columnar":
+		tree_data = await _build_node_columns(root, properties if properties != null else [], budget)
+	else:
+		tree_data = await _build_node_tree(root, budget, properties)
 	return {"success": true, "data": tree_data}
 
 
-func _build_node_tree(node: Node, depth: int = 0) -> Dictionary:
-	"""Recursively build node tree structure"""
+func _build_node_tree(root: Node, budget: FrameBudget = null, properties = null) -> Dictionary:
+	"""Build the node tree structure with an explicit stack instead of recursion"""
+	var holder := []
+	# Each entry: [node, children array its data goes into]
+	var stack := [[root, holder]]
+	
+	while not stack.is_empty():
+		if budget and not await budget.tick():
+			break
+		var entry: Array = stack.pop_back()
+		var node = entry[0]
+		# The scene can change while the walk is paused between frames
+		if not is_instance_valid(node):
+			continue
+		
+		var node_data
+		if properties == null:
+			node_data = describe_node(node)
+		else:
+			var script = node.get_script()
+			node_data = {
+				"name": node.name,
+				"type": node.get_class(),
+				"path": str(node.get_path()),
+				"script": script.resource_path if script else null,
+				"properties": _serialize_properties(node, properties, script),
+				"children": []
+			}
+		entry[1].append(node_data)
+		
+		var children = node.get_children()
+		for i in range(children.size() - 1, -1, -1):
+			stack.append([children[i], node_data["children"]])
+	
+	return holder[0] if not holder.is_empty() else {}
+
+
+func _build_node_columns(root: Node, properties: Array, budget: FrameBudget = null) -> Dictionary:
+	"""Pre-order node table as parallel arrays. parents holds the index of
+	each node's parent (-1 for the root); property columns hold null where a
+	node's class lacks the property."""
+	var columns = {
+		"format": "columnar",
+		"root_path": str(root.get_path()),
+		"names": [],
+		"types": [],
+		"parents": [],
+		"scripts": [],
+		"properties": {}
+	}
+	for property_name in properties:
+		columns.properties[property_name] = []
+	
+	# Each entry: [node, parent index]
+	var stack := [[root, -1]]
+	while not stack.is_empty():
+		if budget and not await budget.tick():
+			break
+		var entry: Array = stack.pop_back()
+		var node = entry[0]
+		if not is_instance_valid(node):
+			continue
+		
+		var index = columns.names.size()
+		var script = node.get_script()
+		columns.names.append(node.name)
+		columns.types.append(node.get_class())
+		columns.parents.append(entry[1])
+		columns.scripts.append(script.resource_path if script else null)
+		if not properties.is_empty():
+			var values = _serialize_properties(node, properties, script)
+			for property_name in properties:
+				columns.properties[property_name].append(values.get(property_name))
+		
+		var children = node.get_children()
+		for i in range(children.size() - 1, -1, -1):
+			stack.append([children[i], index])
+	
+	columns["count"] = columns.names.size()
+	return columns
+
+
+func _serialize_properties(node: Node, properties: Array, script: Script) -> Dictionary:
+	"""Encode the requested properties a node has"""
+	var values = {}
+	for property_name in _serializer_for(node.get_class(), properties):
+		values[property_name] = ValueCodec.encode(node.get(property_name))
+	# Script variables are not in ClassDB, so scripted nodes are asked directly
+	if script and values.size() < properties.size():
+		for property_name in properties:
+			if not values.has(property_name) and property_name in node:
+				values[property_name] = ValueCodec.encode(node.get(property_name))
+	return values
+
+
+func _serializer_for(node_class: String, properties: Array) -> Array:
+	"""The subset of properties that node_class has, computed once per class
+	and property selection from ClassDB"""
+	var key = node_class + ":" + ",".join(properties)
+	if not _serializers.has(key):
+		var available = {}
+		for prop in ClassDB.class_get_property_list(node_class):
+			available[prop.name] = true
+		_serializers[key] = properties.filter(func(property_name): return available.has(property_name))
+	return _serializers[key]
+
+
+func describe_node(node: Node) -> Dictionary:
+	"""Default properties reported for one node in get_scene_tree"""
+	var kind = _node_kinds.get(node.get_class())
+	if kind == null:
+		kind = _classify_node_class(node.get_class())
+		_node_kinds[node.get_class()] = kind
+	var script = node.get_script()
+	
 	var node_data = {
 		"name": node.name,
 		"type": node.get_class(),
 		"path": str(node.get_path()),
-		"visible": node.get("visible") if "visible" in node else null,
-		"script": node.get_script().resource_path if node.get_script() else null,
+		"visible": node.get("visible") if kind.visible else null,
+		"script": script.resource_path if script else null,
 		"children": []
 	}
 	
 	# Add position for 2D/3D nodes
-	if node is Node2D:
-		node_data["position"] = {"x": node.position.x, "y": node.position.y}
+	if kind.spatial == "2d":
+		var pos = node.position
+		node_data["position"] = {"x": pos.x, "y": pos.y}
 		node_data["rotation"] = node.rotation
-		node_data["scale"] = {"x": node.scale.x, "y": node.scale.y}
-	elif node is Node3D:
+		var scl = node.scale
+		node_data["scale"] = {"x": scl.x, "y": scl.y}
+	elif kind.spatial == "3d":
 		var pos = node.position
 		node_data["position"] = {"x": pos.x, "y": pos.y, "z": pos.z}
 		var rot = node.rotation
@@ -44,20 +180,31 @@ func _build_node_tree(node: Node, depth: int = 0) -> Dictionary:
 		node_data["scale"] = {"x": scl.x, "y": scl.y, "z": scl.z}
 	
 	# Add Control-specific properties
-	if node is Control:
-		node_data["size"] = {"x": node.size.x, "y": node.size.y}
+	if kind.control:
+		var size = node.size
+		node_data["size"] = {"x": size.x, "y": size.y}
 		node_data["anchor_left"] = node.anchor_left
 		node_data["anchor_top"] = node.anchor_top
 		node_data["anchor_right"] = node.anchor_right
 		node_data["anchor_bottom"] = node.anchor_bottom
 	
-	# Recursively add children
-	for child in node.get_children():
-		node_data["children"].append(_build_node_tree(child, depth + 1))
-	
 	return node_data
 
 
+func _classify_node_class(node_class: String) -> Dictionary:
+	"""Which of describe_node's property groups a class has"""
+	var spatial = ""
+	if ClassDB.is_parent_class(node_class, "Node2D"):
+		spatial = "2d"
+	elif ClassDB.is_parent_class(node_class, "Node3D"):
+		spatial = "3d"
+	return {
+		"visible": ClassDB.class_has_method(node_class, "is_visible"),
+		"spatial": spatial,
+		"control": ClassDB.is_parent_class(node_class, "Control")
+	}
+
+
 func get_compact_scene_tree() -> Dictionary:
 	"""Get simplified scene tree for Windsurf live preview"""
 	var root = editor_interface.get_edited_scene_root()
@@ -354,12 +501,320 @@ func update_property(params: Dictionary) -> Dictionary:
 	
 	node.set(property_name, property_value)
 	
+	emit_signal("node_changed", str(node.get_path()))
 	emit_signal("scene_modified", "")
 	print("[Scene Operations] Updated property: ", node_path, ".", property_name)
 	
 	return {"success": true}
 
 
+func get_properties(params: Dictionary) -> Dictionary:
+	"""Read properties of several nodes at once, typed via ValueCodec"""
+	var node_paths = params.get("node_paths", [])
+	var property_names = params.get("property_names", [])
+	
+	var root = editor_interface.get_edited_scene_root()
+	if not root:
+		return {"success": false, "error": "No scene currently open"}
+	
+	var nodes = {}
+	var missing = []
+	for node_path in node_paths:
+		var node = root.get_node_or_null(node_path)
+		if not node:
+			missing.append({"node_path": node_path})
+			continue
+		
+		var values = {}
+		if property_names.is_empty():
+			# Everything the inspector shows
+			for prop in node.get_property_list():
+				if prop.usage & PROPERTY_USAGE_EDITOR:
+					values[prop.name] = ValueCodec.encode(node.get(prop.name))
+		else:
+			for property_name in property_names:
+				if property_name in node:
+					values[property_name] = ValueCodec.encode(node.get(property_name))
+				else:
+					missing.append({"node_path": node_path, "property": property_name})
+		nodes[node_path] = values
+	
+	return {"success": true, "data": {"nodes": nodes, "missing": missing}}
+
+
+func set_properties(params: Dictionary) -> Dictionary:
+	"""Set several node properties as one undoable editor action.
+	
+	Every change is validated first; if any fails nothing is applied."""
+	var changes = params.get("changes", [])
+	
+	var root = editor_interface.get_edited_scene_root()
+	if not root:
+		return {"success": false, "error": "No scene currently open"}
+	if changes.is_empty():
+		return {"success": false, "error": "No changes given"}
+	
+	var resolved = []
+	var errors = []
+	var property_types = {}
+	for change in changes:
+		var node_path = str(change.get("node_path", ""))
+		var property_name = str(change.get("property", ""))
+		var node = root.get_node_or_null(node_path)
+		if not node:
+			errors.append({"node_path": node_path, "property": property_name, "error": "Node not found"})
+			continue
+		if not property_name in node:
+			errors.append({"node_path": node_path, "property": property_name, "error": "Property not found"})
+			continue
+		
+		if not property_types.has(node):
+			property_types[node] = _property_types(node)
+		var decoded = ValueCodec.decode(change.get("value"), property_types[node].get(property_name, TYPE_NIL))
+		if not decoded.error.is_empty():
+			errors.append({"node_path": node_path, "property": property_name, "error": decoded.error})
+			continue
+		resolved.append([node, property_name, decoded.value])
+	
+	if not errors.is_empty():
+		return {"success": false, "error": "%d of %d changes are invalid; nothing was applied" % [errors.size(), changes.size()], "errors": errors}
+	
+	var undo_redo = editor_interface.get_editor_undo_redo()
+	undo_redo.create_action("MCP: Set %d properties" % resolved.size(), UndoRedo.MERGE_DISABLE, root)
+	for entry in resolved:
+		undo_redo.add_do_property(entry[0], entry[1], entry[2])
+		undo_redo.add_undo_property(entry[0], entry[1], entry[0].get(entry[1]))
+	undo_redo.commit_action()
+	
+	var changed_nodes = {}
+	for entry in resolved:
+		changed_nodes[entry[0]] = true
+	for node in changed_nodes:
+		emit_signal("node_changed", str(node.get_path()))
+	emit_signal("scene_modified", "")
+	print("[Scene Operations] Set %d properties" % resolved.size())
+	
+	return {"success": true, "data": {"applied": resolved.size()}}
+
+
+func apply_scene_patch(params: Dictionary) -> Dictionary:
+	"""Bring the edited scene in line with a tree-shaped spec in one undoable action.
+	
+	A spec node is {"name", "type", "properties", "resources", "anchor_preset",
+	"children"}; every key is optional except "name" (and "type" for nodes that
+	do not exist yet). Children are matched to existing nodes by name. Only
+	what differs from the scene is changed, so applying the same patch twice
+	changes nothing the second time. Nodes the spec does not mention are left
+	alone. If any part of the spec is invalid nothing is applied."""
+	var spec = params.get("spec", {})
+	var node_path = params.get("node_path", "")
+	
+	var root = editor_interface.get_edited_scene_root()
+	if not root:
+		return {"success": false, "error": "No scene currently open"}
+	if not spec is Dictionary:
+		return {"success": false, "error": "spec must be an object"}
+	
+	var target = root.get_node_or_null(node_path) if node_path else root
+	if not target:
+		return {"success": false, "error": "Node not found: " + node_path}
+	
+	# creates: [parent, new subtree root, every node in the subtree]
+	# sets: [node, property, value] on existing nodes
+	# presets: [control, preset value, node is new]
+	var plan = {"creates": [], "sets": [], "presets": [], "errors": []}
+	_plan_patch_existing(target, spec, str(root.get_path_to(target)), plan)
+	
+	if not plan.errors.is_empty():
+		for create in plan.creates:
+			create[1].free()
+		return {"success": false, "error": "Invalid patch; nothing was applied", "errors": plan.errors}
+	
+	if plan.creates.is_empty() and plan.sets.is_empty() and plan.presets.is_empty():
+		return {"success": true, "data": {"created": [], "properties_changed": 0, "changed": false}}
+	
+	var undo_redo = editor_interface.get_editor_undo_redo()
+	undo_redo.create_action("MCP: Apply scene patch", UndoRedo.MERGE_DISABLE, root)
+	for create in plan.creates:
+		undo_redo.add_do_method(create[0], "add_child", create[1], true)
+		for node in create[2]:
+			undo_redo.add_do_property(node, "owner", root)
+		undo_redo.add_do_reference(create[1])
+		undo_redo.add_undo_method(create[0], "remove_child", create[1])
+	for entry in plan.sets:
+		undo_redo.add_do_property(entry[0], entry[1], entry[2])
+		undo_redo.add_undo_property(entry[0], entry[1], entry[0].get(entry[1]))
+	for entry in plan.presets:
+		var control: Control = entry[0]
+		undo_redo.add_do_method(control, "set_anchors_preset", entry[1])
+		if not entry[2]:
+			for side in ["left", "top", "right", "bottom"]:
+				undo_redo.add_undo_property(control, "anchor_" + side, control.get("anchor_" + side))
+				undo_redo.add_undo_property(control, "offset_" + side, control.get("offset_" + side))
+	undo_redo.commit_action()
+	
+	var created = []
+	for create in plan.creates:
+		for node in create[2]:
+			created.append(str(node.get_path()))
+			emit_signal("node_added", str(node.get_path()))
+	var changed_nodes = {}
+	for entry in plan.sets + plan.presets:
+		if not created.has(str(entry[0].get_path())):
+			changed_nodes[entry[0]] = true
+	for node in changed_nodes:
+		emit_signal("node_changed", str(node.get_path()))
+	emit_signal("scene_modified", "")
+	print("[Scene Operations] Applied scene patch: %d nodes created, %d properties changed" % [created.size(), plan.sets.size()])
+	
+	return {"success": true, "data": {"created": created, "properties_changed": plan.sets.size(), "changed": true}}
+
+
+func _plan_patch_existing(node: Node, spec: Dictionary, label: String, plan: Dictionary) -> void:
+	"""Plan the changes that make an existing node match its spec"""
+	var type_name = str(spec.get("type", ""))
+	if not type_name.is_empty() and not node.is_class(type_name):
+		plan.errors.append({"node": label, "error": "Node is a %s, not a %s" % [node.get_class(), type_name]})
+		return
+	
+	_plan_patch_values(node, spec, label, plan, false)
+	
+	for child_spec in spec.get("children", []):
+		var child_name = _patch_child_name(child_spec, label, plan)
+		if child_name.is_empty():
+			continue
+		var child_label = child_name if label == "." else label + "/" + child_name
+		var child = node.get_node_or_null(NodePath(child_name))
+		if child:
+			_plan_patch_existing(child, child_spec, child_label, plan)
+		else:
+			var subtree = []
+			var new_node = _build_patch_node(child_spec, child_name, child_label, plan, subtree)
+			if new_node:
+				plan.creates.append([node, new_node, subtree])
+
+
+func _build_patch_node(spec: Dictionary, node_name: String, label: String, plan: Dictionary, subtree: Array) -> Node:
+	"""Create a node that is not in the scene yet, with its whole spec subtree"""
+	var type_name = str(spec.get("type", ""))
+	if type_name.is_empty():
+		plan.errors.append({"node": label, "error": "New node needs a type"})
+		return null
+	if not ClassDB.class_exists(type_name) or not ClassDB.is_parent_class(type_name, "Node") or not ClassDB.can_instantiate(type_name):
+		plan.errors.append({"node": label, "error": "Cannot create node of type: " + type_name})
+		return null
+	
+	var node = _create_node_by_type(type_name)
+	node.name = node_name
+	subtree.append(node)
+	_plan_patch_values(node, spec, label, plan, true)
+	
+	for child_spec in spec.get("children", []):
+		var child_name = _patch_child_name(child_spec, label, plan)
+		if child_name.is_empty():
+			continue
+		var child = _build_patch_node(child_spec, child_name, label + "/" + child_name, plan, subtree)
+		if child:
+			node.add_child(child, true)
+	return node
+
+
+func _patch_child_name(child_spec: Variant, label: String, plan: Dictionary) -> String:
+	if not child_spec is Dictionary or str(child_spec.get("name", "")).is_empty():
+		plan.errors.append({"node": label, "error": "Every child spec needs a name"})
+		return ""
+	return str(child_spec["name"])
+
+
+func _plan_patch_values(node: Node, spec: Dictionary, label: String, plan: Dictionary, is_new: bool) -> void:
+	"""Plan property, resource and anchor changes for one node. New nodes are
+	set directly since they are not in the scene until the action runs."""
+	var types = _property_types(node)
+	
+	var properties = spec.get("properties", {})
+	for property_name in properties:
+		if not types.has(property_name):
+			plan.errors.append({"node": label, "property": property_name, "error": "Property not found"})
+			continue
+		var decoded = ValueCodec.decode(properties[property_name], types[property_name])
+		if not decoded.error.is_empty():
+			plan.errors.append({"node": label, "property": property_name, "error": decoded.error})
+			continue
+		_plan_patch_set(node, property_name, decoded.value, plan, is_new)
+	
+	var resources = spec.get("resources", {})
+	for property_name in resources:
+		if not types.has(property_name):
+			plan.errors.append({"node": label, "property": property_name, "error": "Property not found"})
+			continue
+		var resource_spec = resources[property_name]
+		var resource_type = str(resource_spec.get("type", "")) if resource_spec is Dictionary else ""
+		if not ClassDB.class_exists(resource_type) or not ClassDB.is_parent_class(resource_type, "Resource"):
+			plan.errors.append({"node": label, "property": property_name, "error": "Unknown resource type: " + resource_type})
+			continue
+		var resource_properties = resource_spec.get("properties", {})
+		var current = node.get(property_name)
+		if current is Resource and current.get_class() == resource_type and _resource_matches(current, resource_properties):
+			continue
+		var resource = ClassDB.instantiate(resource_type)
+		var resource_types = _property_types(resource)
+		for prop in resource_properties:
+			var decoded = ValueCodec.decode(resource_properties[prop], resource_types.get(prop, TYPE_NIL))
+			if not resource_types.has(prop) or not decoded.error.is_empty():
+				plan.errors.append({"node": label, "property": property_name + ":" + prop, "error": decoded.error if decoded.error else "Property not found"})
+				continue
+			resource.set(prop, decoded.value)
+		_plan_patch_set(node, property_name, resource, plan, is_new)
+	
+	if spec.has("anchor_preset"):
+		var preset_name = str(spec["anchor_preset"])
+		var preset = _get_anchor_preset_value(preset_name)
+		if not node is Control:
+			plan.errors.append({"node": label, "error": "anchor_preset needs a Control"})
+		elif preset == Control.PRESET_TOP_LEFT and preset_name != "top_left":
+			plan.errors.append({"node": label, "error": "Unknown anchor preset: " + preset_name})
+		elif is_new or not _has_anchor_preset(node, preset):
+			plan.presets.append([node, preset, is_new])
+
+
+func _plan_patch_set(node: Node, property_name: String, value: Variant, plan: Dictionary, is_new: bool) -> void:
+	if is_new:
+		node.set(property_name, value)
+		return
+	var current = node.get(property_name)
+	if typeof(current) == typeof(value) and current == value:
+		return
+	plan.sets.append([node, property_name, value])
+
+
+func _resource_matches(resource: Resource, properties: Dictionary) -> bool:
+	var types = _property_types(resource)
+	for prop in properties:
+		var decoded = ValueCodec.decode(properties[prop], types.get(prop, TYPE_NIL))
+		var current = resource.get(prop)
+		if not decoded.error.is_empty() or typeof(current) != typeof(decoded.value) or current != decoded.value:
+			return false
+	return true
+
+
+func _has_anchor_preset(control: Control, preset: int) -> bool:
+	"""Whether the control's anchors already are the ones the preset sets"""
+	if not _preset_anchors.has(preset):
+		var probe = Control.new()
+		probe.set_anchors_preset(preset)
+		_preset_anchors[preset] = [probe.anchor_left, probe.anchor_top, probe.anchor_right, probe.anchor_bottom]
+		probe.free()
+	return _preset_anchors[preset] == [control.anchor_left, control.anchor_top, control.anchor_right, control.anchor_bottom]
+
+
+func _property_types(object: Object) -> Dictionary:
+	"""Property name -> Variant type for an object"""
+	var types = {}
+	for prop in object.get_property_list():
+		types[prop.name] = prop.type
+	return types
+
+
 func add_resource(params: Dictionary) -> Dictionary:
 	"""Add a resource to a node property"""
 	var node_path = params.get("node_path", "")
@@ -388,6 +843,7 @@ func add_resource(params: Dictionary) -> Dictionary:
 	# Assign to node
 	node.set(property_name, resource)
 	
+	emit_signal("node_changed", str(node.get_path()))
 	emit_signal("scene_modified", "")
 	print("[Scene Operations] Added resource: ", resource_type, " to ", node_path)
 	
@@ -409,6 +865,7 @@ func set_anchor_preset(params: Dictionary) -> Dictionary:
 	
 	var preset_value = _get_anchor_preset_value(preset)
 	node.set_anchors_preset(preset_value)
+	emit_signal("node_changed", str(node.get_path()))
 	
 	print("[Scene Operations] Set anchor preset: ", preset, " for ", node_path)
 	return {"success": true}
@@ -434,6 +891,7 @@ func set_anchor_values(params: Dictionary) -> Dictionary:
 		node.anchor_right = params["anchor_right"]
 	if params.has("anchor_bottom"):
 		node.anchor_bottom = params["anchor_bottom"]
+	emit_signal("node_changed", str(node.get_path()))
 	
 	print("[Scene Operations] Set anchor values for ", node_path)
 	return {"success": true}
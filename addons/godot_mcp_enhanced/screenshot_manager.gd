@@ -20,120 +20,89 @@ func _ready() -> void:
 
 func capture_editor_screenshot() -> String:
 	"""Capture the entire Godot editor window and return base64-encoded PNG"""
-	var current_time = Time.get_ticks_msec()
-	
-	# Throttle screenshots to prevent spam
-	if current_time - last_screenshot_time < min_screenshot_interval:
-		push_warning("[Screenshot Manager] Throttling: Too soon since last screenshot")
-		return _get_cached_screenshot()
-	
-	last_screenshot_time = current_time
+	return Marshalls.raw_to_base64(capture_editor_png())
+
+
+func capture_running_scene_screenshot() -> String:
+	"""Capture the running game window and return base64-encoded PNG"""
+	return Marshalls.raw_to_base64(capture_running_scene_png())
+
+
+func capture_viewport_screenshot(viewport: Viewport) -> String:
+	"""Capture a specific viewport and return base64-encoded PNG"""
+	return Marshalls.raw_to_base64(capture_viewport_png(viewport))
+
+
+func capture_editor_png() -> PackedByteArray:
+	"""Capture the entire Godot editor window as PNG bytes"""
+	if _throttled():
+		return _get_cached_png()
 	
 	# Note: Editor window screenshot is not directly available in Godot 4.x
 	# We capture the main viewport instead, which shows the 3D/2D editor view
 	# For full editor window capture, external tools would be needed
-	var viewport = Engine.get_main_loop().root
-	if not viewport:
-		push_error("[Screenshot Manager] Failed to get root viewport")
-		return ""
-	
-	var img = viewport.get_texture().get_image()
-	
-	if img == null or img.is_empty():
-		push_error("[Screenshot Manager] Failed to capture editor screenshot")
-		return ""
-	
-	# Save to file
-	var timestamp = Time.get_unix_time_from_system()
-	var filename = "editor_%d.png" % timestamp
-	var file_path = screenshot_dir + filename
-	
-	var error = img.save_png(file_path)
-	if error != OK:
-		push_error("[Screenshot Manager] Failed to save screenshot: ", error_string(error))
-		return ""
-	
-	# Convert to base64
-	var base64_data = _image_to_base64(img)
-	
-	emit_signal("screenshot_captured", file_path, base64_data)
-	print("[Screenshot Manager] Editor screenshot captured: ", file_path)
-	
-	return base64_data
+	return _capture(Engine.get_main_loop().root, "editor", "Editor screenshot")
 
 
-func capture_running_scene_screenshot() -> String:
-	"""Capture the running game window and return base64-encoded PNG"""
-	# For running scene, we capture from the main viewport
+func capture_running_scene_png() -> PackedByteArray:
+	"""Capture the running game window as PNG bytes"""
+	if _throttled():
+		return _get_cached_png()
 	
+	# Get the main viewport which contains the running scene
+	return _capture(Engine.get_main_loop().root, "running_scene", "Running scene screenshot")
+
+
+func capture_viewport_png(viewport: Viewport) -> PackedByteArray:
+	"""Capture a specific viewport as PNG bytes"""
+	return _capture(viewport, "viewport", "Viewport screenshot")
+
+
+func _throttled() -> bool:
+	"""Throttle screenshots to prevent spam"""
 	var current_time = Time.get_ticks_msec()
-	
 	if current_time - last_screenshot_time < min_screenshot_interval:
 		push_warning("[Screenshot Manager] Throttling: Too soon since last screenshot")
-		return _get_cached_screenshot()
-	
+		return true
 	last_screenshot_time = current_time
-	
-	# Get the main viewport which contains the running scene
-	var viewport = Engine.get_main_loop().root
-	if not viewport:
-		push_error("[Screenshot Manager] Failed to get root viewport")
-		return ""
-	
-	var img = viewport.get_texture().get_image()
-	
-	if img == null or img.is_empty():
-		push_error("[Screenshot Manager] Failed to capture running scene screenshot")
-		return ""
-	
-	# Save to file
-	var timestamp = Time.get_unix_time_from_system()
-	var filename = "running_scene_%d.png" % timestamp
-	var file_path = screenshot_dir + filename
-	
-	var error = img.save_png(file_path)
-	if error != OK:
-		push_error("[Screenshot Manager] Failed to save screenshot: ", error_string(error))
-		return ""
-	
-	# Convert to base64
-	var base64_data = _image_to_base64(img)
-	
-	emit_signal("screenshot_captured", file_path, base64_data)
-	print("[Screenshot Manager] Running scene screenshot captured: ", file_path)
-	
-	return base64_data
+	return false
 
 
-func capture_viewport_screenshot(viewport: Viewport) -> String:
-	"""Capture a specific viewport and return base64-encoded PNG"""
+func _capture(viewport: Viewport, prefix: String, label: String) -> PackedByteArray:
+	"""Save the viewport's image to screenshot_dir and return it as PNG bytes"""
 	if not viewport:
 		push_error("[Screenshot Manager] Invalid viewport provided")
-		return ""
+		return PackedByteArray()
 	
 	var img = viewport.get_texture().get_image()
 	
 	if img == null or img.is_empty():
-		push_error("[Screenshot Manager] Failed to capture viewport screenshot")
-		return ""
+		push_error("[Screenshot Manager] Failed to capture %s" % label.to_lower())
+		return PackedByteArray()
+	
+	# Encode once; the same bytes go to disk and to the caller
+	var buffer = img.save_png_to_buffer()
+	if buffer.is_empty():
+		push_error("[Screenshot Manager] Failed to convert image to PNG buffer")
+		return buffer
 	
 	# Save to file
 	var timestamp = Time.get_unix_time_from_system()
-	var filename = "viewport_%d.png" % timestamp
-	var file_path = screenshot_dir + filename
-	
-	var error = img.save_png(file_path)
-	if error != OK:
-		push_error("[Screenshot Manager] Failed to save screenshot: ", error_string(error))
-		return ""
+	var file_path = screenshot_dir + "%s_%d.png" % [prefix, timestamp]
 	
-	# Convert to base64
-	var base64_data = _image_to_base64(img)
+	var file = FileAccess.open(file_path, FileAccess.WRITE)
+	if file == null:
+		push_error("[Screenshot Manager] Failed to save screenshot: ", error_string(FileAccess.get_open_error()))
+		return PackedByteArray()
+	file.store_buffer(buffer)
+	file.close()
 	
-	emit_signal("screenshot_captured", file_path, base64_data)
-	print("[Screenshot Manager] Viewport screenshot captured: ", file_path)
+	# Listeners get base64; skip the encoding when there are none
+	if not screenshot_captured.get_connections().is_empty():
+		screenshot_captured.emit(file_path, Marshalls.raw_to_base64(buffer))
+	print("[Screenshot Manager] %s captured: " % label, file_path)
 	
-	return base64_data
+	return buffer
 
 
 func auto_capture_on_scene_change(scene_root: Node) -> void:
@@ -154,27 +123,11 @@ func auto_capture_on_error() -> void:
 	capture_editor_screenshot()
 
 
-func _image_to_base64(img: Image) -> String:
-	"""Convert Image to base64-encoded PNG string"""
-	if img == null or img.is_empty():
-		return ""
-	
-	# Save to buffer
-	var buffer = img.save_png_to_buffer()
-	if buffer.size() == 0:
-		push_error("[Screenshot Manager] Failed to convert image to PNG buffer")
-		return ""
-	
-	# Encode to base64
-	var base64 = Marshalls.raw_to_base64(buffer)
-	return base64
-
-
-func _get_cached_screenshot() -> String:
+func _get_cached_png() -> PackedByteArray:
 	"""Return the most recent screenshot from disk if available"""
 	var dir = DirAccess.open(screenshot_dir)
 	if not dir:
-		return ""
+		return PackedByteArray()
 	
 	var files = []
 	dir.list_dir_begin()
@@ -188,18 +141,14 @@ func _get_cached_screenshot() -> String:
 	dir.list_dir_end()
 	
 	if files.size() == 0:
-		return ""
+		return PackedByteArray()
 	
 	# Sort by timestamp (filename contains timestamp)
 	files.sort()
 	var latest_file = files[-1]
 	
-	# Load and convert to base64
-	var img = Image.load_from_file(screenshot_dir + latest_file)
-	if img:
-		return _image_to_base64(img)
-	
-	return ""
+	# The file already holds PNG bytes, no need to decode and re-encode
+	return FileAccess.get_file_as_bytes(screenshot_dir + latest_file)
 
 
 func clear_old_screenshots(max_age_seconds: int = 3600) -> void:
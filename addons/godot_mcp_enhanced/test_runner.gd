@@ -0,0 +1,67 @@
+extends SceneTree
+## Headless test runner used by the run_tests tool.
+##
+## Started by the Python server as
+##   godot --headless --path <project> --script res://addons/godot_mcp_enhanced/test_runner.gd -- <script> ...
+## Each script's test_* methods run the same way run_test_script runs them:
+## a return of true or null passes, anything else fails with that value as
+## the error. Every result is printed on its own line as RESULT_PREFIX plus
+## JSON so the caller can pick results out of Godot's other output. The exit
+## code is 1 when any test failed.
+##
+## A test that hits a script error returns null like a passing one, so each
+## test is announced with START_PREFIX first. The caller reads stdout and
+## stderr as one stream and fails a test whose start is followed by a
+## SCRIPT ERROR, or by no result at all, before its result line. Markers go
+## to stderr, unbuffered like the errors, so that order holds in the stream.
+
+const RESULT_PREFIX := "MCP_TEST "
+const START_PREFIX := "MCP_TEST_START "
+
+
+func _initialize() -> void:
+	var failed := 0
+	for script_path in OS.get_cmdline_user_args():
+		failed += _run_script(script_path)
+	quit(1 if failed > 0 else 0)
+
+
+func _run_script(script_path: String) -> int:
+	var script = load(script_path)
+	if not script:
+		_emit({"script": script_path, "name": null, "passed": false, "error": "Failed to load test script", "usec": 0})
+		return 1
+
+	var test_instance = script.new()
+	if not test_instance:
+		_emit({"script": script_path, "name": null, "passed": false, "error": "Failed to instantiate test script", "usec": 0})
+		return 1
+
+	var failed := 0
+	for method in test_instance.get_method_list():
+		if not method.name.begins_with("test_"):
+			continue
+
+		printerr(START_PREFIX + JSON.stringify({"script": script_path, "name": method.name}))
+		var started := Time.get_ticks_usec()
+		var result = test_instance.call(method.name)
+		var elapsed := Time.get_ticks_usec() - started
+
+		var passed: bool = result == true or result == null
+		if not passed:
+			failed += 1
+		_emit({
+			"script": script_path,
+			"name": method.name,
+			"passed": passed,
+			"error": null if passed else str(result),
+			"usec": elapsed
+		})
+
+	if not test_instance is RefCounted:
+		test_instance.free()
+	return failed
+
+
+func _emit(data: Dictionary) -> void:
+	printerr(RESULT_PREFIX + JSON.stringify(data))
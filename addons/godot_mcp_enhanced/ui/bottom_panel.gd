@@ -7,6 +7,8 @@ signal server_restart_requested()
 var current_config: Dictionary = {}
 var request_count: int = 0
 var last_request_time: float = 0.0
+# The HTTP server's BridgeMetrics, set by the plugin
+var bridge_metrics = null
 
 @onready var status_label = $MarginContainer/VBoxContainer/Header/StatusContainer/StatusLabel
 @onready var status_indicator = $MarginContainer/VBoxContainer/Header/StatusContainer/StatusIndicator
@@ -87,9 +89,22 @@ func increment_request_count() -> void:
 	_update_stats()
 
 
+## Connected to the HTTP server's request_completed signal.
+func on_request_completed(_route: String, _status_code: int, _msec: float) -> void:
+	increment_request_count()
+
+
 func _update_stats() -> void:
 	# Update request count
-	requests_label.text = "Requests: " + str(request_count)
+	if bridge_metrics:
+		var text = "Requests: %d | Errors: %d | Mean: %.1f ms" % [
+			bridge_metrics.total_requests, bridge_metrics.total_errors, bridge_metrics.mean_ms()]
+		var slowest = bridge_metrics.slowest_route()
+		if not slowest.is_empty():
+			text += " | Slowest: " + slowest
+		requests_label.text = text
+	else:
+		requests_label.text = "Requests: " + str(request_count)
 	
 	# Update uptime
 	var uptime = Time.get_ticks_msec() / 1000.0 - start_time
@@ -103,6 +118,8 @@ func _on_restart_pressed() -> void:
 	print("[MCP Enhanced] Restarting server...")
 	emit_signal("server_restart_requested")
 	request_count = 0
+	if bridge_metrics:
+		bridge_metrics.reset()
 	start_time = Time.get_ticks_msec() / 1000.0
 
 
@@ -0,0 +1,108 @@
+@tool
+extends RefCounted
+## Typed, JSON-safe encoding of Variant values for the HTTP API.
+##
+## JSON-native values (null, bool, int, float, String) pass through as-is, and
+## Arrays and Dictionaries are encoded element by element. Everything else
+## becomes {"type": <type name>, "var": var_to_str(value)}, e.g.
+## {"type": "Vector2", "var": "Vector2(1, 2)"}, which decode() turns back into
+## the exact value. Resources are sent by path, other objects by class only.
+
+const TEXT_TYPES := [TYPE_STRING, TYPE_STRING_NAME, TYPE_NODE_PATH]
+
+
+static func encode(value: Variant) -> Variant:
+	match typeof(value):
+		TYPE_NIL, TYPE_BOOL, TYPE_INT, TYPE_STRING:
+			return value
+		TYPE_FLOAT:
+			# NaN and inf have no JSON form
+			if is_finite(value):
+				return value
+		TYPE_STRING_NAME:
+			return str(value)
+		TYPE_ARRAY:
+			var items := []
+			for item in value:
+				items.append(encode(item))
+			return items
+		TYPE_DICTIONARY:
+			var encoded := {}
+			for key in value:
+				encoded[str(key)] = encode(value[key])
+			return encoded
+		TYPE_OBJECT:
+			if not is_instance_valid(value):
+				return null
+			if value is Resource and not value.resource_path.is_empty():
+				return {"type": "Resource", "class": value.get_class(), "path": value.resource_path}
+			return {"type": "Object", "class": value.get_class()}
+	return {"type": type_string(typeof(value)), "var": var_to_str(value)}
+
+
+## Decodes a value from the API for a property of type target_type
+## (TYPE_NIL when unknown). Besides encode()'s output this accepts
+## var_to_str text such as "Vector2(1, 2)" for non-string properties, which
+## is what get_node_properties has always returned. Array and Dictionary
+## elements are decoded the same way, with their type unknown. Whatever the
+## input, the result must then be of target_type: Object properties also take
+## null, text types convert among themselves, and packed arrays take an
+## Array. Returns an error string in `error` on failure:
+## {"value": ..., "error": ""}.
+static func decode(value: Variant, target_type: int = TYPE_NIL) -> Dictionary:
+	var decoded := _decode(value, target_type)
+	if not decoded.error.is_empty() or target_type == TYPE_NIL:
+		return decoded
+	var result = decoded.value
+	var result_type := typeof(result)
+	if result_type == target_type:
+		return decoded
+	if target_type == TYPE_OBJECT and result_type == TYPE_NIL:
+		return decoded
+	if target_type in TEXT_TYPES and result_type in TEXT_TYPES:
+		return {"value": type_convert(result, target_type), "error": ""}
+	if target_type >= TYPE_PACKED_BYTE_ARRAY and target_type < TYPE_MAX and result_type == TYPE_ARRAY:
+		return {"value": type_convert(result, target_type), "error": ""}
+	return {"value": null, "error": "Expected %s, got %s" % [type_string(target_type), type_string(result_type)]}
+
+
+static func _decode(value: Variant, target_type: int) -> Dictionary:
+	if value is Dictionary and value.has("var"):
+		var parsed = str_to_var(str(value["var"]))
+		if parsed == null and str(value["var"]) != "null":
+			return {"value": null, "error": "Cannot parse value: %s" % value["var"]}
+		return {"value": parsed, "error": ""}
+	if value is Dictionary and value.get("type") == "Resource" and value.has("path"):
+		var resource = load(str(value["path"]))
+		if resource == null:
+			return {"value": null, "error": "Cannot load resource: %s" % value["path"]}
+		return {"value": resource, "error": ""}
+	if value is Array:
+		var items := []
+		for item in value:
+			var decoded := decode(item)
+			if not decoded.error.is_empty():
+				return decoded
+			items.append(decoded.value)
+		return {"value": items, "error": ""}
+	if value is Dictionary:
+		var entries := {}
+		for key in value:
+			var decoded := decode(value[key])
+			if not decoded.error.is_empty():
+				return decoded
+			entries[key] = decoded.value
+		return {"value": entries, "error": ""}
+	if value is String and not target_type in [TYPE_NIL, TYPE_STRING, TYPE_STRING_NAME, TYPE_NODE_PATH, TYPE_OBJECT]:
+		var parsed = str_to_var(value)
+		if parsed is int and target_type == TYPE_FLOAT:
+			parsed = float(parsed)
+		if typeof(parsed) != target_type:
+			return {"value": null, "error": "Expected %s, got \"%s\"" % [type_string(target_type), value]}
+		return {"value": parsed, "error": ""}
+	# JSON has a single number type
+	if value is float and target_type == TYPE_INT and value == floorf(value):
+		return {"value": int(value), "error": ""}
+	if value is int and target_type == TYPE_FLOAT:
+		return {"value": float(value), "error": ""}
+	return {"value": value, "error": ""}
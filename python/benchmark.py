@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Local benchmark of the MCP server's editor transport.
+
+Starts a fake editor that answers like the Godot plugin, then drives
+mcp_server's own tool path against it and reports, per scenario, response
+bytes, wall time and the MCP server's CPU time per call. No Godot needed.
+
+    python benchmark.py                 # 2 MiB screenshots, 50 calls
+    python benchmark.py --size 8 --calls 20
+
+Scenarios:
+  screenshot/json    Screenshot as base64 inside JSON (editors before the
+                     binary frame, or clients that do not ask for it)
+  screenshot/frame   Screenshot as raw PNG bytes in a length-prefixed frame
+  info/tcp           Small request over loopback TCP
+  info/unix          The same over a Unix domain socket (not on Windows)
+  tree-<size>/<enc>  A get_filesystem_tree answer of about that size, plain
+                     or compressed. zstd needs the zstandard package. The
+                     fake editor, like the plugin, leaves bodies under
+                     8 KiB plain.
+
+Before the scenarios it reports the server's own overheads: importing
+mcp_server in a fresh interpreter, the first and later list_tools calls,
+and dispatching a call to a tool that does no I/O.
+
+"editor encode" is a Python stand-in for the plugin's own work building the
+body: base64 + JSON.stringify versus copying bytes into the frame, or
+compressing the JSON.
+"""
+
+import argparse
+import asyncio
+import base64
+import gzip
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TOKEN = "benchmark-token"
+FRAME_TYPE = "application/x-mcp-frame"
+INFO_BODY = json.dumps({"success": True, "data": {"name": "benchmark", "godot_version": "4.5"}}).encode()
+# Same as http_server.gd
+COMPRESS_MIN_BYTES = 8192
+TREE_SIZES = {"4k": 4 << 10, "64k": 64 << 10, "1m": 1 << 20, "8m": 8 << 20}
+COMPRESSORS = {"gzip": lambda body: gzip.compress(body, 6)}
+if zstandard is not None:
+    COMPRESSORS["zstd"] = lambda body: zstandard.ZstdCompressor(level=3).compress(body)
+
+
+def _json_body(png: bytes) -> bytes:
+    return json.dumps({"success": True, "data": {"screenshot": base64.b64encode(png).decode("ascii")}}).encode()
+
+
+def _frame_body(png: bytes) -> bytes:
+    meta = json.dumps({"success": True, "data": {"screenshot": {"$blob": 0, "offset": 0, "length": len(png)}}}).encode()
+    return len(meta).to_bytes(4, "little") + meta + png
+
+
+def _tree_body(size: int) -> bytes:
+    """A filesystem tree answer of about `size` bytes, as repetitive as a
+    real one."""
+    files = []
+    used = 0
+    while used < size:
+        i = len(files)
+        entry = {"path": f"res://assets/level_{i % 12}/props/prop_{i:05d}.tscn", "type": "PackedScene",
+                 "size": 1000 + i * 37 % 9000, "uid": f"uid://b{i * 7919 % 10 ** 12:012d}"}
+        files.append(entry)
+        used += len(json.dumps(entry)) + 2
+    return json.dumps({"success": True, "data": {"root": "res://", "files": files}}).encode()
+
+
+class FakeEditor:
+    """HTTP server on a thread of its own, so its work is not counted in
+    the MCP server's CPU time. Listens on TCP and, where supported, a Unix
+    socket. Screenshots are framed when the Accept header asks for it, like
+    http_server.gd. Filesystem trees are compressed when the Accept-Encoding
+    header allows and they are big enough. Every other route gets a small
+    JSON answer."""
+
+    def __init__(self, png: bytes):
+        self.bodies = {"json": _json_body(png), "frame": _frame_body(png)}
+        self.trees = {name: _tree_body(size) for name, size in TREE_SIZES.items()}
+        self.compressed = {(name, encoding): compress(body) for name, body in self.trees.items()
+                           for encoding, compress in COMPRESSORS.items()}
+        # The tree /api/project/filesystem answers with, set per scenario
+        self.tree = "4k"
+        self.port = 0
+        self.socket_path = ""
+        self._ready = threading.Event()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        if self.socket_path:
+            os.unlink(self.socket_path)
+            os.rmdir(os.path.dirname(self.socket_path))
+
+    def _run(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        servers = [self._loop.run_until_complete(asyncio.start_server(self._handle, "127.0.0.1", 0))]
+        self.port = servers[0].sockets[0].getsockname()[1]
+        if hasattr(socket, "AF_UNIX"):
+            path = os.path.join(tempfile.mkdtemp(prefix="godot-mcp-bench-"), "bridge.sock")
+            servers.append(self._loop.run_until_complete(asyncio.start_unix_server(self._handle, path)))
+            self.socket_path = path
+        self._ready.set()
+        self._loop.run_forever()
+        for server in servers:
+            server.close()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1")
+        lines = head.split("\r\n")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+        await reader.readexactly(int(headers.get("content-length", "0")))
+        content_type = "application/json; charset=utf-8"
+        encoding = ""
+        path = lines[0].split(" ")[1]
+        if path == "/api/project/filesystem":
+            body = self.trees[self.tree]
+            accepted = headers.get("accept-encoding", "")
+            encoding = next((e for e in ("zstd", "gzip") if e in accepted and e in COMPRESSORS), "")
+            if encoding and len(body) >= COMPRESS_MIN_BYTES:
+                body = self.compressed[(self.tree, encoding)]
+            else:
+                encoding = ""
+        elif path != "/api/editor/screenshot":
+            body = INFO_BODY
+        elif FRAME_TYPE in headers.get("accept", ""):
+            body = self.bodies["frame"]
+            content_type = FRAME_TYPE
+        else:
+            body = self.bodies["json"]
+        writer.write((
+            "HTTP/1.1 200 OK\r\n"
+            f"Content-Type: {content_type}\r\n"
+            + (f"Content-Encoding: {encoding}\r\n" if encoding else "") +
+            f"Content-Length: {len(body)}\r\n"
+            "X-MCP-Epoch: 1\r\n"
+            "Connection: close\r\n\r\n").encode())
+        writer.write(body)
+        await writer.drain()
+        writer.close()
+
+
+def _time_editor_encode(data: bytes, build, rounds: int = 5) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        build(data)
+    return (time.perf_counter() - start) / rounds * 1000.0
+
+
+async def _run_scenario(mcp_server, tool: str, calls: int) -> dict:
+    wall: list[float] = []
+    cpu: list[float] = []
+    for _ in range(calls):
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        contents = await mcp_server._call_tool(tool, {})
+        cpu.append((time.thread_time() - cpu_start) * 1000.0)
+        wall.append((time.perf_counter() - wall_start) * 1000.0)
+        if contents[0].type == "text" and '"success": false' in contents[0].text:
+            raise RuntimeError(f"Tool failed: {contents[0].text[:200]}")
+    return {"wall_ms": statistics.median(wall), "cpu_ms": statistics.median(cpu)}
+
+
+async def _startup(mcp_server, rounds: int = 7) -> None:
+    here = os.path.dirname(os.path.abspath(__file__))
+    code = "import time; t = time.perf_counter(); import mcp_server; print(time.perf_counter() - t)"
+    imports = [float(subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True,
+                                    text=True, check=True).stdout) for _ in range(rounds)]
+    code = "import time; t = time.perf_counter(); import mcp.server, mcp.types; print(time.perf_counter() - t)"
+    sdk = [float(subprocess.run([sys.executable, "-c", code], cwd=here, capture_output=True,
+                                text=True, check=True).stdout) for _ in range(rounds)]
+    start = time.perf_counter()
+    await mcp_server.list_tools()
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(1000):
+        await mcp_server.list_tools()
+    later = (time.perf_counter() - start) / 1000
+    start = time.perf_counter()
+    for _ in range(1000):
+        await mcp_server.call_tool("get_cache_stats", {})
+    dispatch = (time.perf_counter() - start) / 1000
+    print(f"import mcp_server      {statistics.median(imports) * 1000:8.1f} ms "
+          f"(of which the MCP SDK {statistics.median(sdk) * 1000:.1f} ms)")
+    print(f"list_tools, first      {first * 1000:8.2f} ms")
+    print(f"list_tools, later      {later * 1e6:8.2f} us")
+    print(f"call_tool, no I/O      {dispatch * 1e6:8.2f} us (get_cache_stats)\n")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=float, default=2.0, help="screenshot size in MiB (default 2)")
+    parser.add_argument("--calls", type=int, default=50, help="calls per scenario (default 50)")
+    args = parser.parse_args()
+
+    # Random bytes compress about as badly as a real PNG
+    png = os.urandom(int(args.size * 1024 * 1024))
+    editor = FakeEditor(png)
+    editor.start()
+    try:
+        os.environ.update({
+            "GODOT_HOST": "127.0.0.1",
+            "GDAI_MCP_SERVER_PORT": str(editor.port),
+            "GODOT_MCP_TOKEN": TOKEN,
+            "GODOT_MCP_CACHE_TTL": "0",
+        })
+        for name in ("GODOT_PROJECT_PATHS", "GODOT_PROJECT_PATH", "GODOT_MCP_SOCKET"):
+            os.environ.pop(name, None)
+        sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+        import mcp_server
+
+        target = mcp_server._default_target()
+        frame_accept = mcp_server._ACCEPT
+        # name, tool, Accept, Accept-Encoding, Unix socket, tree, bytes on
+        # the wire, and the editor's encoding step as (input, builder)
+        scenarios = [
+            ("screenshot/json", "get_editor_screenshot", "application/json", "identity", "", "",
+             editor.bodies["json"], (png, _json_body)),
+            ("screenshot/frame", "get_editor_screenshot", frame_accept, "identity", "", "",
+             editor.bodies["frame"], (png, _frame_body)),
+            ("info/tcp", "get_project_info", frame_accept, "identity", "", "", INFO_BODY, None),
+        ]
+        if editor.socket_path:
+            scenarios.append(("info/unix", "get_project_info", frame_accept, "identity", editor.socket_path, "",
+                              INFO_BODY, None))
+        for tree, body in editor.trees.items():
+            scenarios.append((f"tree-{tree}/plain", "get_filesystem_tree", frame_accept, "identity", "", tree,
+                              body, None))
+            for encoding, compress in COMPRESSORS.items():
+                compressed = len(body) >= COMPRESS_MIN_BYTES
+                scenarios.append((f"tree-{tree}/{encoding}", "get_filesystem_tree", frame_accept, encoding, "", tree,
+                                  editor.compressed[(tree, encoding)] if compressed else body,
+                                  (body, compress) if compressed else None))
+
+        await _startup(mcp_server)
+        print(f"{len(png) / 1048576:.1f} MiB screenshot, {args.calls} calls per scenario, medians\n")
+        print(f"{'scenario':<18} {'bytes':>12} {'editor encode':>14} {'wall ms':>9} {'server cpu ms':>14}")
+        for name, tool, accept, accept_encoding, socket_path, tree, body, encode_step in scenarios:
+            mcp_server._ACCEPT = accept
+            target.socket_path = socket_path
+            target.get_client().headers["Accept-Encoding"] = accept_encoding
+            editor.tree = tree or editor.tree
+            result = await _run_scenario(mcp_server, tool, args.calls)
+            encode = f"{_time_editor_encode(*encode_step):>12.2f}ms" if encode_step else f"{'-':>14}"
+            print(f"{name:<18} {len(body):>12,} {encode} {result['wall_ms']:>9.2f} {result['cpu_ms']:>14.2f}")
+        await target.aclose()
+    finally:
+        editor.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
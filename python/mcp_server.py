@@ -6,9 +6,19 @@ Works with any MCP client: Claude Desktop, Cursor, Windsurf, Kiro, and others.
 """
 
 import asyncio
+import base64
+import bisect
+import contextvars
+import fnmatch
+import heapq
+import itertools
 import json
 import os
-from typing import Any, Optional
+import re
+import subprocess
+import time
+from collections import OrderedDict, deque
+from typing import Any, Awaitable, Callable, Optional
 
 import httpx
 from mcp.server import Server
@@ -26,33 +36,53 @@ GODOT_BASE_URL = "http://" + GODOT_HOST + ":" + str(GODOT_PORT)
 GODOT_PROJECT_PATH = os.getenv("GODOT_PROJECT_PATH", "")
 
 
+# Unix socket the plugin listens on instead of TCP, for a single editor.
+# Otherwise taken from godot_mcp_config.json when GDAI_MCP_TRANSPORT is "unix".
+GODOT_MCP_SOCKET = os.getenv("GODOT_MCP_SOCKET", "")
+DEFAULT_SOCKET_PATH = os.path.join(".godot", "mcp_bridge.sock")
+
+
+CONFIG_FILE = "godot_mcp_config.json"
+
+
+def _read_config(root: str) -> dict:
+    """godot_mcp_config.json under a project root, or {}."""
+    if not root:
+        return {}
+    try:
+        with open(os.path.join(root, CONFIG_FILE), "r", encoding="utf-8") as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
 def _load_token() -> str:
     """Prefer GODOT_MCP_TOKEN; otherwise read the token the Godot plugin
     wrote into godot_mcp_config.json at the project root."""
     env_token = os.getenv("GODOT_MCP_TOKEN", "")
     if env_token:
         return env_token
-    if GODOT_PROJECT_PATH:
-        config_file = os.path.join(GODOT_PROJECT_PATH, "godot_mcp_config.json")
-        try:
-            with open(config_file, "r", encoding="utf-8") as f:
-                return str(json.load(f).get("GDAI_MCP_TOKEN", ""))
-        except (OSError, ValueError):
-            pass
-    return ""
+    return str(_read_config(GODOT_PROJECT_PATH).get("GDAI_MCP_TOKEN", ""))
+
 
+def _socket_path(root: str, config: dict) -> str:
+    """The plugin's Unix socket per its config, resolved like plugin.gd
+    does, or "" when it serves TCP."""
+    if str(config.get("GDAI_MCP_TRANSPORT", "tcp")).lower() != "unix":
+        return ""
+    return os.path.join(root, str(config.get("GDAI_MCP_SOCKET_PATH", DEFAULT_SOCKET_PATH)))
 
-_AUTH_TOKEN = _load_token()
 
 
 def _resolve_in_project(raw_path: str) -> str:
     """Map a res:// or relative path to an absolute path inside the project.
 
     Raises ValueError when the result would land outside the project root.
-    The root comes from GODOT_PROJECT_PATH and falls back to the current
-    working directory.
+    The root is the current editor target's project (GODOT_PROJECT_PATH for
+    a single editor) and falls back to the current working directory.
     """
-    root = os.path.realpath(GODOT_PROJECT_PATH or os.getcwd())
+    root = os.path.realpath(_target().root or os.getcwd())
     path = raw_path.strip()
     if path.startswith("res://"):
         path = path[len("res://"):]
@@ -64,19 +94,1119 @@ def _resolve_in_project(raw_path: str) -> str:
         raise ValueError("Path escapes the project root: " + raw_path)
     return candidate
 
-# Initialize MCP server
-app = Server("godot-mcp-enhanced")
 
-# Persistent HTTP client for Godot API calls (reused across requests)
-_http_client: Optional[httpx.AsyncClient] = None
+class _UidMap:
+    """uid:// <-> res:// table built from the project files on disk.
+
+    Lets UID conversions be answered without a round-trip to the editor, or
+    without an editor at all. Sources, in the order Godot itself uses them:
+    `.uid` sidecars (scripts and shaders since 4.4), the `[remap]` uid in
+    `.import` sidecars, and the `uid="..."` attribute on the header line of
+    text scenes and resources. A source file is re-read only when its mtime
+    changes. The tree is re-stated in a worker thread, at most every
+    REFRESH_SECONDS, and once more when a lookup misses, so a big project
+    does not stall the event loop on every conversion.
+    """
+
+    REFRESH_SECONDS = 2.0
+
+    _HEADER_UID = re.compile(r'\buid="(uid://[^"]+)"')
+    _IMPORT_UID = re.compile(r'^uid="(uid://[^"]+)"', re.MULTILINE)
+    _SOURCES = (".uid", ".import", ".tscn", ".tres")
+
+    def __init__(self) -> None:
+        self._root = ""
+        # source file -> (mtime_ns, res_path, uid)
+        self._entries: dict[str, tuple[int, str, str]] = {}
+        self._uid_to_path: dict[str, str] = {}
+        self._path_to_uid: dict[str, str] = {}
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def ensure_fresh(self, root: str, force: bool = False) -> bool:
+        """Refresh off the event loop if the map is older than
+        REFRESH_SECONDS (or force). True when a refresh ran."""
+        async with self._lock:
+            if not force and root == self._root and time.monotonic() - self._refreshed_at < self.REFRESH_SECONDS:
+                return False
+            await asyncio.to_thread(self.refresh, root)
+            self._refreshed_at = time.monotonic()
+            return True
+
+    def refresh(self, root: str) -> None:
+        if root != self._root:
+            self._root = root
+            self._entries.clear()
+        seen: set[str] = set()
+        changed = False
+        for dirpath, dirnames, filenames in os.walk(root):
+            # .godot holds the editor's own caches; hidden dirs are skipped
+            # the same way the editor's filesystem dock skips them.
+            dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+            for filename in filenames:
+                if not filename.endswith(self._SOURCES):
+                    continue
+                source = os.path.join(dirpath, filename)
+                try:
+                    mtime = os.stat(source).st_mtime_ns
+                except OSError:
+                    continue
+                seen.add(source)
+                cached = self._entries.get(source)
+                if cached is not None and cached[0] == mtime:
+                    continue
+                self._entries[source] = (mtime,) + self._parse(root, source)
+                changed = True
+        for source in list(self._entries):
+            if source not in seen:
+                del self._entries[source]
+                changed = True
+        if changed:
+            # Built aside and swapped in whole: lookups run on the event loop
+            # while this runs in a thread
+            uid_to_path: dict[str, str] = {}
+            path_to_uid: dict[str, str] = {}
+            for _, res_path, uid in self._entries.values():
+                if uid:
+                    uid_to_path[uid] = res_path
+                    path_to_uid[res_path] = uid
+            self._uid_to_path, self._path_to_uid = uid_to_path, path_to_uid
+
+    def _parse(self, root: str, source: str) -> tuple[str, str]:
+        """Return (res_path, uid) for one source file; uid is "" if absent."""
+        if source.endswith((".uid", ".import")):
+            target = os.path.splitext(source)[0]
+        else:
+            target = source
+        res_path = "res://" + os.path.relpath(target, root).replace(os.sep, "/")
+        try:
+            with open(source, "r", encoding="utf-8") as f:
+                if source.endswith(".uid"):
+                    uid = f.readline().strip()
+                    return res_path, uid if uid.startswith("uid://") else ""
+                if source.endswith(".import"):
+                    match = self._IMPORT_UID.search(f.read())
+                else:
+                    match = self._HEADER_UID.search(f.readline())
+        except (OSError, UnicodeDecodeError):
+            return res_path, ""
+        return res_path, match.group(1) if match else ""
+
+    def lookup(self, values: list[str], to_path: bool) -> tuple[dict[str, str], list[str]]:
+        """Resolve values (UIDs when to_path, else project paths).
+
+        Returns the resolved mapping keyed by the value as given, plus the
+        values that could not be resolved.
+        """
+        resolved: dict[str, str] = {}
+        missing: list[str] = []
+        for value in values:
+            if to_path:
+                hit = self._uid_to_path.get(value.strip())
+            else:
+                path = value.strip()
+                if not path.startswith("res://"):
+                    path = "res://" + path.lstrip("/")
+                hit = self._path_to_uid.get(path)
+            if hit:
+                resolved[value] = hit
+            else:
+                missing.append(value)
+        return resolved, missing
+
+
+def _local_project_root() -> Optional[str]:
+    """Project root for on-disk lookups, or None if it is not a Godot project."""
+    root = os.path.realpath(_target().root or os.getcwd())
+    if os.path.isfile(os.path.join(root, "project.godot")):
+        return root
+    return None
+
+
+# ===== METRICS =====
+
+# Optional exporters; both off by default. The counters below are always kept.
+METRICS_PORT = int(os.getenv("GODOT_MCP_METRICS_PORT", "0") or 0)
+METRICS_FILE = os.getenv("GODOT_MCP_METRICS_FILE", "")
+METRICS_INTERVAL = float(os.getenv("GODOT_MCP_METRICS_INTERVAL", "15") or 15)
+
+
+class _Histogram:
+    """Fixed-bucket histogram; counts are per bucket and made cumulative only
+    when rendered, so an observation is one bisect and three additions."""
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: tuple) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+
+class _Metrics:
+    """Telemetry of the bridge: per-tool latency, tools in flight, failed
+    editor requests and response sizes, rendered in the Prometheus text
+    exposition format (which OpenMetrics scrapers also accept).
+
+    Everything runs on the event loop thread, so recording needs no lock.
+    Label values are capped at MAX_LABELS per metric; later ones are counted
+    under "other" so a misbehaving client cannot grow the tables.
+    """
+
+    LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+    BYTES_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+    MAX_LABELS = 256
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self._tool_seconds: dict[str, _Histogram] = {}
+        self._tool_exceptions: dict[str, int] = {}
+        self._http_errors: dict[tuple[str, str], int] = {}
+        self._response_bytes: dict[str, _Histogram] = {}
+        self._cache_lookups: dict[tuple[str, str], int] = {}
+        self._coalesced: dict[str, int] = {}
+        self._queue_seconds: dict[str, _Histogram] = {}
+        self._started = time.time()
+
+    def observe_tool(self, tool: str, seconds: float) -> None:
+        hist = self._tool_seconds.get(tool)
+        if hist is None:
+            tool = self._label(self._tool_seconds, tool)
+            hist = self._tool_seconds.setdefault(tool, _Histogram(self.LATENCY_BUCKETS))
+        hist.observe(seconds)
+
+    def tool_exception(self, tool: str) -> None:
+        tool = self._label(self._tool_exceptions, tool)
+        self._tool_exceptions[tool] = self._tool_exceptions.get(tool, 0) + 1
+
+    def http_error(self, endpoint: str, reason: str) -> None:
+        key = (endpoint, reason)
+        if key not in self._http_errors and len(self._http_errors) >= self.MAX_LABELS:
+            key = ("other", reason)
+        self._http_errors[key] = self._http_errors.get(key, 0) + 1
+
+    def response_bytes(self, endpoint: str, size: int) -> None:
+        hist = self._response_bytes.get(endpoint)
+        if hist is None:
+            endpoint = self._label(self._response_bytes, endpoint)
+            hist = self._response_bytes.setdefault(endpoint, _Histogram(self.BYTES_BUCKETS))
+        hist.observe(size)
+
+    def cache_lookup(self, tool: str, hit: bool) -> None:
+        key = (tool, "hit" if hit else "miss")
+        self._cache_lookups[key] = self._cache_lookups.get(key, 0) + 1
+
+    def queue_wait(self, priority: str, seconds: float) -> None:
+        hist = self._queue_seconds.get(priority)
+        if hist is None:
+            hist = self._queue_seconds.setdefault(priority, _Histogram(self.LATENCY_BUCKETS))
+        hist.observe(seconds)
+
+    def coalesced(self, tool: str) -> None:
+        self._coalesced[tool] = self._coalesced.get(tool, 0) + 1
+
+    def cache_lookups(self) -> dict:
+        """{tool: {"hit": n, "miss": n}}"""
+        lookups: dict[str, dict[str, int]] = {}
+        for (tool, result), count in self._cache_lookups.items():
+            lookups.setdefault(tool, {"hit": 0, "miss": 0})[result] = count
+        return lookups
+
+    def _label(self, table: dict, value: str) -> str:
+        if value in table or len(table) < self.MAX_LABELS:
+            return value
+        return "other"
+
+    def render(self) -> str:
+        lines: list[str] = []
+        self._render_histogram(
+            lines, "godot_mcp_tool_duration_seconds",
+            "Wall time of MCP tool calls, including every editor round-trip.",
+            "tool", self._tool_seconds)
+        self._render_counter(
+            lines, "godot_mcp_tool_exceptions_total",
+            "Tool calls that raised instead of returning a result.",
+            {(("tool", tool),): n for tool, n in self._tool_exceptions.items()})
+        lines += [
+            "# HELP godot_mcp_tools_in_flight Tool calls currently running.",
+            "# TYPE godot_mcp_tools_in_flight gauge",
+            f"godot_mcp_tools_in_flight {self.in_flight}",
+        ]
+        self._render_counter(
+            lines, "godot_mcp_http_errors_total",
+            "Editor requests that failed, by endpoint and HTTP status or transport error.",
+            {(("endpoint", e), ("reason", r)): n for (e, r), n in self._http_errors.items()})
+        lines += [
+            "# HELP godot_mcp_editor_up Whether the editor answered its last request.",
+            "# TYPE godot_mcp_editor_up gauge",
+        ]
+        for target in _editor_targets().values():
+            if target.healthy is not None:
+                lines.append(f"godot_mcp_editor_up{{{self._labels([('target', target.name)])}}} {int(target.healthy)}")
+        lines += [
+            "# HELP godot_mcp_editor_heartbeat_seconds Round trip of the last answered heartbeat.",
+            "# TYPE godot_mcp_editor_heartbeat_seconds gauge",
+        ]
+        for target in _editor_targets().values():
+            if target.latency_ms is not None:
+                lines.append(f"godot_mcp_editor_heartbeat_seconds{{{self._labels([('target', target.name)])}}} "
+                             f"{target.latency_ms / 1000.0:.6f}")
+        lines += [
+            "# HELP godot_mcp_editor_requests_in_flight Requests the editor is working on.",
+            "# TYPE godot_mcp_editor_requests_in_flight gauge",
+        ]
+        for target in _editor_targets().values():
+            lines.append(f"godot_mcp_editor_requests_in_flight{{{self._labels([('target', target.name)])}}} "
+                         f"{target.scheduler.in_flight}")
+        lines += [
+            "# HELP godot_mcp_editor_queue_depth Requests waiting for an editor slot, by priority class.",
+            "# TYPE godot_mcp_editor_queue_depth gauge",
+        ]
+        for target in _editor_targets().values():
+            for priority, depth in target.scheduler.queue_depth().items():
+                labels = self._labels([("target", target.name), ("priority", priority)])
+                lines.append(f"godot_mcp_editor_queue_depth{{{labels}}} {depth}")
+        self._render_histogram(
+            lines, "godot_mcp_editor_queue_wait_seconds",
+            "Time requests waited for an editor slot, by priority class.",
+            "priority", self._queue_seconds)
+        self._render_histogram(
+            lines, "godot_mcp_response_bytes",
+            "Size of editor response bodies on the wire (compressed, when the editor compressed them).",
+            "endpoint", self._response_bytes)
+        self._render_counter(
+            lines, "godot_mcp_coalesced_calls_total",
+            "Tool calls answered by an identical call already in flight.",
+            {(("tool", tool),): n for tool, n in self._coalesced.items()})
+        self._render_counter(
+            lines, "godot_mcp_cache_lookups_total",
+            "Response cache lookups of cacheable tools, by result.",
+            {(("tool", t), ("result", r)): n for (t, r), n in self._cache_lookups.items()})
+        cache = _response_cache.stats()
+        lines += [
+            "# HELP godot_mcp_cache_bytes Size of the cached responses.",
+            "# TYPE godot_mcp_cache_bytes gauge",
+            f"godot_mcp_cache_bytes {cache['bytes']}",
+            "# HELP godot_mcp_cache_entries Cached responses.",
+            "# TYPE godot_mcp_cache_entries gauge",
+            f"godot_mcp_cache_entries {cache['entries']}",
+            "# HELP godot_mcp_cache_evictions_total Cached responses dropped for the byte budget.",
+            "# TYPE godot_mcp_cache_evictions_total counter",
+            f"godot_mcp_cache_evictions_total {cache['evictions']}",
+            "# HELP godot_mcp_cache_invalidations_total Cache invalidations, by mutating tools or editor epoch changes.",
+            "# TYPE godot_mcp_cache_invalidations_total counter",
+            f"godot_mcp_cache_invalidations_total {cache['invalidations']}",
+        ]
+        lines += [
+            "# HELP godot_mcp_start_time_seconds Unix time the MCP server started.",
+            "# TYPE godot_mcp_start_time_seconds gauge",
+            f"godot_mcp_start_time_seconds {self._started:.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _labels(pairs) -> str:
+        def escape(value: str) -> str:
+            return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+        return ",".join(f'{key}="{escape(str(value))}"' for key, value in pairs)
+
+    def _render_counter(self, lines: list, name: str, help_text: str, values: dict) -> None:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+        for pairs, value in sorted(values.items()):
+            lines.append(f"{name}{{{self._labels(pairs)}}} {value}")
+
+    def _render_histogram(self, lines: list, name: str, help_text: str,
+                          label: str, hists: dict) -> None:
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+        for value, hist in sorted(hists.items()):
+            labels = self._labels([(label, value)])
+            cumulative = 0
+            for bound, count in zip(hist.bounds, hist.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+            lines.append(f"{name}_sum{{{labels}}} {hist.total}")
+            lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+_metrics = _Metrics()
+
+
+async def _serve_metrics(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Answer GET /metrics on the local metrics port; anything else is a 404."""
+    try:
+        request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+        while (await asyncio.wait_for(reader.readline(), timeout=5.0)) not in (b"\r\n", b"\n", b""):
+            pass
+        parts = request_line.decode("latin-1").split()
+        if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+            status, body = "200 OK", _metrics.render().encode("utf-8")
+        else:
+            status, body = "404 Not Found", b"Not found\n"
+        writer.write((
+            f"HTTP/1.1 {status}\r\n"
+            "Content-Type: text/plain; version=0.0.4; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+    except (asyncio.TimeoutError, OSError):
+        pass
+    finally:
+        writer.close()
+
+
+def _dump_metrics(path: str) -> None:
+    """Write the metrics atomically, for the node_exporter textfile collector
+    or anything else that reads a file."""
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(_metrics.render())
+    os.replace(tmp, path)
+
+
+async def _dump_metrics_periodically(path: str, interval: float) -> None:
+    try:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                _dump_metrics(path)
+            except OSError:
+                pass
+    finally:
+        try:
+            _dump_metrics(path)
+        except OSError:
+            pass
+
+
+async def _start_metrics_exporters() -> list:
+    """Start whichever exporters the environment asks for. Returns handles
+    (servers and tasks) to close on shutdown."""
+    handles: list = []
+    if METRICS_PORT:
+        handles.append(await asyncio.start_server(_serve_metrics, "127.0.0.1", METRICS_PORT))
+    if METRICS_FILE:
+        handles.append(asyncio.create_task(
+            _dump_metrics_periodically(METRICS_FILE, max(1.0, METRICS_INTERVAL))))
+    return handles
+
+
+def _call_key(name: str, arguments: Any) -> Optional[tuple[str, str, str]]:
+    """Tool name, arguments as canonical JSON and editor target, or None if
+    the arguments are not JSON-serializable. Identical calls get identical
+    keys."""
+    try:
+        return name, json.dumps(arguments or {}, sort_keys=True, separators=(",", ":")), _target().name
+    except (TypeError, ValueError):
+        return None
+
+
+# ===== RESPONSE CACHE =====
+
+CACHE_TTL = float(os.getenv("GODOT_MCP_CACHE_TTL", "5") or 0)
+CACHE_MAX_BYTES = int(os.getenv("GODOT_MCP_CACHE_BYTES", str(8 * 1024 * 1024)) or 0)
+
+# Read-only tools whose responses are cached, by the class of editor state
+# they read.
+_CACHE_CLASSES = {
+    "get_project_info": "project",
+    "get_input_actions": "project",
+    "get_installed_plugins": "project",
+    "get_filesystem_tree": "filesystem",
+    "get_asset_info": "filesystem",
+    "get_import_info": "filesystem",
+}
+_ALL_CACHE_CLASSES = ("project", "filesystem")
+
+# Tools that change what a cache class reads. The editor's X-MCP-Epoch
+# catches whatever this misses (changes made by hand in the editor, say),
+# but only on the next request that reaches it.
+_INVALIDATES = {
+    "create_scene": ("filesystem",),
+    "delete_scene": ("filesystem",),
+    "create_script": ("filesystem",),
+    "attach_script": ("filesystem",),
+    "edit_file": ("filesystem",),
+    "add_resource": ("filesystem",),
+    "reimport_assets": ("filesystem",),
+    "cancel_reimport": ("filesystem",),
+    "write_scene_file": ("filesystem",),
+    "write_script_file": ("filesystem",),
+    "create_directory": ("filesystem",),
+    "update_project_settings": ("project",),
+    "execute_editor_script": _ALL_CACHE_CLASSES,
+    "launch_godot": _ALL_CACHE_CLASSES,
+}
+
+
+class _ResponseCache:
+    """TTL + LRU cache of tool responses under a byte budget.
+
+    Keys are the tool name, its arguments as canonical JSON and the editor
+    target. Only successful responses are stored. Entries expire after ttl
+    seconds, go when a mutating tool touches their class on their target,
+    and all of a target's go when its editor reports a new change epoch. The
+    least recently used entries are evicted first when the budget is
+    exceeded. Each invalidation bumps a generation per target and class; a
+    response whose request started before the bump is not stored, since it
+    may predate the change.
+    """
+
+    def __init__(self, ttl: float, max_bytes: int) -> None:
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key -> (expires, cache class, response, size)
+        self._entries: OrderedDict[tuple[str, str], tuple[float, str, list, int]] = OrderedDict()
+        self._bytes = 0
+        # target name -> last X-MCP-Epoch seen
+        self._epochs: dict[str, str] = {}
+        self._evictions = 0
+        self._invalidations = 0
+        # (target, cache class) -> invalidations so far
+        self._generations: dict[tuple[str, str], int] = {}
+
+    def key(self, name: str, arguments: Any) -> Optional[tuple[str, str, str]]:
+        """Cache key for a call, or None when it must not be cached."""
+        if name not in _CACHE_CLASSES or self.ttl <= 0 or self.max_bytes <= 0:
+            return None
+        return _call_key(name, arguments)
+
+    def get(self, key: tuple[str, str, str]) -> Optional[list]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            self._drop(key)
+            entry = None
+        _metrics.cache_lookup(key[0], entry is not None)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[2]
+
+    def generation(self, key: tuple[str, str, str]) -> int:
+        """Pass to put() the value read before the request was sent."""
+        return self._generations.get((key[2], _CACHE_CLASSES[key[0]]), 0)
+
+    def put(self, key: tuple[str, str, str], response: list, generation: int) -> None:
+        if generation != self.generation(key):
+            # Invalidated while the request was in flight
+            return
+        size = sum(len(getattr(item, "text", "") or getattr(item, "data", "")) for item in response)
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._drop(key)
+        self._entries[key] = (time.monotonic() + self.ttl, _CACHE_CLASSES[key[0]], response, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, classes: tuple, target: str) -> None:
+        for cache_class in classes:
+            self._generations[(target, cache_class)] = self._generations.get((target, cache_class), 0) + 1
+        stale = [key for key, entry in self._entries.items()
+                 if entry[1] in classes and key[2] == target]
+        for key in stale:
+            self._drop(key)
+        self._invalidations += 1
+
+    def after_tool(self, name: str, arguments: Any) -> None:
+        """Invalidate what a finished tool call may have changed. A job runs
+        another tool, which is what counts."""
+        if name == "start_job" and isinstance(arguments, dict):
+            name = str(arguments.get("tool", ""))
+        classes = _INVALIDATES.get(name)
+        if classes:
+            self.invalidate(classes, _target().name)
+
+    def observe_epoch(self, target: str, epoch: str) -> None:
+        previous = self._epochs.get(target)
+        if epoch != previous:
+            if previous is not None:
+                self.invalidate(_ALL_CACHE_CLASSES, target)
+            self._epochs[target] = epoch
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "evictions": self._evictions,
+            "invalidations": self._invalidations,
+            "epochs": dict(self._epochs),
+        }
+
+    def _drop(self, key: tuple[str, str, str]) -> None:
+        self._bytes -= self._entries.pop(key)[3]
+
+
+_response_cache = _ResponseCache(CACHE_TTL, CACHE_MAX_BYTES)
+
+
+# ===== REQUEST COALESCING =====
+
+# Tools that only read editor or project state. Identical calls of these that
+# overlap in time share one execution, and so one trip to the editor.
+_READ_ONLY_TOOLS = frozenset({
+    "get_project_info", "get_filesystem_tree", "search_files",
+    "uid_to_project_path", "project_path_to_uid", "uids_to_project_paths", "project_paths_to_uids",
+    "get_scene_tree", "get_scene_tree_delta", "find_nodes", "get_scene_file_content",
+    "get_properties", "get_open_scripts", "view_script", "get_godot_errors",
+    "get_editor_screenshot", "get_running_scene_screenshot", "get_editor_context", "get_live_preview",
+    "get_import_info", "get_reimport_status", "job_status", "get_runtime_stats", "get_perf_series",
+    "get_node_properties", "get_installed_plugins", "get_plugin_info", "get_assets_by_type",
+    "get_asset_info", "get_input_actions", "get_quick_project_overview", "analyze_project_dependencies",
+    "check_godot_running", "get_godot_version", "read_scene_file", "read_script_file",
+    "read_project_settings", "list_directory",
+})
+
+# Call key -> task running the first of the identical calls in flight
+_in_flight_calls: dict[tuple[str, str, str], asyncio.Task] = {}
+
+
+async def _coalesced_call_tool(name: str, arguments: Any) -> list[TextContent | ImageContent]:
+    """Run a tool call, or join an identical read-only call already running.
+
+    The shared call runs in its own task and every caller awaits it through
+    asyncio.shield, so a caller that is cancelled leaves the call running for
+    the others. Any other tool detaches the target's calls in flight when it
+    starts and when it ends, so a read issued after a write never joins one
+    that may have seen the state before it.
+    """
+    if name not in _READ_ONLY_TOOLS:
+        _detach_calls(_target().name)
+        try:
+            return await _call_tool(name, arguments)
+        finally:
+            _detach_calls(_target().name)
+    key = _call_key(name, arguments)
+    if key is None:
+        return await _call_tool(name, arguments)
+    task = _in_flight_calls.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_call_tool(name, arguments))
+        _in_flight_calls[key] = task
+        task.add_done_callback(lambda done: _forget_call(key, done))
+    else:
+        _metrics.coalesced(name)
+    return await asyncio.shield(task)
+
+
+def _detach_calls(target: str) -> None:
+    """Let later calls to target start afresh; the detached ones still
+    finish for the callers already waiting on them."""
+    for key in [key for key in _in_flight_calls if key[2] == target]:
+        del _in_flight_calls[key]
+
+
+def _forget_call(key: tuple[str, str, str], task: asyncio.Task) -> None:
+    if _in_flight_calls.get(key) is task:
+        del _in_flight_calls[key]
+    # Every caller may have given up; retrieve the exception so asyncio does
+    # not log it as never retrieved.
+    if not task.cancelled():
+        task.exception()
+
+
+# ===== EDITOR SCHEDULER =====
+
+# The editor runs every request on its main thread; more requests at once
+# only lengthen its queue and stall its UI.
+MAX_EDITOR_IN_FLIGHT = max(1, int(os.getenv("GODOT_MCP_MAX_IN_FLIGHT", "4") or 4))
+
+# Priority classes, most urgent first, with the HTTP timeout of each.
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_NORMAL = "normal"
+PRIORITY_SCREENSHOT = "screenshot"
+PRIORITY_HEAVY = "heavy"
+_PRIORITY_ORDER = (PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_SCREENSHOT, PRIORITY_HEAVY)
+_PRIORITY_TIMEOUTS = {
+    PRIORITY_INTERACTIVE: 5.0,
+    PRIORITY_NORMAL: 30.0,
+    PRIORITY_SCREENSHOT: 30.0,
+    PRIORITY_HEAVY: 120.0,
+}
+
+# Endpoints outside PRIORITY_NORMAL. Long work started with /api/jobs/start
+# returns at once, so job control is interactive whatever the job does.
+_ENDPOINT_PRIORITIES = {
+    "/api/project/info": PRIORITY_INTERACTIVE,
+    "/api/jobs/start": PRIORITY_INTERACTIVE,
+    "/api/jobs/status": PRIORITY_INTERACTIVE,
+    "/api/jobs/result": PRIORITY_INTERACTIVE,
+    "/api/jobs/cancel": PRIORITY_INTERACTIVE,
+    "/api/scene/tree_delta": PRIORITY_INTERACTIVE,
+    "/api/scene/stop": PRIORITY_INTERACTIVE,
+    "/api/runtime/simulate_key": PRIORITY_INTERACTIVE,
+    "/api/runtime/simulate_action": PRIORITY_INTERACTIVE,
+    "/api/runtime/simulate_mouse_button": PRIORITY_INTERACTIVE,
+    "/api/runtime/simulate_mouse_motion": PRIORITY_INTERACTIVE,
+    "/api/runtime/get_runtime_stats": PRIORITY_INTERACTIVE,
+    "/api/runtime/perf/start": PRIORITY_INTERACTIVE,
+    "/api/runtime/perf/stop": PRIORITY_INTERACTIVE,
+    "/api/bridge/metrics": PRIORITY_INTERACTIVE,
+    "/api/editor/screenshot": PRIORITY_SCREENSHOT,
+    "/api/editor/running_scene_screenshot": PRIORITY_SCREENSHOT,
+    "/api/context/live_preview": PRIORITY_SCREENSHOT,
+    "/api/project/filesystem": PRIORITY_HEAVY,
+    "/api/project/search_files": PRIORITY_HEAVY,
+    "/api/project/quick_overview": PRIORITY_HEAVY,
+    "/api/project/analyze_dependencies": PRIORITY_HEAVY,
+    "/api/scene/tree": PRIORITY_HEAVY,
+    "/api/runtime/get_assets_by_type": PRIORITY_HEAVY,
+    "/api/runtime/run_test_script": PRIORITY_HEAVY,
+    "/api/editor/execute_script": PRIORITY_HEAVY,
+    "/api/asset/reimport": PRIORITY_HEAVY,
+}
+
+
+class _EditorScheduler:
+    """Admission control for requests to the editor.
+
+    At most max_in_flight requests are outstanding; the rest wait in a
+    priority queue, FIFO within a class. Heavy requests may take all slots
+    but one, so an interactive probe never waits behind a wall of scans.
+    That takes two slots, so max_in_flight is at least 2.
+    """
+
+    def __init__(self, max_in_flight: int) -> None:
+        self.max_in_flight = max(2, max_in_flight)
+        self.in_flight = 0
+        self._heavy_in_flight = 0
+        # (rank, sequence, priority, future); cancelled futures are skipped
+        self._waiters: list[tuple[int, int, str, asyncio.Future]] = []
+        self._sequence = itertools.count()
+
+    async def acquire(self, priority: str) -> None:
+        if not self._waiters and self._can_start(priority):
+            self._start(priority)
+            _metrics.queue_wait(priority, 0.0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (_PRIORITY_ORDER.index(priority), next(self._sequence),
+                                       priority, future))
+        queued = time.perf_counter()
+        self._grant()
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted a slot just as the caller gave up: hand it on
+            if future.done() and not future.cancelled():
+                self.release(priority)
+            raise
+        _metrics.queue_wait(priority, time.perf_counter() - queued)
+
+    def release(self, priority: str) -> None:
+        self.in_flight -= 1
+        if priority == PRIORITY_HEAVY:
+            self._heavy_in_flight -= 1
+        self._grant()
+
+    def _grant(self) -> None:
+        """Start waiters in priority order while slots allow."""
+        while self._waiters:
+            _, _, waiting, future = self._waiters[0]
+            if future.cancelled():
+                heapq.heappop(self._waiters)
+                continue
+            # Heavy is the last class, so a blocked heavy head has only
+            # heavy requests behind it.
+            if not self._can_start(waiting):
+                break
+            heapq.heappop(self._waiters)
+            self._start(waiting)
+            future.set_result(None)
 
+    def queue_depth(self) -> dict[str, int]:
+        depth = dict.fromkeys(_PRIORITY_ORDER, 0)
+        for _, _, priority, future in self._waiters:
+            if not future.cancelled():
+                depth[priority] += 1
+        return depth
 
-async def _get_http_client() -> httpx.AsyncClient:
-    """Get or create the persistent HTTP client."""
-    global _http_client
-    if _http_client is None or _http_client.is_closed:
-        _http_client = httpx.AsyncClient(timeout=30.0)
-    return _http_client
+    def _can_start(self, priority: str) -> bool:
+        if self.in_flight >= self.max_in_flight:
+            return False
+        return priority != PRIORITY_HEAVY or self._heavy_in_flight < self.max_in_flight - 1
+
+    def _start(self, priority: str) -> None:
+        self.in_flight += 1
+        if priority == PRIORITY_HEAVY:
+            self._heavy_in_flight += 1
+
+
+
+
+# ===== EDITOR TARGETS =====
+
+# One server can front several editors: GODOT_PROJECT_PATHS lists their
+# project roots, separated like PATH, and each editor's port and token come
+# from its godot_mcp_config.json. Without it the only target is the editor
+# of GODOT_PROJECT_PATH, GDAI_MCP_SERVER_PORT and the token above.
+GODOT_PROJECT_PATHS = [p for p in os.getenv("GODOT_PROJECT_PATHS", "").split(os.pathsep) if p]
+# An editor that refused a connection is skipped by fan-out calls, and calls
+# to it fail at once, for this long
+HEALTH_RETRY_SECONDS = 5.0
+# Seconds between heartbeat probes of every editor; 0 turns the heartbeat off
+HEARTBEAT_INTERVAL = max(0.0, float(os.getenv("GODOT_MCP_HEARTBEAT_INTERVAL", "2") or 0))
+HEARTBEAT_TIMEOUT = 2.0
+# Answered by the editor's HTTP server itself, without going through a handler
+HEARTBEAT_ENDPOINT = "/api/bridge/ping"
+
+
+class _EditorTarget:
+    """One editor: its address and token, and its own connection pool,
+    scheduler and UID map, since every editor has its own main thread and
+    project."""
+
+    def __init__(self, name: str, root: str, base_url: str, token: str,
+                 socket_path: str = "", config_file: str = "") -> None:
+        self.name = name
+        self.root = root
+        self.base_url = base_url
+        self.token = token
+        # The token is re-read from here when the plugin rewrites it; "" when
+        # it came from the environment
+        self.config_file = config_file
+        self._config_mtime = self._stat_config()
+        # Used while the socket file exists; TCP on base_url otherwise,
+        # which is also what an editor without Unix socket support serves
+        self.socket_path = socket_path
+        self.scheduler = _EditorScheduler(MAX_EDITOR_IN_FLIGHT)
+        self.uid_map = _UidMap()
+        self.client: Optional[httpx.AsyncClient] = None
+        self.client_socket = ""
+        # None until the first request; then whether the editor answered
+        self.healthy: Optional[bool] = None
+        self.checked_at = 0.0
+        # Round trip of the last heartbeat that got an answer, and the
+        # heartbeats missed since
+        self.latency_ms: Optional[float] = None
+        self.missed_heartbeats = 0
+
+    def get_client(self) -> httpx.AsyncClient:
+        socket = self.socket_path if self.socket_path and os.path.exists(self.socket_path) else ""
+        if self.client is None or self.client.is_closed or socket != self.client_socket:
+            # The editor closes every connection after its response, so a
+            # replaced client holds no open sockets
+            transport = httpx.AsyncHTTPTransport(uds=socket) if socket else None
+            # Each request passes the timeout of its priority class
+            self.client = httpx.AsyncClient(transport=transport, timeout=_PRIORITY_TIMEOUTS[PRIORITY_NORMAL])
+            self.client_socket = socket
+        return self.client
+
+    def mark(self, healthy: bool) -> None:
+        self.healthy = healthy
+        self.checked_at = time.monotonic()
+
+    def recently_down(self) -> bool:
+        return self.healthy is False and time.monotonic() - self.checked_at < HEALTH_RETRY_SECONDS
+
+    def _stat_config(self) -> int:
+        try:
+            return os.stat(self.config_file).st_mtime_ns if self.config_file else 0
+        except OSError:
+            return 0
+
+    def refresh_token(self) -> bool:
+        """Re-read the token if the config file changed since it was last
+        read. True when the token is now different."""
+        mtime = self._stat_config()
+        if not mtime or mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+        token = str(_read_config(self.root).get("GDAI_MCP_TOKEN", ""))
+        if not token or token == self.token:
+            return False
+        self.token = token
+        return True
+
+    async def heartbeat(self) -> None:
+        """Probe the editor once and record whether and how fast it answered.
+
+        Sent outside the scheduler so queued work does not delay it. Any
+        HTTP answer, even a 401 or a 404 from an older plugin, means the
+        editor is up. A refused connection means it is down. A timeout only
+        does when nothing is in flight: a handler holding the editor's main
+        thread stalls the probe as well.
+        """
+        self.refresh_token()
+        start = time.perf_counter()
+        try:
+            response = await self.get_client().get(
+                f"{self.base_url}{HEARTBEAT_ENDPOINT}",
+                headers=dict([("X-MCP-Token", self.token)]), timeout=HEARTBEAT_TIMEOUT)
+        except httpx.HTTPError as e:
+            self.missed_heartbeats += 1
+            if not isinstance(e, httpx.TimeoutException) or self.scheduler.in_flight == 0:
+                if self.healthy is not False:
+                    # Reconnect from scratch once the editor is back
+                    self.client = None
+                self.mark(False)
+            return
+        self.latency_ms = (time.perf_counter() - start) * 1000.0
+        self.missed_heartbeats = 0
+        self.mark(True)
+        epoch = response.headers.get("x-mcp-epoch")
+        if epoch:
+            _response_cache.observe_epoch(self.name, epoch)
+
+    async def check_health(self) -> bool:
+        """Probe the editor with an interactive-priority request."""
+        await self.scheduler.acquire(PRIORITY_INTERACTIVE)
+        try:
+            response = await self.get_client().get(
+                f"{self.base_url}/api/project/info",
+                headers=dict([("X-MCP-Token", self.token)]), timeout=2.0)
+            self.mark(True)
+            return response.status_code == 200
+        except Exception:
+            self.mark(False)
+            return False
+        finally:
+            self.scheduler.release(PRIORITY_INTERACTIVE)
+
+    def describe(self) -> dict:
+        return {
+            "target": self.name,
+            "project_path": self.root,
+            "url": self.base_url,
+            "socket": self.client_socket or None,
+            "healthy": self.healthy,
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "missed_heartbeats": self.missed_heartbeats,
+            "requests_in_flight": self.scheduler.in_flight,
+            "queue_depth": self.scheduler.queue_depth(),
+        }
+
+    async def aclose(self) -> None:
+        if self.client is not None and not self.client.is_closed:
+            await self.client.aclose()
+        self.client = None
+
+
+def _discover_targets() -> dict[str, _EditorTarget]:
+    if not GODOT_PROJECT_PATHS:
+        name = os.path.basename(os.path.realpath(GODOT_PROJECT_PATH)) if GODOT_PROJECT_PATH else "default"
+        socket = GODOT_MCP_SOCKET or _socket_path(GODOT_PROJECT_PATH, _read_config(GODOT_PROJECT_PATH))
+        config_file = os.path.join(GODOT_PROJECT_PATH, CONFIG_FILE) \
+            if GODOT_PROJECT_PATH and not os.getenv("GODOT_MCP_TOKEN") else ""
+        return {name: _EditorTarget(name, GODOT_PROJECT_PATH, GODOT_BASE_URL, _load_token(), socket, config_file)}
+    targets: dict[str, _EditorTarget] = {}
+    for path in GODOT_PROJECT_PATHS:
+        root = os.path.realpath(path)
+        config = _read_config(root)
+        port = int(config.get("GDAI_MCP_SERVER_PORT", GODOT_PORT))
+        name = os.path.basename(root)
+        if name in targets:
+            name = f"{name}:{port}"
+        targets[name] = _EditorTarget(name, root, f"http://{GODOT_HOST}:{port}",
+                                      str(config.get("GDAI_MCP_TOKEN", "")), _socket_path(root, config),
+                                      os.path.join(root, CONFIG_FILE))
+    return targets
+
+
+_targets: dict[str, _EditorTarget] = {}
+
+
+def _editor_targets() -> dict[str, _EditorTarget]:
+    """The editors this server fronts, the first being the default. Found on
+    first use, so importing the module reads no config file or token."""
+    if not _targets:
+        _targets.update(_discover_targets())
+    return _targets
+
+
+def _default_target() -> _EditorTarget:
+    return next(iter(_editor_targets().values()))
+
+
+async def _heartbeat_loop(interval: float) -> None:
+    """Probe every editor each interval, keeping healthy, latency_ms and
+    the tokens current between tool calls."""
+    while True:
+        await asyncio.gather(*(target.heartbeat() for target in _editor_targets().values()))
+        await asyncio.sleep(interval)
+
+
+# Set by call_tool from the "target" argument
+_current_target: contextvars.ContextVar[Optional[_EditorTarget]] = contextvars.ContextVar(
+    "godot_mcp_target", default=None)
+
+
+def _target() -> _EditorTarget:
+    """The editor the current tool call addresses."""
+    return _current_target.get() or _default_target()
+
+
+_TARGET_PROPERTY = {
+    "type": "string",
+    "description": "Editor to send this call to, by name from list_editors (default: the first configured)"
+}
+
+
+async def _fan_out(arguments: dict) -> dict:
+    """Run one read-only tool on several editors at once; results by target."""
+    tool = str(arguments.get("tool", ""))
+    if tool not in _READ_ONLY_TOOLS:
+        return {"success": False, "error": f"Only read-only tools can fan out: {tool}"}
+    targets = _editor_targets()
+    names = arguments.get("targets") or list(targets)
+    unknown = [n for n in names if n not in targets]
+    if unknown:
+        return {"success": False, "error": f"Unknown targets: {', '.join(unknown)}", "targets": list(targets)}
+    tool_arguments = arguments.get("arguments") or {}
+
+    async def run_on(target: _EditorTarget) -> dict:
+        if target.recently_down():
+            return {"success": False, "error": "Editor unreachable; skipped"}
+        # gather runs this in its own task, so the target stays local to it
+        _current_target.set(target)
+        contents = await _coalesced_call_tool(tool, tool_arguments)
+        result: dict = {}
+        images = 0
+        for item in contents:
+            if isinstance(item, ImageContent):
+                images += 1
+            elif not result:
+                try:
+                    result = json.loads(item.text)
+                except ValueError:
+                    result = {"success": True, "text": item.text}
+        if images:
+            result["images_omitted"] = images
+        return result
+
+    outcomes = await asyncio.gather(*(run_on(targets[n]) for n in names), return_exceptions=True)
+    results = {}
+    for target_name, outcome in zip(names, outcomes):
+        if isinstance(outcome, Exception):
+            outcome = {"success": False, "error": str(outcome)}
+        results[target_name] = outcome
+    failed = [n for n, r in results.items() if not (isinstance(r, dict) and r.get("success"))]
+    return {"success": len(failed) < len(results), "tool": tool, "results": results, "failed": failed}
+
+
+# ===== TRACING =====
+
+# OTLP/JSON trace log, one ExportTraceServiceRequest per line (the format of
+# the OpenTelemetry Collector's file exporter). Off unless set.
+TRACE_FILE = os.getenv("GODOT_MCP_TRACE_FILE", "")
+_SPAN_KIND_SERVER = 2
+_SPAN_KIND_CLIENT = 3
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+
+
+class _Trace:
+    """Spans of one tool call.
+
+    The trace id travels to the editor in a W3C traceparent header on every
+    request the call makes. Each request becomes a client span carrying the
+    editor's Server-Timing phases as attributes, plus "godot.bridge.transport_ms":
+    the part of the round-trip the editor did not see (connect, waiting for the
+    editor's poll timer, socket I/O, client-side parsing).
+    """
+
+    __slots__ = ("trace_id", "root_id", "spans")
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.root_id = os.urandom(8).hex()
+        self.spans: list[dict] = []
+
+    def add_request(self, span_id: str, endpoint: str, start_ns: int, end_ns: int,
+                    status: Optional[int], size: int, server_timing: str,
+                    error: Optional[str]) -> None:
+        attributes: dict[str, Any] = {"http.route": endpoint, "http.response.body.size": size}
+        if status is not None:
+            attributes["http.response.status_code"] = status
+        editor_ms = 0.0
+        for phase, ms in _parse_server_timing(server_timing).items():
+            attributes[f"godot.editor.{phase}_ms"] = ms
+            editor_ms += ms
+        if server_timing:
+            attributes["godot.editor.total_ms"] = editor_ms
+            attributes["godot.bridge.transport_ms"] = max(0.0, (end_ns - start_ns) / 1e6 - editor_ms)
+        self.spans.append(_otlp_span(self.trace_id, span_id, self.root_id, "POST " + endpoint,
+                                     _SPAN_KIND_CLIENT, start_ns, end_ns, attributes, error))
+
+    def write(self, path: str, tool: str, start_ns: int, end_ns: int, error: Optional[str]) -> None:
+        root = _otlp_span(self.trace_id, self.root_id, "", "call_tool " + tool, _SPAN_KIND_SERVER,
+                          start_ns, end_ns, {"mcp.tool.name": tool, "godot.requests": len(self.spans)},
+                          error)
+        record = {"resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": "godot-mcp-enhanced"})},
+            "scopeSpans": [{"scope": {"name": "godot-mcp-enhanced"}, "spans": [root] + self.spans}],
+        }]}
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+_current_trace: contextvars.ContextVar[Optional[_Trace]] = contextvars.ContextVar(
+    "godot_mcp_trace", default=None)
+
+
+def _parse_server_timing(header: str) -> dict[str, float]:
+    """{"name": ms} from a Server-Timing header like "parse;dur=0.120, handler;dur=3.400"."""
+    phases: dict[str, float] = {}
+    for entry in header.split(","):
+        name, _, params = entry.strip().partition(";")
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if name and key == "dur":
+                try:
+                    phases[name] = float(value)
+                except ValueError:
+                    pass
+    return phases
+
+
+def _otlp_attributes(values: dict) -> list[dict]:
+    attributes = []
+    for key, value in values.items():
+        if isinstance(value, bool):
+            typed = {"boolValue": value}
+        elif isinstance(value, int):
+            typed = {"intValue": str(value)}
+        elif isinstance(value, float):
+            typed = {"doubleValue": value}
+        else:
+            typed = {"stringValue": str(value)}
+        attributes.append({"key": key, "value": typed})
+    return attributes
+
+
+def _otlp_span(trace_id: str, span_id: str, parent_id: str, name: str, kind: int,
+               start_ns: int, end_ns: int, attributes: dict, error: Optional[str]) -> dict:
+    span = {
+        "traceId": trace_id,
+        "spanId": span_id,
+        "name": name,
+        "kind": kind,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": _otlp_attributes(attributes),
+        "status": {"code": _STATUS_ERROR, "message": error} if error else {"code": _STATUS_OK},
+    }
+    if parent_id:
+        span["parentSpanId"] = parent_id
+    return span
+
+
+# Initialize MCP server
+app = Server("godot-mcp-enhanced")
 
 
 def _make_response(data: dict) -> list[TextContent]:
@@ -84,1270 +1214,2498 @@ def _make_response(data: dict) -> list[TextContent]:
     return [TextContent(type="text", text=json.dumps(data, indent=2))]
 
 
-async def call_godot_api(endpoint: str, params: Optional[dict] = None) -> dict:
+# Binary responses. The editor sends blobs (screenshot PNGs) raw in a frame
+# when asked: a little-endian u32 JSON length, the JSON, then the blobs.
+# Each blob's place in the JSON holds {"$blob", "offset", "length"}.
+# Decoding base64-encodes the blob straight from the response bytes, the
+# only base64 step between the editor's PNG encoder and ImageContent.
+FRAME_TYPE = "application/x-mcp-frame"
+_ACCEPT = f"{FRAME_TYPE}, application/json"
+
+
+def _decode_response(response: httpx.Response) -> dict:
+    """The response's JSON, with framed blobs put back as base64 strings."""
+    if not response.headers.get("content-type", "").startswith(FRAME_TYPE):
+        return response.json()
+    body = memoryview(response.content)
+    json_end = 4 + int.from_bytes(body[:4], "little")
+    if json_end > len(body):
+        raise ValueError("Truncated frame")
+    result = json.loads(bytes(body[4:json_end]))
+    data = result.get("data")
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict) and "$blob" in value:
+                start = json_end + int(value["offset"])
+                end = start + int(value["length"])
+                if end > len(body):
+                    raise ValueError("Truncated frame")
+                data[key] = base64.b64encode(body[start:end]).decode("ascii")
+    return result
+
+
+async def call_godot_api(endpoint: str, params: Optional[dict] = None,
+                         timeout: Optional[float] = None) -> dict:
     """
     Call Godot HTTP API endpoint with error handling
+
+    Goes to the current editor target. Waits for a slot from the target's
+    scheduler first, in the endpoint's priority class. timeout defaults to
+    the class's timeout.
     """
-    url = f"{GODOT_BASE_URL}{endpoint}"
+    target = _target()
+    url = f"{target.base_url}{endpoint}"
     
-    if not _AUTH_TOKEN:
+    if not target.token:
+        target.refresh_token()
+    if not target.token:
         return dict(success=False, error=(
             "No auth token. Set GODOT_MCP_TOKEN, or set GODOT_PROJECT_PATH "
-            "so the token can be read from godot_mcp_config.json."))
+            "so the token can be read from godot_mcp_config.json.") if len(_editor_targets()) == 1 else
+            f"No auth token in godot_mcp_config.json of target {target.name}.")
     
+    if target.recently_down():
+        # Known to be down: say so now rather than wait out a connect attempt
+        _metrics.http_error(endpoint, "editor_down")
+        return {
+            "success": False,
+            "error": f"Godot editor {target.name} is not reachable; is it running with the MCP plugin enabled?"
+        }
+
+    priority = _ENDPOINT_PRIORITIES.get(endpoint, PRIORITY_NORMAL)
+    await target.scheduler.acquire(priority)
+    headers = dict([("X-MCP-Token", target.token), ("Accept", _ACCEPT)])
+    trace = _current_trace.get()
+    if trace is not None:
+        span_id = os.urandom(8).hex()
+        headers["traceparent"] = f"00-{trace.trace_id}-{span_id}-01"
+        start_ns = time.time_ns()
+    response = None
+    error = None
     try:
-        client = await _get_http_client()
-        response = await client.post(
+        response = await target.get_client().post(
             url,
             json=params or {},
-            headers=dict([("X-MCP-Token", _AUTH_TOKEN)]),
+            headers=headers,
+            timeout=timeout or _PRIORITY_TIMEOUTS[priority],
         )
+        if response.status_code == 401 and target.refresh_token():
+            # The plugin wrote a new token since we last read it
+            headers["X-MCP-Token"] = target.token
+            response = await target.get_client().post(
+                url, json=params or {}, headers=headers, timeout=timeout or _PRIORITY_TIMEOUTS[priority])
+        target.mark(True)
+        _metrics.response_bytes(endpoint, response.num_bytes_downloaded)
+        epoch = response.headers.get("x-mcp-epoch")
+        if epoch:
+            _response_cache.observe_epoch(target.name, epoch)
         response.raise_for_status()
-        return response.json()
+        return _decode_response(response)
     except httpx.HTTPError as e:
+        error = str(e)
+        if isinstance(e, httpx.HTTPStatusError):
+            reason = str(e.response.status_code)
+        elif isinstance(e, httpx.TimeoutException):
+            reason = "timeout"
+        elif isinstance(e, httpx.ConnectError):
+            reason = "connect"
+            target.mark(False)
+            target.client = None
+        else:
+            reason = type(e).__name__
+        _metrics.http_error(endpoint, reason)
         return {
             "success": False,
             "error": f"HTTP error calling Godot API: {str(e)}"
         }
     except Exception as e:
+        error = str(e)
+        _metrics.http_error(endpoint, type(e).__name__)
         return {
             "success": False,
             "error": f"Error calling Godot API: {str(e)}"
         }
+    finally:
+        target.scheduler.release(priority)
+        if trace is not None:
+            trace.add_request(
+                span_id, endpoint, start_ns, time.time_ns(),
+                response.status_code if response is not None else None,
+                response.num_bytes_downloaded if response is not None else 0,
+                response.headers.get("server-timing", "") if response is not None else "",
+                error)
 
 
-# ===== TOOL DEFINITIONS =====
+async def _convert_uids(name: str, arguments: dict) -> dict:
+    """Serve uid:// <-> res:// conversions from the on-disk UID map.
 
-@app.list_tools()
-async def list_tools() -> list[Tool]:
-    """List all available MCP tools"""
-    return [
-        # Project Tools
-        Tool(
-            name="get_project_info",
-            description="Get information about the Godot project including name, version, and settings",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_filesystem_tree",
-            description="Get a recursive tree view of all files and directories in the project",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "filters": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "File extensions to filter (e.g., ['.gd', '.tscn'])"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="search_files",
-            description="Search for files in the project using fuzzy matching",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "query": {
-                        "type": "string",
-                        "description": "Search query string"
-                    }
-                },
-                "required": ["query"]
-            }
-        ),
-        Tool(
-            name="uid_to_project_path",
-            description="Convert a Godot UID (uid://) to a project path (res://)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "uid": {
-                        "type": "string",
-                        "description": "UID string (e.g., 'uid://abc123')"
-                    }
-                },
-                "required": ["uid"]
-            }
-        ),
-        Tool(
-            name="project_path_to_uid",
-            description="Convert a project path (res://) to a Godot UID",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "path": {
-                        "type": "string",
-                        "description": "Project path (e.g., 'res://scenes/main.tscn')"
-                    }
-                },
-                "required": ["path"]
-            }
-        ),
-        Tool(
-            name="get_quick_project_overview",
-            description="Get a quick overview of the project structure including scenes, scripts, and resources with counts and types",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="analyze_project_dependencies",
-            description="Analyze project dependencies including autoloads, plugins, and export presets",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        
-        # Scene Tools
-        Tool(
-            name="get_scene_tree",
-            description="Get a recursive tree view of all nodes in the current scene with properties",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_scene_file_content",
-            description="Get the raw content of the current scene file",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="create_scene",
-            description="Create a new scene with a specified root node type",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path where scene will be saved (relative to res://)"
-                    },
-                    "root_type": {
-                        "type": "string",
-                        "description": "Type of root node (e.g., 'Node2D', 'Node3D', 'Control')",
-                        "default": "Node2D"
-                    }
-                },
-                "required": ["scene_path"]
-            }
-        ),
-        Tool(
-            name="open_scene",
-            description="Open a scene in the Godot editor",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path to the scene file"
-                    }
-                },
-                "required": ["scene_path"]
-            }
-        ),
-        Tool(
-            name="delete_scene",
-            description="Delete a scene file from the project",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path to the scene file to delete"
-                    }
-                },
-                "required": ["scene_path"]
-            }
-        ),
-        Tool(
-            name="add_scene",
-            description="Add a scene as a child node to the current scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path to the scene to add"
-                    },
-                    "parent_node": {
-                        "type": "string",
-                        "description": "Path to parent node (leave empty for root)"
-                    }
-                },
-                "required": ["scene_path"]
-            }
-        ),
-        Tool(
-            name="play_scene",
-            description="Play the current scene or a specific scene in Godot",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Optional: specific scene to play (empty for current)"
-                    }
-                }
-            }
-        ),
-        Tool(
-            name="stop_running_scene",
-            description="Stop the currently running scene in Godot",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        
-        # Node Tools
-        Tool(
-            name="add_node",
-            description="Add a new node to the current scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_type": {
-                        "type": "string",
-                        "description": "Type of node to add (e.g., 'Sprite2D', 'RigidBody2D')"
-                    },
-                    "node_name": {
-                        "type": "string",
-                        "description": "Name for the new node"
-                    },
-                    "parent_node_path": {
-                        "type": "string",
-                        "description": "Path to parent node (empty for root)"
-                    },
-                    "properties": {
-                        "type": "object",
-                        "description": "Properties to set on the node"
-                    }
-                },
-                "required": ["node_type", "node_name"]
-            }
-        ),
-        Tool(
-            name="delete_node",
-            description="Delete a node from the current scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node to delete"
-                    }
+    Only values the map cannot answer go to the editor, in one bulk request.
+    Whatever neither side resolves is reported under "unresolved".
+    """
+    to_path = name in ("uid_to_project_path", "uids_to_project_paths")
+    bulk = name in ("uids_to_project_paths", "project_paths_to_uids")
+    arg_key = ("uids" if to_path else "paths") if bulk else ("uid" if to_path else "path")
+    raw = arguments.get(arg_key, [] if bulk else "")
+    values = [str(v) for v in raw] if bulk else [str(raw)]
+
+    resolved: dict[str, str] = {}
+    missing = values
+    root = _local_project_root()
+    if root:
+        uid_map = _target().uid_map
+        refreshed = await uid_map.ensure_fresh(root)
+        resolved, missing = uid_map.lookup(values, to_path)
+        if missing and not refreshed:
+            # The file may be newer than the last scan
+            await uid_map.ensure_fresh(root, force=True)
+            more, missing = uid_map.lookup(missing, to_path)
+            resolved.update(more)
+
+    result_key = "paths" if to_path else "uids"
+    if missing:
+        endpoint = "/api/project/uids_to_paths" if to_path else "/api/project/paths_to_uids"
+        result = await call_godot_api(endpoint, {"uids" if to_path else "paths": missing})
+        if result.get("success"):
+            resolved.update(result.get("data", {}).get(result_key, {}))
+        elif not resolved:
+            return result
+        missing = [v for v in missing if v not in resolved]
+
+    if not bulk:
+        single_key = "path" if to_path else "uid"
+        return {"success": True, "data": {single_key: resolved.get(values[0], "")}}
+    return {"success": True, "data": {result_key: resolved, "unresolved": missing}}
+
+
+JOB_POLL_INTERVAL = 0.25
+
+
+async def _send_progress(progress: float, total: Optional[float] = None) -> None:
+    """Report progress to the client if it asked for it with a progressToken."""
+    try:
+        ctx = app.request_context
+    except LookupError:
+        return
+    token = getattr(ctx.meta, "progressToken", None) if ctx.meta else None
+    if token is not None:
+        await ctx.session.send_progress_notification(token, progress, total or None)
+
+
+async def _wait_for_job(job_id: str, timeout: Optional[float] = None,
+                        cancel_on_abort: bool = True) -> dict:
+    """Poll an editor job until it leaves the running state or timeout passes.
+
+    Each poll is a short request, so a long job never runs into the HTTP
+    client timeout, and progress reaches the client as MCP progress
+    notifications. If the tool call is cancelled, so is the job, unless
+    cancel_on_abort is False. Returns the last /api/jobs/result response.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    try:
+        while True:
+            status = await call_godot_api("/api/jobs/status", {"job_id": job_id})
+            if not status.get("success"):
+                return status
+            data = status["data"]
+            await _send_progress(data.get("progress", 0), data.get("total"))
+            if data.get("state") != "running":
+                break
+            if deadline is not None and loop.time() >= deadline:
+                break
+            await asyncio.sleep(JOB_POLL_INTERVAL)
+    except asyncio.CancelledError:
+        if cancel_on_abort:
+            await call_godot_api("/api/jobs/cancel", {"job_id": job_id})
+        raise
+    return await call_godot_api("/api/jobs/result", {"job_id": job_id})
+
+
+async def _run_as_job(endpoint: str, arguments: dict) -> dict:
+    """Run an endpoint as an editor job and return the handler's own result,
+    as if it had been called directly."""
+    started = await call_godot_api("/api/jobs/start", {"route": endpoint, "params": arguments})
+    if not started.get("success"):
+        return started
+    finished = await _wait_for_job(started["data"]["job_id"])
+    if not finished.get("success"):
+        return finished
+    data = finished["data"]
+    if data.get("state") == "cancelled":
+        return {"success": False, "error": "Job was cancelled", "job": data}
+    return data.get("result") or {"success": False, "error": "Job finished without a result"}
+
+
+# ===== HEADLESS TEST RUNNER =====
+
+TEST_RUNNER_SCRIPT = "res://addons/godot_mcp_enhanced/test_runner.gd"
+TEST_RESULT_PREFIX = "MCP_TEST "
+TEST_START_PREFIX = "MCP_TEST_START "
+_TEST_METHOD_RE = re.compile(r"^func\s+(test_\w+)\s*\(", re.MULTILINE)
+
+
+def _discover_tests(root: str, test_dir: str, pattern: str) -> list[tuple[str, int]]:
+    """(res:// path, number of test_* methods) for every script under
+    test_dir whose file name matches pattern. Hidden directories are skipped."""
+    start = _resolve_in_project(test_dir)
+    found = []
+    for dirpath, dirnames, filenames in os.walk(start):
+        dirnames[:] = sorted(d for d in dirnames if not d.startswith("."))
+        for filename in sorted(filenames):
+            if not fnmatch.fnmatch(filename, pattern):
+                continue
+            full = os.path.join(dirpath, filename)
+            try:
+                with open(full, "r", encoding="utf-8") as f:
+                    count = len(_TEST_METHOD_RE.findall(f.read()))
+            except (OSError, UnicodeDecodeError):
+                continue
+            if count:
+                found.append(("res://" + os.path.relpath(full, root).replace(os.sep, "/"), count))
+    return found
+
+
+def _shard_tests(scripts: list[tuple[str, int]], workers: int) -> list[list[str]]:
+    """Split scripts into at most `workers` shards with similar test counts,
+    largest script first onto the lightest shard."""
+    shards: list[list[str]] = [[] for _ in range(min(workers, len(scripts)))]
+    loads = [0] * len(shards)
+    for path, count in sorted(scripts, key=lambda s: -s[1]):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(path)
+        loads[lightest] += count
+    return shards
+
+
+async def _run_test_shard(godot_exe: str, root: str, scripts: list[str], timeout: float) -> dict:
+    """Run one shard in a headless Godot and collect its results.
+
+    stderr is merged into stdout so script errors land between a test's
+    start marker and its result, and fail that test. A test that started
+    but never reported, and scripts that produced no result (crash,
+    timeout), are reported as failures.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    process = await asyncio.create_subprocess_exec(
+        godot_exe, "--headless", "--path", root, "--script", TEST_RUNNER_SCRIPT, "--", *scripts,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+    )
+    error = None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        stdout, _ = await process.communicate()
+        error = f"Timed out after {timeout:g}s"
+    except asyncio.CancelledError:
+        process.kill()
+        await process.wait()
+        raise
+
+    results = []
+    log = []
+    # The test between its start marker and its result, and the script
+    # errors it printed
+    running: Optional[dict] = None
+    script_errors: list[str] = []
+    for line in stdout.decode("utf-8", "replace").splitlines():
+        if line.startswith(TEST_START_PREFIX):
+            try:
+                running = json.loads(line[len(TEST_START_PREFIX):])
+            except ValueError:
+                running = None
+            script_errors = []
+            continue
+        if not line.startswith(TEST_RESULT_PREFIX):
+            log.append(line)
+            if running is not None and line.startswith("SCRIPT ERROR"):
+                script_errors.append(line)
+            continue
+        try:
+            entry = json.loads(line[len(TEST_RESULT_PREFIX):])
+        except ValueError:
+            continue
+        if script_errors and entry.get("passed"):
+            entry["passed"] = False
+            entry["error"] = "\n".join(script_errors)
+        running = None
+        script_errors = []
+        entry["msec"] = round(entry.pop("usec", 0) / 1000.0, 3)
+        results.append(entry)
+
+    if error is None and process.returncode not in (0, 1):
+        error = f"Godot exited with code {process.returncode}"
+    log_tail = log[-20:]
+    if running is not None:
+        results.append({"script": running.get("script"), "name": running.get("name"), "passed": False,
+                        "error": error or "\n".join(script_errors) or "Test started but reported no result",
+                        "msec": 0.0, "log": log_tail})
+    if error is not None:
+        reported = {r["script"] for r in results}
+        for path in scripts:
+            if path not in reported:
+                results.append({"script": path, "name": None, "passed": False,
+                                "error": error, "msec": 0.0, "log": log_tail})
+
+    return {"scripts": scripts, "results": results,
+            "wall_msec": round((loop.time() - started) * 1000.0, 1)}
+
+
+async def _run_tests(arguments: dict) -> dict:
+    """Discover test scripts, run them across a pool of headless Godot
+    processes, and merge the results with per-test timings."""
+    godot_exe = os.getenv("GODOT_EXECUTABLE")
+    if not godot_exe:
+        return {"success": False, "error": "GODOT_EXECUTABLE environment variable not set"}
+    root = _local_project_root()
+    if root is None:
+        return {"success": False, "error": "GODOT_PROJECT_PATH does not point at a Godot project"}
+
+    try:
+        scripts = _discover_tests(root, arguments.get("test_dir", "res://"), arguments.get("pattern", "test_*.gd"))
+    except ValueError as e:
+        return {"success": False, "error": str(e)}
+    if not scripts:
+        return {"success": False, "error": "No test scripts found"}
+
+    workers = int(arguments.get("workers") or os.cpu_count() or 1)
+    timeout = float(arguments.get("timeout", 300))
+    shards = _shard_tests(scripts, max(1, workers))
+
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    shard_runs = await asyncio.gather(*(_run_test_shard(godot_exe, root, shard, timeout) for shard in shards))
+
+    results = [r for run in shard_runs for r in run["results"]]
+    failed = [r for r in results if not r["passed"]]
+    slowest = sorted((r for r in results if r.get("name")), key=lambda r: -r["msec"])
+    summary = {
+        "success": True,
+        "all_passed": not failed,
+        "scripts": len(scripts),
+        "tests_run": sum(1 for r in results if r.get("name")),
+        "tests_passed": len(results) - len(failed),
+        "tests_failed": len(failed),
+        "workers": len(shards),
+        "wall_msec": round((loop.time() - started) * 1000.0, 1),
+        "shard_msec": [run["wall_msec"] for run in shard_runs],
+        "slowest": slowest[:int(arguments.get("slowest", 10))],
+        "failures": failed,
+    }
+    if arguments.get("include_results", False):
+        summary["results"] = results
+    return summary
+
+
+# ===== GODOT PROCESSES =====
+
+# Godot processes this server starts are kept in a pool, one per project and
+# mode, and reused by later launch_godot calls while they run. A headless
+# process's output is drained into a ring buffer, so a chatty editor never
+# blocks on a full pipe. A windowed one outlives this server, when nothing
+# would drain a pipe, so it writes to a log file of its own under the
+# project's .godot directory instead. With GODOT_MCP_WARM_EDITORS set, a headless editor is started at
+# server start for every target whose editor is not already up.
+WARM_EDITORS = os.getenv("GODOT_MCP_WARM_EDITORS", "").lower() in ("1", "true", "yes")
+GODOT_LOG_LINES = 500
+# Longer output lines are kept in pieces of this many bytes
+GODOT_LOG_LINE_BYTES = 4096
+READY_POLL_SECONDS = 0.1
+
+
+class _GodotProcess:
+    """One Godot process, its recent output, and when its plugin first answered."""
+
+    def __init__(self, root: str, editor: bool, headless: bool,
+                 process: asyncio.subprocess.Process, log_file: str = "") -> None:
+        self.root = root
+        self.editor = editor
+        self.headless = headless
+        self.process = process
+        # Where the output goes instead of the ring buffer, if anywhere
+        self.log_file = log_file
+        self.log: deque[str] = deque(maxlen=GODOT_LOG_LINES)
+        self.started_at = time.monotonic()
+        self.ready_after: Optional[float] = None
+        self._drains = [asyncio.create_task(self._drain(stream))
+                        for stream in (process.stdout, process.stderr) if stream is not None]
+
+    async def _drain(self, stream: asyncio.StreamReader) -> None:
+        # Read in chunks rather than readline(), which gives up on a line
+        # over the reader's limit and would leave the pipe to fill up
+        partial = b""
+        while True:
+            chunk = await stream.read(65536)
+            if not chunk:
+                if partial:
+                    self._append(partial)
+                return
+            *lines, partial = (partial + chunk).split(b"\n")
+            for line in lines:
+                self._append(line)
+            while len(partial) > GODOT_LOG_LINE_BYTES:
+                self._append(partial[:GODOT_LOG_LINE_BYTES])
+                partial = partial[GODOT_LOG_LINE_BYTES:]
+
+    def _append(self, line: bytes) -> None:
+        for start in range(0, max(len(line), 1), GODOT_LOG_LINE_BYTES):
+            self.log.append(line[start:start + GODOT_LOG_LINE_BYTES].decode("utf-8", "replace").rstrip())
+
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        """Poll the plugin until it answers, the process exits, or timeout
+        seconds pass. Only an editor serves the plugin."""
+        if self.ready_after is not None or not self.editor:
+            return self.ready_after is not None
+        target = _target_for_root(self.root)
+        if target is None:
+            config = _read_config(self.root)
+            target = _EditorTarget(os.path.basename(self.root), self.root,
+                                   f"http://{GODOT_HOST}:{int(config.get('GDAI_MCP_SERVER_PORT', GODOT_PORT))}",
+                                   str(config.get("GDAI_MCP_TOKEN", "")), _socket_path(self.root, config),
+                                   os.path.join(self.root, CONFIG_FILE))
+        deadline = time.monotonic() + timeout
+        try:
+            while self.alive():
+                # A heartbeat also picks up the token a first start generates
+                await target.heartbeat()
+                if target.healthy:
+                    self.ready_after = time.monotonic() - self.started_at
+                    return True
+                if time.monotonic() >= deadline:
+                    return False
+                await asyncio.sleep(READY_POLL_SECONDS)
+            return False
+        finally:
+            if target is not _target_for_root(self.root):
+                await target.aclose()
+
+    def describe(self, log_lines: int = 0) -> dict:
+        info = {
+            "pid": self.process.pid,
+            "project_path": self.root,
+            "editor": self.editor,
+            "headless": self.headless,
+            "running": self.alive(),
+            "exit_code": self.process.returncode,
+            "uptime_seconds": round(time.monotonic() - self.started_at, 1),
+            "ready_after_seconds": round(self.ready_after, 2) if self.ready_after is not None else None,
+        }
+        if self.log_file:
+            info["log_file"] = self.log_file
+        if log_lines > 0:
+            info["log"] = self.tail(log_lines)
+        return info
+
+    def tail(self, lines: int) -> list[str]:
+        """The last lines of output, from the ring buffer or the log file."""
+        if lines <= 0:
+            return []
+        if not self.log_file:
+            return list(self.log)[-lines:]
+        try:
+            with open(self.log_file, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(0, f.tell() - lines * 256))
+                data = f.read()
+        except OSError:
+            return []
+        return [line.rstrip() for line in data.decode("utf-8", "replace").splitlines()[-lines:]]
+
+    async def stop(self) -> None:
+        if self.alive():
+            self.process.terminate()
+            try:
+                await asyncio.wait_for(self.process.wait(), 5.0)
+            except asyncio.TimeoutError:
+                self.process.kill()
+                await self.process.wait()
+        await asyncio.gather(*self._drains, return_exceptions=True)
+
+
+class _GodotPool:
+    def __init__(self) -> None:
+        self._processes: dict[tuple[str, bool, bool], _GodotProcess] = {}
+        self._versions: dict[str, tuple[int, str]] = {}
+
+    async def launch(self, godot_exe: str, root: str, editor: bool, headless: bool) -> tuple[_GodotProcess, bool]:
+        """The running process for this project and mode, or a new one.
+        The flag says whether it was reused."""
+        root = os.path.realpath(root)
+        key = (root, editor, headless)
+        running = self._processes.get(key)
+        if running is not None and running.alive():
+            return running, True
+        other = self._processes.get((root, editor, not headless))
+        if editor and other is not None and other.alive():
+            if not other.headless:
+                # A windowed editor serves the plugin just as well
+                return other, True
+            # Only one editor can listen on the project's port
+            await other.stop()
+        args = [godot_exe]
+        if headless:
+            args.append("--headless")
+        if editor:
+            args.append("--editor")
+        args.extend(["--path", root])
+        # A windowed Godot on Windows gets its own console
+        creationflags = subprocess.CREATE_NEW_CONSOLE if os.name == "nt" and not headless else 0
+        if headless:
+            log_file = ""
+            output = asyncio.subprocess.PIPE
+        else:
+            log_file = os.path.join(root, ".godot", f"mcp_{'editor' if editor else 'game'}.log")
+            os.makedirs(os.path.dirname(log_file), exist_ok=True)
+            output = open(log_file, "wb")
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args, stdin=asyncio.subprocess.DEVNULL, stdout=output,
+                stderr=asyncio.subprocess.PIPE if headless else asyncio.subprocess.STDOUT,
+                creationflags=creationflags)
+        finally:
+            if not headless:
+                # The child has its own handle on the file
+                output.close()
+        self._processes[key] = _GodotProcess(root, editor, headless, process, log_file)
+        return self._processes[key], False
+
+    async def warm(self, godot_exe: str) -> None:
+        """Start a headless editor for every target not already answering,
+        and wait for them to come up."""
+        roots = [target.root for target in _editor_targets().values()
+                 if target.root and not await target.check_health()]
+        started = [(await self.launch(godot_exe, root, True, True))[0] for root in roots]
+        await asyncio.gather(*(process.wait_ready(120.0) for process in started))
+
+    def processes(self) -> list[_GodotProcess]:
+        return list(self._processes.values())
+
+    async def version(self, godot_exe: str) -> str:
+        """`godot --version`, run once per executable until the file changes."""
+        try:
+            mtime = os.stat(godot_exe).st_mtime_ns
+        except OSError:
+            mtime = 0
+        cached = self._versions.get(godot_exe)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        process = await asyncio.create_subprocess_exec(
+            godot_exe, "--version", stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.DEVNULL)
+        try:
+            stdout, _ = await asyncio.wait_for(process.communicate(), 5.0)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+            raise
+        version = stdout.decode("utf-8", "replace").strip()
+        self._versions[godot_exe] = (mtime, version)
+        return version
+
+    async def shutdown(self) -> None:
+        """Stop the headless processes. Windowed ones belong to the user
+        and keep running."""
+        await asyncio.gather(*(process.stop() for process in self._processes.values() if process.headless))
+
+
+_godot_pool = _GodotPool()
+
+
+def _target_for_root(root: str) -> Optional[_EditorTarget]:
+    root = os.path.realpath(root)
+    for target in _editor_targets().values():
+        if target.root and os.path.realpath(target.root) == root:
+            return target
+    return None
+
+
+# ===== TOOL HANDLERS =====
+# Tools served here rather than proxied to one editor route. Each takes its
+# table row and the call's arguments and returns the MCP contents.
+
+async def _uid_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    # Answered from disk first (works without Godot running)
+    return _make_response(await _convert_uids(spec.name, arguments))
+
+
+async def _screenshot_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent | ImageContent]:
+    result = await call_godot_api(spec.endpoint, arguments)
+    if result.get("success") and "data" in result:
+        screenshot_base64 = result["data"].get("screenshot", "")
+        if screenshot_base64:
+            return [
+                TextContent(type="text", text=f"Screenshot captured successfully"),
+                ImageContent(
+                    type="image",
+                    data=screenshot_base64,
+                    mimeType="image/png"
+                )
+            ]
+    return _make_response(result)
+
+
+async def _live_preview_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent | ImageContent]:
+    result = await call_godot_api(spec.endpoint, arguments)
+    if not (result.get("success") and "data" in result):
+        return _make_response(result)
+    data = result["data"]
+    screenshot = data.get("screenshot", "")
+
+    response = [
+        TextContent(
+            type="text",
+            text=json.dumps({
+                "scene_tree": data.get("scene_tree"),
+                "current_script": data.get("current_script")
+            }, indent=2)
+        )
+    ]
+
+    if screenshot:
+        response.append(ImageContent(
+            type="image",
+            data=screenshot,
+            mimeType="image/png"
+        ))
+
+    return response
+
+
+async def _reimport_assets_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    if arguments.get("async", False):
+        return await _proxy_tool(spec, arguments)
+    return _make_response(await _run_as_job(spec.endpoint, arguments))
+
+
+async def _as_job_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    # Lasts as long as its work does (an input timeline), so it is waited for as a job
+    return _make_response(await _run_as_job(spec.endpoint, arguments))
+
+
+async def _start_job_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    tool = arguments.get("tool", "")
+    job_spec = _TOOLS.get(tool)
+    if job_spec is None or job_spec.endpoint is None or job_spec.endpoint.startswith("/api/jobs/"):
+        return _make_response({"success": False, "error": f"Tool cannot run as a job: {tool}"})
+    return _make_response(await call_godot_api("/api/jobs/start", {
+        "route": job_spec.endpoint,
+        "params": arguments.get("arguments") or {},
+        "slice_msec": arguments.get("slice_ms", 0),
+    }))
+
+
+async def _job_result_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    job_id = arguments.get("job_id", "")
+    wait = float(arguments.get("wait_seconds", 0) or 0)
+    if wait > 0:
+        return _make_response(await _wait_for_job(job_id, timeout=wait, cancel_on_abort=False))
+    return _make_response(await call_godot_api("/api/jobs/result", {"job_id": job_id}))
+
+
+async def _cache_stats_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    data = _response_cache.stats()
+    data["lookups"] = _metrics.cache_lookups()
+    if arguments.get("clear", False):
+        _response_cache.clear()
+    return _make_response({"success": True, "data": data})
+
+
+async def _check_godot_running_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    target = _target()
+    responsive = await target.check_health()
+    return _make_response({
+        "success": True,
+        "running": bool(target.healthy),
+        "responsive": responsive
+    })
+
+
+async def _list_editors_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    targets = _editor_targets()
+    await asyncio.gather(*(target.check_health() for target in targets.values()))
+    return _make_response({
+        "success": True,
+        "default": _default_target().name,
+        "editors": [target.describe() for target in targets.values()]
+    })
+
+
+async def _fan_out_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _make_response(await _fan_out(arguments))
+
+
+async def _run_tests_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _make_response(await _run_tests(arguments))
+
+
+# Godot process management (doesn't need Godot running)
+async def _launch_godot_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    godot_exe = os.getenv("GODOT_EXECUTABLE")
+    if not godot_exe:
+        return _make_response({
+            "success": False,
+            "error": "GODOT_EXECUTABLE environment variable not set. Please set it to your Godot executable path."
+        })
+
+    project_path = arguments.get("project_path")
+    editor_mode = arguments.get("editor_mode", True)
+    headless = arguments.get("headless", False)
+    wait = float(arguments.get("wait_ready_seconds", 5) or 0)
+
+    try:
+        process, reused = await _godot_pool.launch(godot_exe, project_path, editor_mode, headless)
+    except Exception as e:
+        return _make_response({
+            "success": False,
+            "error": f"Failed to launch Godot: {str(e)}"
+        })
+
+    ready = await process.wait_ready(wait) if editor_mode and wait > 0 else process.ready_after is not None
+    result = {
+        "success": process.alive(),
+        "message": f"{'Reusing' if reused else 'Launched'} Godot with PID {process.process.pid}",
+        "pid": process.process.pid,
+        "reused": reused,
+        "ready": ready,
+    }
+    result.update(process.describe())
+    if not process.alive():
+        result["error"] = f"Godot exited with code {process.process.returncode}"
+        result["log"] = process.tail(20)
+    elif editor_mode and not ready:
+        result["note"] = "The MCP plugin is not answering yet; check list_godot_processes for its log"
+    return _make_response(result)
+
+
+async def _godot_version_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    godot_exe = os.getenv("GODOT_EXECUTABLE")
+    if not godot_exe:
+        return _make_response({
+            "success": False,
+            "error": "GODOT_EXECUTABLE environment variable not set"
+        })
+
+    try:
+        version = await _godot_pool.version(godot_exe)
+        return _make_response({
+            "success": True,
+            "version": version,
+            "executable": godot_exe
+        })
+    except Exception as e:
+        return _make_response({
+            "success": False,
+            "error": f"Failed to get Godot version: {str(e) or type(e).__name__}"
+        })
+
+
+async def _list_godot_processes_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    log_lines = int(arguments.get("log_lines", 20))
+    return _make_response({
+        "success": True,
+        "processes": [process.describe(log_lines) for process in _godot_pool.processes()]
+    })
+
+
+# Direct file system tools (work without Godot running)
+def _read_project_file(raw_path: str, what: str) -> list[TextContent]:
+    try:
+        path = _resolve_in_project(raw_path)
+    except ValueError as e:
+        return _make_response(dict(success=False, error=str(e)))
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            content = f.read()
+        return _make_response({"success": True, "path": path, "content": content})
+    except Exception as e:
+        return _make_response({"success": False, "error": f"Failed to read {what}: {str(e)}"})
+
+
+def _write_project_file(raw_path: str, content: str, what: str) -> list[TextContent]:
+    try:
+        path = _resolve_in_project(raw_path)
+    except ValueError as e:
+        return _make_response(dict(success=False, error=str(e)))
+
+    try:
+        os.makedirs(os.path.dirname(path) if os.path.dirname(path) else ".", exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        return _make_response({"success": True, "path": path, "message": f"{what.capitalize()} written successfully"})
+    except Exception as e:
+        return _make_response({"success": False, "error": f"Failed to write {what}: {str(e)}"})
+
+
+async def _read_scene_file_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _read_project_file(arguments.get("scene_path", ""), "scene file")
+
+
+async def _write_scene_file_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _write_project_file(arguments.get("scene_path", ""), arguments.get("content", ""), "scene file")
+
+
+async def _read_script_file_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _read_project_file(arguments.get("script_path", ""), "script file")
+
+
+async def _write_script_file_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    return _write_project_file(arguments.get("script_path", ""), arguments.get("content", ""), "script file")
+
+
+async def _read_project_settings_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    project_path = arguments.get("project_path", ".")
+    return _read_project_file(os.path.join(project_path, "project.godot"), "project settings")
+
+
+async def _update_project_settings_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    project_path = arguments.get("project_path", ".")
+    settings = arguments.get("settings", {})
+    try:
+        settings_file = _resolve_in_project(os.path.join(project_path, "project.godot"))
+    except ValueError as e:
+        return _make_response(dict(success=False, error=str(e)))
+
+    try:
+        with open(settings_file, 'r', encoding='utf-8') as f:
+            lines = f.readlines()
+
+        for key, value in settings.items():
+            found = False
+            for i, line in enumerate(lines):
+                if line.startswith(key):
+                    lines[i] = f'{key}="{value}"\n'
+                    found = True
+                    break
+            if not found:
+                lines.append(f'{key}="{value}"\n')
+
+        with open(settings_file, 'w', encoding='utf-8') as f:
+            f.writelines(lines)
+
+        return _make_response({"success": True, "message": "Project settings updated successfully"})
+    except Exception as e:
+        return _make_response({"success": False, "error": f"Failed to update project settings: {str(e)}"})
+
+
+async def _create_directory_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    try:
+        dir_path = _resolve_in_project(arguments.get("dir_path", ""))
+    except ValueError as e:
+        return _make_response(dict(success=False, error=str(e)))
+
+    try:
+        os.makedirs(dir_path, exist_ok=True)
+        return _make_response({"success": True, "path": dir_path, "message": "Directory created successfully"})
+    except Exception as e:
+        return _make_response({"success": False, "error": f"Failed to create directory: {str(e)}"})
+
+
+async def _list_directory_tool(spec: "_ToolSpec", arguments: dict) -> list[TextContent]:
+    recursive = arguments.get("recursive", False)
+    try:
+        dir_path = _resolve_in_project(arguments.get("dir_path", "."))
+    except ValueError as e:
+        return _make_response(dict(success=False, error=str(e)))
+
+    try:
+        if recursive:
+            files = []
+            for root, dirs, filenames in os.walk(dir_path):
+                for filename in filenames:
+                    files.append(os.path.join(root, filename))
+        else:
+            files = [os.path.join(dir_path, f) for f in os.listdir(dir_path)]
+
+        return _make_response({"success": True, "path": dir_path, "files": files, "count": len(files)})
+    except Exception as e:
+        return _make_response({"success": False, "error": f"Failed to list directory: {str(e)}"})
+
+
+# ===== TOOL DEFINITIONS =====
+
+class _ToolSpec:
+    """One row of the tool table.
+
+    endpoint is the editor route the tool is proxied to, and the route
+    start_job runs it on. handler, when set, serves the call instead.
+    targeted tools take the "target" argument that picks the editor.
+    """
+
+    __slots__ = ("name", "description", "schema", "endpoint", "handler", "targeted", "_tool")
+
+    def __init__(self, name: str, description: str, schema: dict, endpoint: Optional[str] = None,
+                 handler: Optional[Callable[["_ToolSpec", dict], Awaitable[list]]] = None,
+                 targeted: bool = True) -> None:
+        self.name = name
+        self.description = description
+        self.schema = schema
+        self.endpoint = endpoint
+        self.handler = handler
+        self.targeted = targeted
+        self._tool: Optional[Tool] = None
+
+    def tool(self) -> Tool:
+        """The MCP Tool, built on first use and reused after."""
+        if self._tool is None:
+            schema = self.schema
+            if self.targeted:
+                # Every tool can address any of the editors
+                schema = dict(schema, properties=dict(schema.get("properties", {}), target=_TARGET_PROPERTY))
+            self._tool = Tool(name=self.name, description=self.description, inputSchema=schema)
+        return self._tool
+
+
+_TOOL_SPECS = [
+    # Project Tools
+    _ToolSpec(
+        name="get_project_info",
+        endpoint="/api/project/info",
+        description="Get information about the Godot project including name, version, and settings",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_filesystem_tree",
+        endpoint="/api/project/filesystem",
+        description="Get a recursive tree view of all files and directories in the project",
+        schema={
+            "type": "object",
+            "properties": {
+                "filters": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "File extensions to filter (e.g., ['.gd', '.tscn'])"
+                }
+            }
+        }
+    ),
+    _ToolSpec(
+        name="search_files",
+        endpoint="/api/project/search_files",
+        description="Search for files in the project using fuzzy matching",
+        schema={
+            "type": "object",
+            "properties": {
+                "query": {
+                    "type": "string",
+                    "description": "Search query string"
+                }
+            },
+            "required": ["query"]
+        }
+    ),
+    _ToolSpec(
+        name="uid_to_project_path",
+        endpoint="/api/project/uid_to_path",
+        handler=_uid_tool,
+        description="Convert a Godot UID (uid://) to a project path (res://)",
+        schema={
+            "type": "object",
+            "properties": {
+                "uid": {
+                    "type": "string",
+                    "description": "UID string (e.g., 'uid://abc123')"
+                }
+            },
+            "required": ["uid"]
+        }
+    ),
+    _ToolSpec(
+        name="project_path_to_uid",
+        endpoint="/api/project/path_to_uid",
+        handler=_uid_tool,
+        description="Convert a project path (res://) to a Godot UID",
+        schema={
+            "type": "object",
+            "properties": {
+                "path": {
+                    "type": "string",
+                    "description": "Project path (e.g., 'res://scenes/main.tscn')"
+                }
+            },
+            "required": ["path"]
+        }
+    ),
+    _ToolSpec(
+        name="uids_to_project_paths",
+        endpoint="/api/project/uids_to_paths",
+        handler=_uid_tool,
+        description="Convert many Godot UIDs (uid://) to project paths (res://) in one call. Answered from the project files on disk where possible; unresolvable UIDs are listed under 'unresolved'",
+        schema={
+            "type": "object",
+            "properties": {
+                "uids": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "UID strings (e.g., ['uid://abc123', 'uid://def456'])"
+                }
+            },
+            "required": ["uids"]
+        }
+    ),
+    _ToolSpec(
+        name="project_paths_to_uids",
+        endpoint="/api/project/paths_to_uids",
+        handler=_uid_tool,
+        description="Convert many project paths (res://) to Godot UIDs in one call. Answered from the project files on disk where possible; paths without a UID are listed under 'unresolved'",
+        schema={
+            "type": "object",
+            "properties": {
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Project paths (e.g., ['res://scenes/main.tscn'])"
+                }
+            },
+            "required": ["paths"]
+        }
+    ),
+    _ToolSpec(
+        name="get_quick_project_overview",
+        endpoint="/api/project/quick_overview",
+        description="Get a quick overview of the project structure including scenes, scripts, and resources with counts and types",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="analyze_project_dependencies",
+        endpoint="/api/project/analyze_dependencies",
+        description="Analyze project dependencies including autoloads, plugins, and export presets",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Scene Tools
+    _ToolSpec(
+        name="get_scene_tree",
+        endpoint="/api/scene/tree",
+        description="Get a recursive tree view of all nodes in the current scene with properties. The response carries a version to pass to get_scene_tree_delta later. Pass properties to choose exactly what each node reports, and format \"columnar\" for large scenes",
+        schema={
+            "type": "object",
+            "properties": {
+                "properties": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Properties to report per node, typed like get_properties (default: visible plus transform or anchors). Nodes report only the ones their class or script has. An empty list reports structure only"
+                },
+                "format": {
+                    "type": "string",
+                    "enum": ["tree", "columnar"],
+                    "description": "tree (default): nested nodes. columnar: parallel arrays names/types/parents/scripts in pre-order, parents being indexes (-1 for the root), plus one array per requested property"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_scene_tree_delta",
+        endpoint="/api/scene/tree_delta",
+        description="Get only what changed in the edited scene since a version from get_scene_tree or an earlier delta: added, removed, renamed and changed nodes, plus the new version. Returns a full tree (full: true) instead when the change journal no longer reaches back that far or the edited scene was switched",
+        schema={
+            "type": "object",
+            "properties": {
+                "since_version": {
+                    "type": "integer",
+                    "description": "Version the client last saw"
+                }
+            },
+            "required": ["since_version"]
+        }
+    ),
+    _ToolSpec(
+        name="find_nodes",
+        endpoint="/api/scene/find_nodes",
+        description="Find nodes in the edited scene by type (subclasses included), group, name glob and/or attached script, without reading the whole tree. Filters combine with AND. Each match has its absolute path and a node_path relative to the scene root for other node tools",
+        schema={
+            "type": "object",
+            "properties": {
+                "type": {
+                    "type": "string",
+                    "description": "Engine class, e.g. CollisionShape2D"
+                },
+                "group": {
+                    "type": "string",
+                    "description": "Group name"
+                },
+                "name_glob": {
+                    "type": "string",
+                    "description": "Node name pattern with * and ? wildcards"
+                },
+                "script": {
+                    "type": "string",
+                    "description": "res:// path of the attached script"
+                },
+                "limit": {
+                    "type": "integer",
+                    "description": "Maximum number of nodes to return (default: 100); count reports the full number of matches"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_scene_file_content",
+        endpoint="/api/scene/file_content",
+        description="Get the raw content of the current scene file",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="create_scene",
+        endpoint="/api/scene/create",
+        description="Create a new scene with a specified root node type",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path where scene will be saved (relative to res://)"
+                },
+                "root_type": {
+                    "type": "string",
+                    "description": "Type of root node (e.g., 'Node2D', 'Node3D', 'Control')",
+                    "default": "Node2D"
+                }
+            },
+            "required": ["scene_path"]
+        }
+    ),
+    _ToolSpec(
+        name="open_scene",
+        endpoint="/api/scene/open",
+        description="Open a scene in the Godot editor",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path to the scene file"
+                }
+            },
+            "required": ["scene_path"]
+        }
+    ),
+    _ToolSpec(
+        name="delete_scene",
+        endpoint="/api/scene/delete",
+        description="Delete a scene file from the project",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path to the scene file to delete"
+                }
+            },
+            "required": ["scene_path"]
+        }
+    ),
+    _ToolSpec(
+        name="add_scene",
+        endpoint="/api/scene/add_scene",
+        description="Add a scene as a child node to the current scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path to the scene to add"
+                },
+                "parent_node": {
+                    "type": "string",
+                    "description": "Path to parent node (leave empty for root)"
+                }
+            },
+            "required": ["scene_path"]
+        }
+    ),
+    _ToolSpec(
+        name="play_scene",
+        endpoint="/api/scene/play",
+        description="Play the current scene or a specific scene in Godot",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Optional: specific scene to play (empty for current)"
+                }
+            }
+        }
+    ),
+    _ToolSpec(
+        name="stop_running_scene",
+        endpoint="/api/scene/stop",
+        description="Stop the currently running scene in Godot",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Node Tools
+    _ToolSpec(
+        name="add_node",
+        endpoint="/api/node/add",
+        description="Add a new node to the current scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_type": {
+                    "type": "string",
+                    "description": "Type of node to add (e.g., 'Sprite2D', 'RigidBody2D')"
+                },
+                "node_name": {
+                    "type": "string",
+                    "description": "Name for the new node"
+                },
+                "parent_node_path": {
+                    "type": "string",
+                    "description": "Path to parent node (empty for root)"
+                },
+                "properties": {
+                    "type": "object",
+                    "description": "Properties to set on the node"
+                }
+            },
+            "required": ["node_type", "node_name"]
+        }
+    ),
+    _ToolSpec(
+        name="delete_node",
+        endpoint="/api/node/delete",
+        description="Delete a node from the current scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node to delete"
+                }
+            },
+            "required": ["node_path"]
+        }
+    ),
+    _ToolSpec(
+        name="duplicate_node",
+        endpoint="/api/node/duplicate",
+        description="Duplicate an existing node in the scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node to duplicate"
+                }
+            },
+            "required": ["node_path"]
+        }
+    ),
+    _ToolSpec(
+        name="move_node",
+        endpoint="/api/node/move",
+        description="Move a node to a different parent in the scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node to move"
+                },
+                "new_parent_path": {
+                    "type": "string",
+                    "description": "Path to the new parent node"
+                }
+            },
+            "required": ["node_path", "new_parent_path"]
+        }
+    ),
+    _ToolSpec(
+        name="update_property",
+        endpoint="/api/node/update_property",
+        description="Update a property of a node in the scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node"
+                },
+                "property": {
+                    "type": "string",
+                    "description": "Property name to update"
+                },
+                "value": {
+                    "description": "New value for the property"
+                }
+            },
+            "required": ["node_path", "property", "value"]
+        }
+    ),
+    _ToolSpec(
+        name="get_properties",
+        endpoint="/api/node/get_properties",
+        description="Read properties of several nodes in one call. JSON-native values come back as-is; other types (Vector2, Color, Transform3D, ...) as {\"type\": ..., \"var\": ...} where var is Godot's var_to_str text, and resources as {\"type\": \"Resource\", \"path\": ...}",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Paths of the nodes to read"
+                },
+                "property_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Properties to read from each node (default: every property the inspector shows)"
+                }
+            },
+            "required": ["node_paths"]
+        }
+    ),
+    _ToolSpec(
+        name="set_properties",
+        endpoint="/api/node/set_properties",
+        description="Set several node properties as one undoable editor action. Values use the same encoding get_properties returns; var_to_str text such as \"Vector2(1, 2)\" is also accepted for non-string properties. All changes are validated first and none are applied if any is invalid",
+        schema={
+            "type": "object",
+            "properties": {
+                "changes": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "node_path": {"type": "string"},
+                            "property": {"type": "string"},
+                            "value": {}
+                        },
+                        "required": ["node_path", "property", "value"]
+                    },
+                    "description": "Changes to apply"
+                }
+            },
+            "required": ["changes"]
+        }
+    ),
+    _ToolSpec(
+        name="apply_scene_patch",
+        endpoint="/api/scene/apply_patch",
+        description="Make the edited scene match a tree-shaped spec in one call and one undo step. Only what differs is changed, so re-applying the same patch is a no-op; nodes the spec does not mention are left alone. Returns the paths of created nodes. Prefer this over chains of add_node/update_property/set_anchor_preset/add_resource when building or adjusting several nodes",
+        schema={
+            "type": "object",
+            "properties": {
+                "spec": {
+                    "type": "object",
+                    "description": "Spec for the target node: {\"type\"?, \"properties\"?: {name: value}, \"resources\"?: {property: {\"type\": \"RectangleShape2D\", \"properties\": {...}}}, \"anchor_preset\"?: \"full_rect\", \"children\"?: [child specs with a required \"name\", and \"type\" when the child does not exist yet]}. Values use the get_properties encoding"
+                },
+                "node_path": {
+                    "type": "string",
+                    "description": "Node the spec describes (default: scene root)"
+                }
+            },
+            "required": ["spec"]
+        }
+    ),
+    _ToolSpec(
+        name="add_resource",
+        endpoint="/api/node/add_resource",
+        description="Add a resource to a node property (e.g., Shape to CollisionShape)",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node"
+                },
+                "resource_type": {
+                    "type": "string",
+                    "description": "Type of resource (e.g., 'RectangleShape2D')"
+                },
+                "property": {
+                    "type": "string",
+                    "description": "Property to assign resource to"
+                },
+                "resource_properties": {
+                    "type": "object",
+                    "description": "Properties to set on the resource"
+                }
+            },
+            "required": ["node_path", "resource_type", "property"]
+        }
+    ),
+    _ToolSpec(
+        name="set_anchor_preset",
+        endpoint="/api/node/set_anchor_preset",
+        description="Set anchor preset for a Control node",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the Control node"
+                },
+                "preset": {
+                    "type": "string",
+                    "description": "Preset name (e.g., 'center', 'full_rect', 'top_left')"
+                }
+            },
+            "required": ["node_path", "preset"]
+        }
+    ),
+    _ToolSpec(
+        name="set_anchor_values",
+        endpoint="/api/node/set_anchor_values",
+        description="Set precise anchor values for a Control node",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the Control node"
+                },
+                "anchor_left": {"type": "number"},
+                "anchor_top": {"type": "number"},
+                "anchor_right": {"type": "number"},
+                "anchor_bottom": {"type": "number"}
+            },
+            "required": ["node_path"]
+        }
+    ),
+    
+    # Script Tools
+    _ToolSpec(
+        name="get_open_scripts",
+        endpoint="/api/script/get_open_scripts",
+        description="Get a list of all scripts open in the editor with their contents",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="view_script",
+        endpoint="/api/script/view",
+        description="View and activate a script in the editor",
+        schema={
+            "type": "object",
+            "properties": {
+                "script_path": {
+                    "type": "string",
+                    "description": "Path to the script file"
+                }
+            },
+            "required": ["script_path"]
+        }
+    ),
+    _ToolSpec(
+        name="create_script",
+        endpoint="/api/script/create",
+        description="Create a new GDScript file",
+        schema={
+            "type": "object",
+            "properties": {
+                "script_path": {
+                    "type": "string",
+                    "description": "Path where script will be saved"
                 },
-                "required": ["node_path"]
-            }
-        ),
-        Tool(
-            name="duplicate_node",
-            description="Duplicate an existing node in the scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node to duplicate"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Script content"
                 },
-                "required": ["node_path"]
-            }
-        ),
-        Tool(
-            name="move_node",
-            description="Move a node to a different parent in the scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node to move"
-                    },
-                    "new_parent_path": {
-                        "type": "string",
-                        "description": "Path to the new parent node"
-                    }
+                "base_type": {
+                    "type": "string",
+                    "description": "Base class (e.g., 'Node', 'CharacterBody2D')",
+                    "default": "Node"
+                }
+            },
+            "required": ["script_path"]
+        }
+    ),
+    _ToolSpec(
+        name="attach_script",
+        endpoint="/api/script/attach",
+        description="Attach a script to a node in the scene",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node"
                 },
-                "required": ["node_path", "new_parent_path"]
-            }
-        ),
-        Tool(
-            name="update_property",
-            description="Update a property of a node in the scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node"
-                    },
-                    "property": {
-                        "type": "string",
-                        "description": "Property name to update"
-                    },
-                    "value": {
-                        "description": "New value for the property"
-                    }
+                "script_path": {
+                    "type": "string",
+                    "description": "Path to the script file"
+                }
+            },
+            "required": ["node_path", "script_path"]
+        }
+    ),
+    _ToolSpec(
+        name="edit_file",
+        endpoint="/api/script/edit_file",
+        description="Edit a file using find and replace",
+        schema={
+            "type": "object",
+            "properties": {
+                "file_path": {
+                    "type": "string",
+                    "description": "Path to the file"
                 },
-                "required": ["node_path", "property", "value"]
-            }
-        ),
-        Tool(
-            name="add_resource",
-            description="Add a resource to a node property (e.g., Shape to CollisionShape)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node"
-                    },
-                    "resource_type": {
-                        "type": "string",
-                        "description": "Type of resource (e.g., 'RectangleShape2D')"
-                    },
-                    "property": {
-                        "type": "string",
-                        "description": "Property to assign resource to"
-                    },
-                    "resource_properties": {
-                        "type": "object",
-                        "description": "Properties to set on the resource"
-                    }
+                "find": {
+                    "type": "string",
+                    "description": "Text to find"
                 },
-                "required": ["node_path", "resource_type", "property"]
-            }
-        ),
-        Tool(
-            name="set_anchor_preset",
-            description="Set anchor preset for a Control node",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the Control node"
-                    },
-                    "preset": {
-                        "type": "string",
-                        "description": "Preset name (e.g., 'center', 'full_rect', 'top_left')"
-                    }
+                "replace": {
+                    "type": "string",
+                    "description": "Text to replace with"
                 },
-                "required": ["node_path", "preset"]
-            }
-        ),
-        Tool(
-            name="set_anchor_values",
-            description="Set precise anchor values for a Control node",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the Control node"
-                    },
-                    "anchor_left": {"type": "number"},
-                    "anchor_top": {"type": "number"},
-                    "anchor_right": {"type": "number"},
-                    "anchor_bottom": {"type": "number"}
+                "regex": {
+                    "type": "boolean",
+                    "description": "Use regex for find/replace"
+                }
+            },
+            "required": ["file_path", "find", "replace"]
+        }
+    ),
+    
+    # Editor Tools
+    _ToolSpec(
+        name="get_godot_errors",
+        endpoint="/api/editor/errors",
+        description="Get all errors from Godot including script errors, runtime errors, and logs",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_editor_screenshot",
+        endpoint="/api/editor/screenshot",
+        handler=_screenshot_tool,
+        description="Capture a screenshot of the Godot editor window (returns base64-encoded PNG)",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_running_scene_screenshot",
+        endpoint="/api/editor/running_scene_screenshot",
+        handler=_screenshot_tool,
+        description="Capture a screenshot of the running game window (returns base64-encoded PNG)",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="execute_editor_script",
+        endpoint="/api/editor/execute_script",
+        description="Execute arbitrary GDScript code in the editor context",
+        schema={
+            "type": "object",
+            "properties": {
+                "code": {
+                    "type": "string",
+                    "description": "GDScript code to execute"
+                }
+            },
+            "required": ["code"]
+        }
+    ),
+    _ToolSpec(
+        name="clear_output_logs",
+        endpoint="/api/editor/clear_logs",
+        description="Clear the output logs in the Godot editor",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Editor Context Tools
+    _ToolSpec(
+        name="get_editor_context",
+        endpoint="/api/context/summary",
+        description="Get a summary of the current editor state: open scene, open scripts, recent errors, project structure",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_live_preview",
+        endpoint="/api/context/live_preview",
+        handler=_live_preview_tool,
+        description="Get a live snapshot: editor screenshot, compact scene tree, and the active script",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Asset Tools (Godot 4.x import pipeline)
+    _ToolSpec(
+        name="reimport_assets",
+        endpoint="/api/asset/reimport",
+        handler=_reimport_assets_tool,
+        description="Reimport specific assets through the editor import pipeline. Use after changing source files (textures, audio, models) outside the editor.",
+        schema={
+            "type": "object",
+            "properties": {
+                "paths": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "res:// paths of the assets to reimport"
                 },
-                "required": ["node_path"]
-            }
-        ),
-        
-        # Script Tools
-        Tool(
-            name="get_open_scripts",
-            description="Get a list of all scripts open in the editor with their contents",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="view_script",
-            description="View and activate a script in the editor",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path to the script file"
-                    }
+                "async": {
+                    "type": "boolean",
+                    "description": "Return a job_id immediately instead of waiting; poll it with get_reimport_status or job_status",
+                    "default": False
                 },
-                "required": ["script_path"]
-            }
-        ),
-        Tool(
-            name="create_script",
-            description="Create a new GDScript file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path where script will be saved"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Script content"
-                    },
-                    "base_type": {
-                        "type": "string",
-                        "description": "Base class (e.g., 'Node', 'CharacterBody2D')",
-                        "default": "Node"
-                    }
+                "batch_bytes": {
+                    "type": "integer",
+                    "description": "Optional cap on source bytes reimported per editor frame (default 32 MiB)"
+                }
+            },
+            "required": ["paths"]
+        }
+    ),
+    _ToolSpec(
+        name="get_reimport_status",
+        endpoint="/api/jobs/status",
+        description="Get progress of a reimport job started with reimport_assets(async=true): overall state plus per-file status and timing",
+        schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by reimport_assets"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    _ToolSpec(
+        name="cancel_reimport",
+        endpoint="/api/jobs/cancel",
+        description="Cancel a running reimport job. Files already imported stay imported; the rest are skipped",
+        schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by reimport_assets"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    _ToolSpec(
+        name="get_import_info",
+        endpoint="/api/asset/import_info",
+        description="Read an asset .import sidecar: importer type, resource type, UID, and import parameters",
+        schema={
+            "type": "object",
+            "properties": {
+                "asset_path": {
+                    "type": "string",
+                    "description": "res:// path of the imported asset"
+                }
+            },
+            "required": ["asset_path"]
+        }
+    ),
+    
+    # Background Job Tools
+    _ToolSpec(
+        name="start_job",
+        handler=_start_job_tool,
+        description="Start a slow tool (e.g. analyze_project_dependencies, run_test_script, reimport_assets, get_filesystem_tree) as a background job in the editor. Returns a job_id at once; the work is spread across editor frames so the editor stays responsive",
+        schema={
+            "type": "object",
+            "properties": {
+                "tool": {
+                    "type": "string",
+                    "description": "Name of the tool to run"
                 },
-                "required": ["script_path"]
-            }
-        ),
-        Tool(
-            name="attach_script",
-            description="Attach a script to a node in the scene",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node"
-                    },
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path to the script file"
-                    }
+                "arguments": {
+                    "type": "object",
+                    "description": "Arguments for that tool"
                 },
-                "required": ["node_path", "script_path"]
-            }
-        ),
-        Tool(
-            name="edit_file",
-            description="Edit a file using find and replace",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "file_path": {
-                        "type": "string",
-                        "description": "Path to the file"
-                    },
-                    "find": {
-                        "type": "string",
-                        "description": "Text to find"
-                    },
-                    "replace": {
-                        "type": "string",
-                        "description": "Text to replace with"
-                    },
-                    "regex": {
-                        "type": "boolean",
-                        "description": "Use regex for find/replace"
-                    }
+                "slice_ms": {
+                    "type": "number",
+                    "description": "Editor time the job may use per frame, in milliseconds (default 8)"
+                }
+            },
+            "required": ["tool"]
+        }
+    ),
+    _ToolSpec(
+        name="job_status",
+        endpoint="/api/jobs/status",
+        description="Get the state (running, completed, failed, cancelled), progress, and partial results of a background job",
+        schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by start_job"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    _ToolSpec(
+        name="job_result",
+        handler=_job_result_tool,
+        description="Get the final result of a background job, optionally waiting for it to finish",
+        schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by start_job"
                 },
-                "required": ["file_path", "find", "replace"]
-            }
-        ),
-        
-        # Editor Tools
-        Tool(
-            name="get_godot_errors",
-            description="Get all errors from Godot including script errors, runtime errors, and logs",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_editor_screenshot",
-            description="Capture a screenshot of the Godot editor window (returns base64-encoded PNG)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_running_scene_screenshot",
-            description="Capture a screenshot of the running game window (returns base64-encoded PNG)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="execute_editor_script",
-            description="Execute arbitrary GDScript code in the editor context",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "code": {
-                        "type": "string",
-                        "description": "GDScript code to execute"
-                    }
+                "wait_seconds": {
+                    "type": "number",
+                    "description": "Wait up to this long for the job to finish (default 0: return immediately)",
+                    "default": 0
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    _ToolSpec(
+        name="cancel_job",
+        endpoint="/api/jobs/cancel",
+        description="Cancel a running background job. It stops at its next yield point",
+        schema={
+            "type": "object",
+            "properties": {
+                "job_id": {
+                    "type": "string",
+                    "description": "Job id returned by start_job"
+                }
+            },
+            "required": ["job_id"]
+        }
+    ),
+    
+    # Godot Process Management Tools
+    _ToolSpec(
+        name="check_godot_running",
+        handler=_check_godot_running_tool,
+        description="Check if Godot editor is currently running and responsive",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="launch_godot",
+        handler=_launch_godot_tool,
+        description="Launch Godot editor with the current project, or reuse the one this server already launched, and wait until its MCP plugin answers. Requires GODOT_EXECUTABLE environment variable to be set.",
+        schema={
+            "type": "object",
+            "properties": {
+                "project_path": {
+                    "type": "string",
+                    "description": "Path to the Godot project directory (containing project.godot)"
                 },
-                "required": ["code"]
-            }
-        ),
-        Tool(
-            name="clear_output_logs",
-            description="Clear the output logs in the Godot editor",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        
-        # Editor Context Tools
-        Tool(
-            name="get_editor_context",
-            description="Get a summary of the current editor state: open scene, open scripts, recent errors, project structure",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_live_preview",
-            description="Get a live snapshot: editor screenshot, compact scene tree, and the active script",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        
-        # Asset Tools (Godot 4.x import pipeline)
-        Tool(
-            name="reimport_assets",
-            description="Reimport specific assets through the editor import pipeline. Use after changing source files (textures, audio, models) outside the editor.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "paths": {
-                        "type": "array",
-                        "items": {"type": "string"},
-                        "description": "res:// paths of the assets to reimport"
-                    }
+                "editor_mode": {
+                    "type": "boolean",
+                    "description": "Launch in editor mode (true) or run the project (false)",
+                    "default": True
                 },
-                "required": ["paths"]
-            }
-        ),
-        Tool(
-            name="get_import_info",
-            description="Read an asset .import sidecar: importer type, resource type, UID, and import parameters",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_path": {
-                        "type": "string",
-                        "description": "res:// path of the imported asset"
-                    }
+                "headless": {
+                    "type": "boolean",
+                    "description": "Run without a window; stopped when this server exits",
+                    "default": False
                 },
-                "required": ["asset_path"]
-            }
-        ),
-        
-        # Godot Process Management Tools
-        Tool(
-            name="check_godot_running",
-            description="Check if Godot editor is currently running and responsive",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="launch_godot",
-            description="Launch Godot editor with the current project. Requires GODOT_EXECUTABLE environment variable to be set.",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {
-                        "type": "string",
-                        "description": "Path to the Godot project directory (containing project.godot)"
-                    },
-                    "editor_mode": {
-                        "type": "boolean",
-                        "description": "Launch in editor mode (true) or run the project (false)",
-                        "default": True
-                    }
+                "wait_ready_seconds": {
+                    "type": "number",
+                    "description": "In editor mode, the call blocks up to this long for the MCP plugin to answer (0 returns at once). If it is not up yet, the result says ready: false; check again with check_godot_running or list_godot_processes",
+                    "default": 5
+                }
+            },
+            "required": ["project_path"]
+        }
+    ),
+    _ToolSpec(
+        name="list_godot_processes",
+        handler=_list_godot_processes_tool,
+        targeted=False,
+        description="List the Godot processes this server launched: PID, mode, whether running, how long the plugin took to answer, and the last lines of their output",
+        schema={
+            "type": "object",
+            "properties": {
+                "log_lines": {
+                    "type": "integer",
+                    "description": "Output lines to include per process",
+                    "default": 20
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_godot_version",
+        handler=_godot_version_tool,
+        description="Get the version of Godot that is configured or running",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Direct File System Tools (work without Godot running)
+    _ToolSpec(
+        name="read_scene_file",
+        handler=_read_scene_file_tool,
+        description="Read and parse a .tscn scene file directly from the file system",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path to the scene file (res:// or absolute path)"
+                }
+            },
+            "required": ["scene_path"]
+        }
+    ),
+    _ToolSpec(
+        name="write_scene_file",
+        handler=_write_scene_file_tool,
+        description="Write a .tscn scene file directly to the file system",
+        schema={
+            "type": "object",
+            "properties": {
+                "scene_path": {
+                    "type": "string",
+                    "description": "Path where the scene file will be saved"
                 },
-                "required": ["project_path"]
-            }
-        ),
-        Tool(
-            name="get_godot_version",
-            description="Get the version of Godot that is configured or running",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        
-        # Direct File System Tools (work without Godot running)
-        Tool(
-            name="read_scene_file",
-            description="Read and parse a .tscn scene file directly from the file system",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path to the scene file (res:// or absolute path)"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Complete .tscn file content"
+                }
+            },
+            "required": ["scene_path", "content"]
+        }
+    ),
+    _ToolSpec(
+        name="read_script_file",
+        handler=_read_script_file_tool,
+        description="Read a .gd script file directly from the file system",
+        schema={
+            "type": "object",
+            "properties": {
+                "script_path": {
+                    "type": "string",
+                    "description": "Path to the script file"
+                }
+            },
+            "required": ["script_path"]
+        }
+    ),
+    _ToolSpec(
+        name="write_script_file",
+        handler=_write_script_file_tool,
+        description="Write a .gd script file directly to the file system",
+        schema={
+            "type": "object",
+            "properties": {
+                "script_path": {
+                    "type": "string",
+                    "description": "Path where the script file will be saved"
                 },
-                "required": ["scene_path"]
-            }
-        ),
-        Tool(
-            name="write_scene_file",
-            description="Write a .tscn scene file directly to the file system",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "scene_path": {
-                        "type": "string",
-                        "description": "Path where the scene file will be saved"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Complete .tscn file content"
-                    }
+                "content": {
+                    "type": "string",
+                    "description": "Complete script content"
+                }
+            },
+            "required": ["script_path", "content"]
+        }
+    ),
+    _ToolSpec(
+        name="read_project_settings",
+        handler=_read_project_settings_tool,
+        description="Read project.godot settings file",
+        schema={
+            "type": "object",
+            "properties": {
+                "project_path": {
+                    "type": "string",
+                    "description": "Path to the project directory"
+                }
+            },
+            "required": ["project_path"]
+        }
+    ),
+    _ToolSpec(
+        name="update_project_settings",
+        handler=_update_project_settings_tool,
+        description="Update specific settings in project.godot file",
+        schema={
+            "type": "object",
+            "properties": {
+                "project_path": {
+                    "type": "string",
+                    "description": "Path to the project directory"
                 },
-                "required": ["scene_path", "content"]
-            }
-        ),
-        Tool(
-            name="read_script_file",
-            description="Read a .gd script file directly from the file system",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path to the script file"
-                    }
+                "settings": {
+                    "type": "object",
+                    "description": "Settings to update (e.g., {'application/config/name': 'My Game'})"
+                }
+            },
+            "required": ["project_path", "settings"]
+        }
+    ),
+    _ToolSpec(
+        name="create_directory",
+        handler=_create_directory_tool,
+        description="Create a directory in the project",
+        schema={
+            "type": "object",
+            "properties": {
+                "dir_path": {
+                    "type": "string",
+                    "description": "Path to the directory to create"
+                }
+            },
+            "required": ["dir_path"]
+        }
+    ),
+    _ToolSpec(
+        name="list_directory",
+        handler=_list_directory_tool,
+        description="List contents of a directory",
+        schema={
+            "type": "object",
+            "properties": {
+                "dir_path": {
+                    "type": "string",
+                    "description": "Path to the directory"
                 },
-                "required": ["script_path"]
-            }
-        ),
-        Tool(
-            name="write_script_file",
-            description="Write a .gd script file directly to the file system",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path where the script file will be saved"
-                    },
-                    "content": {
-                        "type": "string",
-                        "description": "Complete script content"
-                    }
+                "recursive": {
+                    "type": "boolean",
+                    "description": "List recursively",
+                    "default": False
+                }
+            },
+            "required": ["dir_path"]
+        }
+    ),
+    
+    # Runtime Operations Tools
+    _ToolSpec(
+        name="simulate_key_press",
+        endpoint="/api/runtime/simulate_key",
+        description="Simulate keyboard key press for testing gameplay",
+        schema={
+            "type": "object",
+            "properties": {
+                "keycode": {
+                    "type": "integer",
+                    "description": "Key code to simulate (e.g., 32 for Space, 87 for W)"
                 },
-                "required": ["script_path", "content"]
-            }
-        ),
-        Tool(
-            name="read_project_settings",
-            description="Read project.godot settings file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {
-                        "type": "string",
-                        "description": "Path to the project directory"
-                    }
+                "pressed": {
+                    "type": "boolean",
+                    "description": "Whether key is pressed (true) or released (false)",
+                    "default": True
+                }
+            },
+            "required": ["keycode"]
+        }
+    ),
+    _ToolSpec(
+        name="simulate_action",
+        endpoint="/api/runtime/simulate_action",
+        description="Simulate input action (like jump, move_left, etc.) for testing",
+        schema={
+            "type": "object",
+            "properties": {
+                "action_name": {
+                    "type": "string",
+                    "description": "Name of the input action (e.g., 'ui_accept', 'jump', 'move_left')"
                 },
-                "required": ["project_path"]
-            }
-        ),
-        Tool(
-            name="update_project_settings",
-            description="Update specific settings in project.godot file",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "project_path": {
-                        "type": "string",
-                        "description": "Path to the project directory"
-                    },
-                    "settings": {
-                        "type": "object",
-                        "description": "Settings to update (e.g., {'application/config/name': 'My Game'})"
-                    }
+                "pressed": {
+                    "type": "boolean",
+                    "description": "Whether action is pressed or released",
+                    "default": True
                 },
-                "required": ["project_path", "settings"]
-            }
-        ),
-        Tool(
-            name="create_directory",
-            description="Create a directory in the project",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "dir_path": {
-                        "type": "string",
-                        "description": "Path to the directory to create"
-                    }
+                "strength": {
+                    "type": "number",
+                    "description": "Action strength (0.0 to 1.0)",
+                    "default": 1.0
+                }
+            },
+            "required": ["action_name"]
+        }
+    ),
+    _ToolSpec(
+        name="simulate_mouse_button",
+        endpoint="/api/runtime/simulate_mouse_button",
+        description="Simulate a mouse button press or release at a position",
+        schema={
+            "type": "object",
+            "properties": {
+                "button_index": {
+                    "type": "integer",
+                    "description": "Mouse button (1 left, 2 right, 3 middle, 4/5 wheel up/down)",
+                    "default": 1
                 },
-                "required": ["dir_path"]
-            }
-        ),
-        Tool(
-            name="list_directory",
-            description="List contents of a directory",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "dir_path": {
-                        "type": "string",
-                        "description": "Path to the directory"
-                    },
-                    "recursive": {
-                        "type": "boolean",
-                        "description": "List recursively",
-                        "default": False
-                    }
+                "pressed": {
+                    "type": "boolean",
+                    "description": "Whether the button is pressed or released",
+                    "default": True
                 },
-                "required": ["dir_path"]
-            }
-        ),
-        
-        # Runtime Operations Tools
-        Tool(
-            name="simulate_key_press",
-            description="Simulate keyboard key press for testing gameplay",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "keycode": {
-                        "type": "integer",
-                        "description": "Key code to simulate (e.g., 32 for Space, 87 for W)"
-                    },
-                    "pressed": {
-                        "type": "boolean",
-                        "description": "Whether key is pressed (true) or released (false)",
-                        "default": True
-                    }
+                "x": {"type": "number", "description": "Viewport x position"},
+                "y": {"type": "number", "description": "Viewport y position"}
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="simulate_mouse_motion",
+        endpoint="/api/runtime/simulate_mouse_motion",
+        description="Simulate mouse movement to a position",
+        schema={
+            "type": "object",
+            "properties": {
+                "x": {"type": "number", "description": "Viewport x position"},
+                "y": {"type": "number", "description": "Viewport y position"},
+                "relative_x": {"type": "number", "description": "Movement since the last motion event, x"},
+                "relative_y": {"type": "number", "description": "Movement since the last motion event, y"}
+            },
+            "required": ["x", "y"]
+        }
+    ),
+    _ToolSpec(
+        name="play_input_timeline",
+        endpoint="/api/runtime/play_input_timeline",
+        handler=_as_job_tool,
+        description="Play a whole input sequence (combos, walk cycles, click paths) with frame-accurate timing in one call, instead of one simulate_* call per event. Returns when the last event was sent, with events sent, frames elapsed and the worst timing lag; optionally a per-frame trace of fps and process times",
+        schema={
+            "type": "object",
+            "properties": {
+                "events": {
+                    "type": "array",
+                    "description": "Timeline entries. Each has exactly one of frame (ticks after start) or ms (milliseconds after start), and a type: key {keycode: int or name like \"W\"/\"Space\", pressed}, action {action, pressed, strength}, mouse_button {button_index, pressed, position: [x, y]}, mouse_motion {position, relative}. Presses may add hold_frames (with frame) or hold_ms (with ms) to schedule the release",
+                    "items": {"type": "object"}
                 },
-                "required": ["keycode"]
-            }
-        ),
-        Tool(
-            name="simulate_action",
-            description="Simulate input action (like jump, move_left, etc.) for testing",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "action_name": {
-                        "type": "string",
-                        "description": "Name of the input action (e.g., 'ui_accept', 'jump', 'move_left')"
-                    },
-                    "pressed": {
-                        "type": "boolean",
-                        "description": "Whether action is pressed or released",
-                        "default": True
-                    },
-                    "strength": {
-                        "type": "number",
-                        "description": "Action strength (0.0 to 1.0)",
-                        "default": 1.0
-                    }
+                "clock": {
+                    "type": "string",
+                    "enum": ["process", "physics"],
+                    "description": "Tick events on idle frames (default) or physics ticks"
                 },
-                "required": ["action_name"]
-            }
-        ),
-        Tool(
-            name="get_runtime_stats",
-            description="Get real-time performance statistics (FPS, memory, draw calls, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_node_properties",
-            description="Get all properties of a node at runtime for debugging",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node (e.g., 'Player', 'Player/Sprite2D')"
-                    }
+                "trace": {
+                    "type": "boolean",
+                    "description": "Include a per-tick trace of fps, process and physics time (default: false)"
+                }
+            },
+            "required": ["events"]
+        }
+    ),
+    _ToolSpec(
+        name="get_runtime_stats",
+        endpoint="/api/runtime/get_runtime_stats",
+        description="Get real-time performance statistics (FPS, memory, draw calls, etc.)",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_node_properties",
+        endpoint="/api/runtime/get_node_properties",
+        description="Get all properties of a node at runtime for debugging",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node (e.g., 'Player', 'Player/Sprite2D')"
+                }
+            },
+            "required": ["node_path"]
+        }
+    ),
+    _ToolSpec(
+        name="call_node_method",
+        endpoint="/api/runtime/call_node_method",
+        description="Call a method on a node for testing or debugging",
+        schema={
+            "type": "object",
+            "properties": {
+                "node_path": {
+                    "type": "string",
+                    "description": "Path to the node"
                 },
-                "required": ["node_path"]
-            }
-        ),
-        Tool(
-            name="call_node_method",
-            description="Call a method on a node for testing or debugging",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "node_path": {
-                        "type": "string",
-                        "description": "Path to the node"
-                    },
-                    "method_name": {
-                        "type": "string",
-                        "description": "Name of the method to call"
-                    },
-                    "args": {
-                        "type": "array",
-                        "description": "Arguments to pass to the method",
-                        "default": []
-                    }
+                "method_name": {
+                    "type": "string",
+                    "description": "Name of the method to call"
                 },
-                "required": ["node_path", "method_name"]
-            }
-        ),
-        Tool(
-            name="get_installed_plugins",
-            description="Get list of all installed Godot plugins",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-        Tool(
-            name="get_plugin_info",
-            description="Get detailed information about a specific plugin",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "plugin_name": {
-                        "type": "string",
-                        "description": "Name of the plugin folder"
-                    }
+                "args": {
+                    "type": "array",
+                    "description": "Arguments to pass to the method",
+                    "default": []
+                }
+            },
+            "required": ["node_path", "method_name"]
+        }
+    ),
+    _ToolSpec(
+        name="get_installed_plugins",
+        endpoint="/api/runtime/get_installed_plugins",
+        description="Get list of all installed Godot plugins",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_plugin_info",
+        endpoint="/api/runtime/get_plugin_info",
+        description="Get detailed information about a specific plugin",
+        schema={
+            "type": "object",
+            "properties": {
+                "plugin_name": {
+                    "type": "string",
+                    "description": "Name of the plugin folder"
+                }
+            },
+            "required": ["plugin_name"]
+        }
+    ),
+    _ToolSpec(
+        name="get_assets_by_type",
+        endpoint="/api/runtime/get_assets_by_type",
+        description="Get all assets of a specific type (texture, mesh, audio, script, etc.)",
+        schema={
+            "type": "object",
+            "properties": {
+                "asset_type": {
+                    "type": "string",
+                    "description": "Type of assets to find",
+                    "enum": ["texture", "image", "mesh", "model", "3d", "audio", "sound", "script", "scene", "material", "shader"]
+                }
+            },
+            "required": ["asset_type"]
+        }
+    ),
+    _ToolSpec(
+        name="get_asset_info",
+        endpoint="/api/runtime/get_asset_info",
+        description="Get detailed information about a specific asset",
+        schema={
+            "type": "object",
+            "properties": {
+                "asset_path": {
+                    "type": "string",
+                    "description": "Path to the asset file"
+                }
+            },
+            "required": ["asset_path"]
+        }
+    ),
+    _ToolSpec(
+        name="run_test_script",
+        endpoint="/api/runtime/run_test_script",
+        description="Execute a test script and return results",
+        schema={
+            "type": "object",
+            "properties": {
+                "script_path": {
+                    "type": "string",
+                    "description": "Path to the test script file"
+                }
+            },
+            "required": ["script_path"]
+        }
+    ),
+    _ToolSpec(
+        name="run_tests",
+        handler=_run_tests_tool,
+        description="Run every test script under a directory in parallel headless Godot processes (one per core by default). Works without the editor running; requires GODOT_EXECUTABLE. Test methods are test_* functions returning true or nothing to pass. Reports per-test wall time, the slowest tests, and failures",
+        schema={
+            "type": "object",
+            "properties": {
+                "test_dir": {
+                    "type": "string",
+                    "description": "Directory to search for test scripts (default: res://)"
                 },
-                "required": ["plugin_name"]
-            }
-        ),
-        Tool(
-            name="get_assets_by_type",
-            description="Get all assets of a specific type (texture, mesh, audio, script, etc.)",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_type": {
-                        "type": "string",
-                        "description": "Type of assets to find",
-                        "enum": ["texture", "image", "mesh", "model", "3d", "audio", "sound", "script", "scene", "material", "shader"]
-                    }
+                "pattern": {
+                    "type": "string",
+                    "description": "File name glob for test scripts (default: test_*.gd)"
                 },
-                "required": ["asset_type"]
-            }
-        ),
-        Tool(
-            name="get_asset_info",
-            description="Get detailed information about a specific asset",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "asset_path": {
-                        "type": "string",
-                        "description": "Path to the asset file"
-                    }
+                "workers": {
+                    "type": "integer",
+                    "description": "Number of Godot processes to run at once (default: CPU count)"
                 },
-                "required": ["asset_path"]
-            }
-        ),
-        Tool(
-            name="run_test_script",
-            description="Execute a test script and return results",
-            inputSchema={
-                "type": "object",
-                "properties": {
-                    "script_path": {
-                        "type": "string",
-                        "description": "Path to the test script file"
-                    }
+                "timeout": {
+                    "type": "number",
+                    "description": "Seconds before a worker is killed and its unfinished scripts are marked failed (default: 300)"
                 },
-                "required": ["script_path"]
-            }
-        ),
-        Tool(
-            name="get_input_actions",
-            description="Get all registered input actions and their key bindings",
-            inputSchema={
-                "type": "object",
-                "properties": {},
-                "required": []
-            }
-        ),
-    ]
+                "slowest": {
+                    "type": "integer",
+                    "description": "How many of the slowest tests to list (default: 10)"
+                },
+                "include_results": {
+                    "type": "boolean",
+                    "description": "Include every test result, not just failures and the slowest (default: false)"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="start_perf_sampler",
+        endpoint="/api/runtime/perf/start",
+        description="Start recording performance monitors every editor frame into ring buffers. Use this instead of polling get_runtime_stats, which only gives a snapshot and disturbs the frames it measures. Restarting drops earlier samples",
+        schema={
+            "type": "object",
+            "properties": {
+                "monitors": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Monitors to record (default: frame_ms, process_time, physics_process_time). Known names: frame_ms, fps, process_time, physics_process_time, navigation_process_time, memory_static, memory_static_max, memory_message_buffer_max, objects, resources, nodes, orphan_nodes, objects_in_frame, primitives_in_frame, draw_calls, video_mem_used, texture_mem_used, buffer_mem_used, physics_2d_active_objects, physics_3d_active_objects, audio_output_latency; custom Performance monitor ids also work"
+                },
+                "capacity": {
+                    "type": "integer",
+                    "description": "Frames kept per monitor (default: 3600, about a minute at 60 fps)"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="stop_perf_sampler",
+        endpoint="/api/runtime/perf/stop",
+        description="Stop the performance sampler. Recorded samples remain readable with get_perf_series",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_perf_series",
+        endpoint="/api/runtime/perf/series",
+        description="Summarize what the performance sampler recorded: min, max, mean, p95 and p99 per monitor over the last window frames, optionally with the series itself",
+        schema={
+            "type": "object",
+            "properties": {
+                "monitors": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Monitors to report (default: all sampled)"
+                },
+                "window": {
+                    "type": "integer",
+                    "description": "Number of most recent frames to cover (default: all recorded)"
+                },
+                "series": {
+                    "type": "string",
+                    "enum": ["none", "raw", "downsampled"],
+                    "description": "Include no series (default), every sample, or per-bucket maxima so spikes survive"
+                },
+                "points": {
+                    "type": "integer",
+                    "description": "Buckets for the downsampled series (default: 200)"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_bridge_metrics",
+        endpoint="/api/bridge/metrics",
+        description="Timing and size statistics of the editor's HTTP bridge per route: request and error counts, latency histogram with mean/p95/max, per-phase times (parse, auth, json_parse, handler, stringify, write) and bytes in/out",
+        schema={
+            "type": "object",
+            "properties": {
+                "reset": {
+                    "type": "boolean",
+                    "description": "Clear the statistics after reading them (default: false)"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_cache_stats",
+        handler=_cache_stats_tool,
+        description="Statistics of the MCP server's response cache for read-only tools (get_project_info, get_input_actions, get_installed_plugins, get_filesystem_tree, get_asset_info, get_import_info): entries, bytes, hits and misses per tool, evictions and invalidations",
+        schema={
+            "type": "object",
+            "properties": {
+                "clear": {
+                    "type": "boolean",
+                    "description": "Empty the cache after reading the statistics (default: false)"
+                }
+            },
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="get_input_actions",
+        endpoint="/api/runtime/get_input_actions",
+        description="Get all registered input actions and their key bindings",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    
+    # Multi-editor tools
+    _ToolSpec(
+        name="list_editors",
+        handler=_list_editors_tool,
+        targeted=False,
+        description="List the Godot editors this server fronts (from GODOT_PROJECT_PATHS), probing each for health. Use the names as the target argument of any tool",
+        schema={
+            "type": "object",
+            "properties": {},
+            "required": []
+        }
+    ),
+    _ToolSpec(
+        name="fan_out",
+        handler=_fan_out_tool,
+        targeted=False,
+        description="Run one read-only tool on several editors concurrently and return the results by editor",
+        schema={
+            "type": "object",
+            "properties": {
+                "tool": {
+                    "type": "string",
+                    "description": "Read-only tool to run, e.g. get_project_info or get_godot_errors"
+                },
+                "arguments": {
+                    "type": "object",
+                    "description": "Arguments for the tool"
+                },
+                "targets": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Editors to query (default: all)"
+                }
+            },
+            "required": ["tool"]
+        }
+    ),
+]
+
+# The registry: built once, looked up by name on every call
+_TOOLS = {spec.name: spec for spec in _TOOL_SPECS}
+if len(_TOOLS) != len(_TOOL_SPECS):
+    raise RuntimeError("Duplicate tool names in _TOOL_SPECS")
+_tool_list: Optional[list[Tool]] = None
+
+
+@app.list_tools()
+async def list_tools() -> list[Tool]:
+    """List all available MCP tools"""
+    global _tool_list
+    if _tool_list is None:
+        _tool_list = [spec.tool() for spec in _TOOL_SPECS]
+    return _tool_list
 
 
 @app.call_tool()
 async def call_tool(name: str, arguments: Any) -> list[TextContent | ImageContent]:
     """Handle tool calls by proxying to Godot HTTP API"""
-    
-    # Map tool names to API endpoints
-    endpoint_map = {
-        # Project tools
-        "get_project_info": "/api/project/info",
-        "get_filesystem_tree": "/api/project/filesystem",
-        "search_files": "/api/project/search_files",
-        "uid_to_project_path": "/api/project/uid_to_path",
-        "project_path_to_uid": "/api/project/path_to_uid",
-        
-        # Scene tools
-        "get_scene_tree": "/api/scene/tree",
-        "get_scene_file_content": "/api/scene/file_content",
-        "create_scene": "/api/scene/create",
-        "open_scene": "/api/scene/open",
-        "delete_scene": "/api/scene/delete",
-        "add_scene": "/api/scene/add_scene",
-        "play_scene": "/api/scene/play",
-        "stop_running_scene": "/api/scene/stop",
-        
-        # Node tools
-        "add_node": "/api/node/add",
-        "delete_node": "/api/node/delete",
-        "duplicate_node": "/api/node/duplicate",
-        "move_node": "/api/node/move",
-        "update_property": "/api/node/update_property",
-        "add_resource": "/api/node/add_resource",
-        "set_anchor_preset": "/api/node/set_anchor_preset",
-        "set_anchor_values": "/api/node/set_anchor_values",
-        
-        # Script tools
-        "get_open_scripts": "/api/script/get_open_scripts",
-        "view_script": "/api/script/view",
-        "create_script": "/api/script/create",
-        "attach_script": "/api/script/attach",
-        "edit_file": "/api/script/edit_file",
-        
-        # Editor tools
-        "get_godot_errors": "/api/editor/errors",
-        "get_editor_screenshot": "/api/editor/screenshot",
-        "get_running_scene_screenshot": "/api/editor/running_scene_screenshot",
-        "execute_editor_script": "/api/editor/execute_script",
-        "clear_output_logs": "/api/editor/clear_logs",
-        
-        # Editor context tools
-        "get_editor_context": "/api/context/summary",
-        "get_live_preview": "/api/context/live_preview",
-        
-        # Asset tools
-        "reimport_assets": "/api/asset/reimport",
-        "get_import_info": "/api/asset/import_info",
-        
-        # Runtime operations
-        "simulate_key_press": "/api/runtime/simulate_key",
-        "simulate_action": "/api/runtime/simulate_action",
-        "get_runtime_stats": "/api/runtime/get_runtime_stats",
-        "get_node_properties": "/api/runtime/get_node_properties",
-        "call_node_method": "/api/runtime/call_node_method",
-        "get_installed_plugins": "/api/runtime/get_installed_plugins",
-        "get_plugin_info": "/api/runtime/get_plugin_info",
-        "get_assets_by_type": "/api/runtime/get_assets_by_type",
-        "get_asset_info": "/api/runtime/get_asset_info",
-        "run_test_script": "/api/runtime/run_test_script",
-        "get_input_actions": "/api/runtime/get_input_actions",
-        
-        # Project analysis tools
-        "get_quick_project_overview": "/api/project/quick_overview",
-        "analyze_project_dependencies": "/api/project/analyze_dependencies",
-    }
-    
-    # Handle Godot process management tools (don't need Godot running)
-    if name == "check_godot_running":
-        try:
-            client = await _get_http_client()
-            response = await client.get(f"{GODOT_BASE_URL}/api/project/info", headers=dict([("X-MCP-Token", _AUTH_TOKEN)]), timeout=2.0)
-            return _make_response({
-                "success": True,
-                "running": True,
-                "responsive": response.status_code == 200
-            })
-        except Exception:
-            return _make_response({
-                "success": True,
-                "running": False,
-                "responsive": False
-            })
-    
-    if name == "launch_godot":
-        import subprocess
-        godot_exe = os.getenv("GODOT_EXECUTABLE")
-        if not godot_exe:
-            return _make_response({
-                "success": False,
-                "error": "GODOT_EXECUTABLE environment variable not set. Please set it to your Godot executable path."
-            })
-        
-        project_path = arguments.get("project_path")
-        editor_mode = arguments.get("editor_mode", True)
-        
-        try:
-            args = [godot_exe]
-            if editor_mode:
-                args.extend(["--editor", "--path", project_path])
-            else:
-                args.extend(["--path", project_path])
-            
-            creationflags = subprocess.CREATE_NEW_CONSOLE if os.name == 'nt' else 0
-            process = subprocess.Popen(args, 
-                                     stdout=subprocess.PIPE, 
-                                     stderr=subprocess.PIPE,
-                                     creationflags=creationflags)
-            
-            return _make_response({
-                "success": True,
-                "message": f"Godot launched successfully with PID {process.pid}",
-                "pid": process.pid,
-                "note": "Wait a few seconds for Godot to start and the MCP server to become available"
-            })
-        except Exception as e:
-            return _make_response({
-                "success": False,
-                "error": f"Failed to launch Godot: {str(e)}"
-            })
-    
-    if name == "get_godot_version":
-        import subprocess
-        godot_exe = os.getenv("GODOT_EXECUTABLE")
-        if not godot_exe:
-            return _make_response({
-                "success": False,
-                "error": "GODOT_EXECUTABLE environment variable not set"
-            })
-        
-        try:
-            result = subprocess.run([godot_exe, "--version"], 
-                                  capture_output=True, 
-                                  text=True, 
-                                  timeout=5)
-            version = result.stdout.strip()
-            return _make_response({
-                "success": True,
-                "version": version,
-                "executable": godot_exe
-            })
-        except Exception as e:
-            return _make_response({
-                "success": False,
-                "error": f"Failed to get Godot version: {str(e)}"
-            })
-    
-    # Handle direct file system tools (work without Godot running)
-    if name in ["read_scene_file", "write_scene_file", "read_script_file", "write_script_file",
-                "read_project_settings", "update_project_settings", "create_directory", "list_directory"]:
-        
-        if name == "read_scene_file":
-            scene_path = arguments.get("scene_path", "")
-            try:
-                scene_path = _resolve_in_project(scene_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                with open(scene_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return _make_response({"success": True, "path": scene_path, "content": content})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to read scene file: {str(e)}"})
-        
-        elif name == "write_scene_file":
-            scene_path = arguments.get("scene_path", "")
-            content = arguments.get("content", "")
-            
-            try:
-                scene_path = _resolve_in_project(scene_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                os.makedirs(os.path.dirname(scene_path) if os.path.dirname(scene_path) else ".", exist_ok=True)
-                with open(scene_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                return _make_response({"success": True, "path": scene_path, "message": "Scene file written successfully"})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to write scene file: {str(e)}"})
-        
-        elif name == "read_script_file":
-            script_path = arguments.get("script_path", "")
-            try:
-                script_path = _resolve_in_project(script_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                with open(script_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return _make_response({"success": True, "path": script_path, "content": content})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to read script file: {str(e)}"})
-        
-        elif name == "write_script_file":
-            script_path = arguments.get("script_path", "")
-            content = arguments.get("content", "")
-            
-            try:
-                script_path = _resolve_in_project(script_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                os.makedirs(os.path.dirname(script_path) if os.path.dirname(script_path) else ".", exist_ok=True)
-                with open(script_path, 'w', encoding='utf-8') as f:
-                    f.write(content)
-                return _make_response({"success": True, "path": script_path, "message": "Script file written successfully"})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to write script file: {str(e)}"})
-        
-        elif name == "read_project_settings":
-            project_path = arguments.get("project_path", ".")
-            try:
-                settings_file = _resolve_in_project(os.path.join(project_path, "project.godot"))
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                return _make_response({"success": True, "path": settings_file, "content": content})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to read project settings: {str(e)}"})
-        
-        elif name == "update_project_settings":
-            project_path = arguments.get("project_path", ".")
-            settings = arguments.get("settings", {})
-            try:
-                settings_file = _resolve_in_project(os.path.join(project_path, "project.godot"))
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                with open(settings_file, 'r', encoding='utf-8') as f:
-                    lines = f.readlines()
-                
-                for key, value in settings.items():
-                    found = False
-                    for i, line in enumerate(lines):
-                        if line.startswith(key):
-                            lines[i] = f'{key}="{value}"\n'
-                            found = True
-                            break
-                    if not found:
-                        lines.append(f'{key}="{value}"\n')
-                
-                with open(settings_file, 'w', encoding='utf-8') as f:
-                    f.writelines(lines)
-                
-                return _make_response({"success": True, "message": "Project settings updated successfully"})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to update project settings: {str(e)}"})
-        
-        elif name == "create_directory":
-            dir_path = arguments.get("dir_path", "")
-            try:
-                dir_path = _resolve_in_project(dir_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
-            try:
-                os.makedirs(dir_path, exist_ok=True)
-                return _make_response({"success": True, "path": dir_path, "message": "Directory created successfully"})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to create directory: {str(e)}"})
-        
-        elif name == "list_directory":
-            dir_path = arguments.get("dir_path", ".")
-            recursive = arguments.get("recursive", False)
-            
-            try:
-                dir_path = _resolve_in_project(dir_path)
-            except ValueError as e:
-                return _make_response(dict(success=False, error=str(e)))
-            
+    target = None
+    if isinstance(arguments, dict) and "target" in arguments:
+        arguments = dict(arguments)
+        target_name = str(arguments.pop("target") or "")
+        if target_name:
+            target = _editor_targets().get(target_name)
+            if target is None:
+                return _make_response({"success": False, "error": f"Unknown target: {target_name}",
+                                       "targets": list(_editor_targets())})
+    target_token = _current_target.set(target)
+    _metrics.in_flight += 1
+    started = time.perf_counter()
+    trace = _Trace() if TRACE_FILE else None
+    trace_token = _current_trace.set(trace)
+    start_ns = time.time_ns()
+    error = None
+    try:
+        return await _coalesced_call_tool(name, arguments)
+    except Exception as e:
+        error = str(e) or type(e).__name__
+        _metrics.tool_exception(name)
+        raise
+    finally:
+        _current_trace.reset(trace_token)
+        _response_cache.after_tool(name, arguments)
+        _current_target.reset(target_token)
+        _metrics.in_flight -= 1
+        _metrics.observe_tool(name, time.perf_counter() - started)
+        if trace is not None:
             try:
-                if recursive:
-                    files = []
-                    for root, dirs, filenames in os.walk(dir_path):
-                        for filename in filenames:
-                            files.append(os.path.join(root, filename))
-                else:
-                    files = [os.path.join(dir_path, f) for f in os.listdir(dir_path)]
-                
-                return _make_response({"success": True, "path": dir_path, "files": files, "count": len(files)})
-            except Exception as e:
-                return _make_response({"success": False, "error": f"Failed to list directory: {str(e)}"})
-    
-    if name not in endpoint_map:
+                trace.write(TRACE_FILE, name, start_ns, time.time_ns(), error)
+            except OSError:
+                pass
+
+
+async def _call_tool(name: str, arguments: Any) -> list[TextContent | ImageContent]:
+    spec = _TOOLS.get(name)
+    if spec is None:
         return _make_response({"success": False, "error": f"Unknown tool: {name}"})
-    
-    endpoint = endpoint_map[name]
-    result = await call_godot_api(endpoint, arguments or {})
-    
-    # Handle screenshot results (return as image)
-    if name in ["get_editor_screenshot", "get_running_scene_screenshot"]:
-        if result.get("success") and "data" in result:
-            screenshot_base64 = result["data"].get("screenshot", "")
-            if screenshot_base64:
-                return [
-                    TextContent(type="text", text=f"Screenshot captured successfully"),
-                    ImageContent(
-                        type="image",
-                        data=screenshot_base64,
-                        mimeType="image/png"
-                    )
-                ]
-    
-    # Handle live preview with image
-    if name == "get_live_preview":
-        if result.get("success") and "data" in result:
-            data = result["data"]
-            screenshot = data.get("screenshot", "")
-            
-            response = [
-                TextContent(
-                    type="text",
-                    text=json.dumps({
-                        "scene_tree": data.get("scene_tree"),
-                        "current_script": data.get("current_script")
-                    }, indent=2)
-                )
-            ]
-            
-            if screenshot:
-                response.append(ImageContent(
-                    type="image",
-                    data=screenshot,
-                    mimeType="image/png"
-                ))
-            
-            return response
-    
-    # Default: return JSON result
-    return _make_response(result)
+    arguments = arguments or {}
+    if spec.handler is not None:
+        return await spec.handler(spec, arguments)
+    return await _proxy_tool(spec, arguments)
+
+
+async def _proxy_tool(spec: _ToolSpec, arguments: dict) -> list[TextContent]:
+    """Send the call to the tool's editor route, through the response cache."""
+    cache_key = _response_cache.key(spec.name, arguments)
+    if cache_key is not None:
+        cached = _response_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        generation = _response_cache.generation(cache_key)
+    result = await call_godot_api(spec.endpoint, arguments)
+    response = _make_response(result)
+    if cache_key is not None and result.get("success"):
+        _response_cache.put(cache_key, response, generation)
+    return response
 
 def main_entry():
     """Synchronous entry point for console script"""
@@ -1356,6 +3714,13 @@ def main_entry():
 
 async def main():
     """Main entry point for the MCP server"""
+    # Read the editors' config now rather than on the first tool call
+    _editor_targets()
+    background = await _start_metrics_exporters()
+    if HEARTBEAT_INTERVAL > 0:
+        background.append(asyncio.create_task(_heartbeat_loop(HEARTBEAT_INTERVAL)))
+    if WARM_EDITORS and os.getenv("GODOT_EXECUTABLE"):
+        background.append(asyncio.create_task(_godot_pool.warm(os.environ["GODOT_EXECUTABLE"])))
     try:
         async with stdio_server() as (read_stream, write_stream):
             await app.run(
@@ -1364,11 +3729,17 @@ async def main():
                 app.create_initialization_options()
             )
     finally:
-        # Clean up persistent HTTP client on shutdown
-        global _http_client
-        if _http_client and not _http_client.is_closed:
-            await _http_client.aclose()
-            _http_client = None
+        for handle in background:
+            if isinstance(handle, asyncio.Task):
+                handle.cancel()
+                await asyncio.gather(handle, return_exceptions=True)
+            else:
+                handle.close()
+                await handle.wait_closed()
+        await _godot_pool.shutdown()
+        # Clean up the editors' connection pools on shutdown
+        for target in _targets.values():
+            await target.aclose()
 
 
 if __name__ == "__main__":
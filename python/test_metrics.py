@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the Prometheus metrics endpoint
+Records a few calls, scrapes /metrics and checks the result; needs no editor
+"""
+
+import asyncio
+import os
+import sys
+
+import httpx
+from rich.console import Console
+from rich.table import Table
+
+# Keep the import from reading a real project's config or token
+for name in ("GODOT_PROJECT_PATH", "GODOT_PROJECT_PATHS", "GODOT_MCP_METRICS_PORT", "GODOT_MCP_METRICS_FILE"):
+    os.environ.pop(name, None)
+
+import mcp_server  # noqa: E402
+
+console = Console()
+
+
+def parse_metrics(text: str) -> dict:
+    """Sample name with its labels, exactly as rendered -> value"""
+    samples = {}
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        sample, _, value = line.rpartition(" ")
+        samples[sample] = float(value)
+    return samples
+
+
+def record_calls(metrics: "mcp_server._Metrics") -> None:
+    """What two get_project_info calls, a failed request and a crash leave behind"""
+    metrics.observe_tool("get_project_info", 0.004)
+    metrics.observe_tool("get_project_info", 0.2)
+    metrics.observe_tool("get_scene_tree", 1.5)
+    metrics.tool_exception("get_scene_tree")
+    metrics.http_error("/api/scene/tree", "connect")
+    metrics.http_error("/api/scene/tree", "connect")
+    metrics.http_error("/api/project/info", "401")
+    metrics.response_bytes("/api/project/info", 1500)
+    metrics.cache_lookup("get_project_info", False)
+    metrics.cache_lookup("get_project_info", True)
+    metrics.coalesced("get_scene_tree")
+    metrics.queue_wait("interactive", 0.01)
+
+
+EXPECTED = {
+    'godot_mcp_tool_duration_seconds_count{tool="get_project_info"}': 2,
+    'godot_mcp_tool_duration_seconds_bucket{tool="get_project_info",le="0.005"}': 1,
+    'godot_mcp_tool_duration_seconds_bucket{tool="get_project_info",le="0.25"}': 2,
+    'godot_mcp_tool_duration_seconds_bucket{tool="get_project_info",le="+Inf"}': 2,
+    'godot_mcp_tool_duration_seconds_count{tool="get_scene_tree"}': 1,
+    'godot_mcp_tool_exceptions_total{tool="get_scene_tree"}': 1,
+    'godot_mcp_http_errors_total{endpoint="/api/scene/tree",reason="connect"}': 2,
+    'godot_mcp_http_errors_total{endpoint="/api/project/info",reason="401"}': 1,
+    'godot_mcp_response_bytes_count{endpoint="/api/project/info"}': 1,
+    'godot_mcp_response_bytes_sum{endpoint="/api/project/info"}': 1500,
+    'godot_mcp_cache_lookups_total{tool="get_project_info",result="hit"}': 1,
+    'godot_mcp_cache_lookups_total{tool="get_project_info",result="miss"}': 1,
+    'godot_mcp_coalesced_calls_total{tool="get_scene_tree"}': 1,
+    'godot_mcp_editor_queue_wait_seconds_count{priority="interactive"}': 1,
+    'godot_mcp_tools_in_flight': 0,
+}
+
+
+async def run_tests() -> int:
+    """Serve the metrics on an ephemeral port, scrape them and compare"""
+    console.print("\n[bold cyan]🧪 Godot MCP Enhanced - Metrics Test[/bold cyan]\n")
+
+    record_calls(mcp_server._metrics)
+    server = await asyncio.start_server(mcp_server._serve_metrics, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient(timeout=5.0) as client:
+            response = await client.get(f"http://127.0.0.1:{port}/metrics")
+            other = await client.get(f"http://127.0.0.1:{port}/other")
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    samples = parse_metrics(response.text)
+    checks = [
+        ("GET /metrics answers 200", response.status_code == 200, str(response.status_code)),
+        ("Content type is Prometheus text", response.headers.get("content-type", "").startswith("text/plain; version=0.0.4"),
+         response.headers.get("content-type", "")),
+        ("Other paths answer 404", other.status_code == 404, str(other.status_code)),
+    ]
+    for sample, value in EXPECTED.items():
+        found = samples.get(sample)
+        checks.append((sample, found == value, f"expected {value:g}, got {found}"))
+
+    table = Table(title="Test Results", show_header=True, header_style="bold magenta")
+    table.add_column("Check", style="cyan")
+    table.add_column("Status", justify="center")
+    table.add_column("Details", style="dim")
+    failed = 0
+    for name, passed, details in checks:
+        table.add_row(name, "✅ PASS" if passed else "❌ FAIL", "" if passed else details)
+        failed += not passed
+    console.print(table)
+
+    if failed:
+        console.print(f"\n[bold red]✗ {failed} of {len(checks)} checks failed[/bold red]\n")
+    else:
+        console.print(f"\n[bold green]✓ All {len(checks)} checks passed[/bold green]\n")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(run_tests()))